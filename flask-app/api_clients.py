@@ -4,82 +4,298 @@ API Client classes untuk berbagai sumber data breach
 Memisahkan logic API dari breach checker utama
 """
 
+import atexit
+import json
+import os
+import random
+import re
 import requests
 import hashlib
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
-from config import APICredentials, Config
+from email.utils import parsedate_to_datetime
+from config import APICredentials, CacheConfig, Config
+from breach_catalog import breach_refs
+from cache import TTLCache
+from circuit_breaker import get_circuit_breaker
+from deadline import cap_timeout, expired, remaining
+from http_transport import get_session
+import metrics
+from local_index import ShardedEmailIndex, normalize_email
+from password_range import PasswordRange
+from pwned_offline import PwnedPasswordsFile, get_pwned_passwords_db
+from rate_limiter import get_rate_limiter
+from singleflight import get_single_flight
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa flock, hanya aman untuk satu proses
+    fcntl = None
+
+SHA1_HEX = re.compile(r'[0-9A-F]{40}')
+
+# Cache hasil check_email bersama untuk semua client (sync dan async).
+# Key = BLAKE2b keyed (salt acak per proses) dari sumber + email ternormalisasi,
+# sehingga email plaintext tidak disimpan di memori.
+email_result_cache = TTLCache(
+    'email_results',
+    ttl=CacheConfig.EMAIL_RESULTS['ttl_found'],
+    max_entries=CacheConfig.EMAIL_RESULTS['max_entries'],
+    max_bytes=CacheConfig.EMAIL_RESULTS['max_bytes'],
+    enabled=CacheConfig.EMAIL_RESULTS['enabled']
+)
+_EMAIL_CACHE_SALT = os.urandom(16)
+
+# Lookup identik yang sedang berjalan berbagi satu request upstream
+email_flight = get_single_flight('email_results')
+range_flight = get_single_flight('hibp_range')
+
+def email_cache_key(source: str, email: str) -> bytes:
+    normalized = f"{source}\0{email.strip().lower()}".encode('utf-8')
+    return hashlib.blake2b(normalized, key=_EMAIL_CACHE_SALT, digest_size=16).digest()
+
+# Status hasil yang sukses; DeHashed dan IntelX memakai 'success' untuk found maupun clean
+SUCCESS_STATUSES = frozenset({'found', 'clean', 'success'})
+
+def email_result_ttl(result: Dict) -> int:
+    """TTL per hasil: found dan clean lebih lama, error/rate_limited singkat"""
+    status = result.get('status')
+    if status in ('circuit_open', 'timed_out'):
+        return 0  # breaker menolak tanpa biaya; timed_out tergantung deadline caller
+    if 'error' in result or status not in SUCCESS_STATUSES or 'found' not in result:
+        return CacheConfig.EMAIL_RESULTS['ttl_error']
+    if result['found']:
+        return CacheConfig.EMAIL_RESULTS['ttl_found']
+    return CacheConfig.EMAIL_RESULTS['ttl_clean']
+
+# Response upstream yang layak dicoba ulang
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Header Retry-After (detik atau HTTP-date) -> detik, None bila tidak valid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class SourceUnavailable(Exception):
+    """Sumber dilewati sebelum request dikirim (mis. rate limit lokal habis)"""
+    
+    def __init__(self, message: str, status: str):
+        super().__init__(message)
+        self.status = status
 
 class BaseAPIClient(ABC):
     """Base class untuk semua API clients"""
     
+    source_name = 'Unknown'
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'BreachChecker/1.0'
-        })
+        self.rate_limiter = None
+        self.rate_limit_wait = None
+        self.circuit_breaker = None
+    
+    @property
+    def session(self) -> requests.Session:
+        """Session thread-local di atas pool koneksi bersama (http_transport)"""
+        return get_session()
+    
+    def _init_rate_limiter(self, name: str, settings: Dict):
+        """Pasang token bucket bersama untuk sumber ini"""
+        self.rate_limiter = get_rate_limiter(name, settings)
+        self.rate_limit_wait = settings.get('max_wait')
+    
+    def _init_circuit_breaker(self, name: str, settings: Optional[Dict] = None):
+        """Pasang circuit breaker bersama untuk sumber ini"""
+        self.circuit_breaker = get_circuit_breaker(name, settings)
     
-    @abstractmethod
     def check_email(self, email: str) -> Dict:
-        """Check email breach"""
+        """
+        Check email breach (hasil per sumber di-cache, lihat email_result_cache).
+        Lookup yang di-coalesce berbagi satu hasil; setiap caller menerima dict sendiri.
+        """
+        cached = self._cached_email_result(email)
+        if cached is not None:
+            return cached
+        return dict(email_flight.do(
+            email_cache_key(self.source_name, email),
+            lambda: self._cache_email_result(email, self._fetch_email(email))
+        ))
+    
+    @abstractmethod
+    def _fetch_email(self, email: str) -> Dict:
+        """Check email breach ke sumber (tanpa cache)"""
         pass
     
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """Make HTTP request with error handling"""
-        try:
-            kwargs.setdefault('timeout', Config.REQUEST_TIMEOUT)
-            response = self.session.request(method, url, **kwargs)
-            return response
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {str(e)}")
+    def _cached_email_result(self, email: str) -> Optional[Dict]:
+        """Salinan hasil cache dengan penanda `cached`, None bila miss"""
+        result = email_result_cache.get(email_cache_key(self.source_name, email))
+        if result is None:
+            return None
+        return {**result, 'cached': True}
+    
+    def _cache_email_result(self, email: str, result: Dict) -> Dict:
+        """Cache menyimpan salinan sendiri; caller boleh mengubah dict yang dikembalikan"""
+        ttl = email_result_ttl(result)
+        if ttl > 0:
+            email_result_cache.set(email_cache_key(self.source_name, email), dict(result),
+                                   size=len(json.dumps(result, default=str)), ttl=ttl)
+        return result
+    
+    def _unavailable_result(self, error: SourceUnavailable) -> Dict:
+        """Result dict untuk sumber yang dilewati"""
+        return {
+            'error': str(error),
+            'status': error.status,
+            'source': self.source_name
+        }
+    
+    def _make_request(self, method: str, url: str, rate_limited: bool = True,
+                      circuit_breaker=None, **kwargs) -> requests.Response:
+        """
+        Make HTTP request with error handling. Connection error, 5xx dan 429
+        dicoba ulang (maksimal Config.MAX_RETRIES kali) setelah jeda
+        Retry-After atau exponential backoff dengan jitter, selama jeda masih
+        muat dalam deadline request; setelah itu response terakhir dikembalikan.
+        """
+        timeout = kwargs.pop('timeout', Config.REQUEST_TIMEOUT)
+        attempt = 0
+        while True:
+            breaker = self._acquire(rate_limited, circuit_breaker)
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=cap_timeout(timeout), **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._record_outcome(breaker, None, started)
+                delay = self._retry_delay(attempt, None) if isinstance(
+                    e, requests.exceptions.ConnectionError) else None
+                if delay is None:
+                    raise Exception(f"Request failed: {str(e)}")
+            except BaseException:
+                # Tidak ada hasil upstream untuk dicatat: lepas probe half-open
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            else:
+                self._record_outcome(breaker, response.status_code, started)
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    return response
+            
+            time.sleep(delay)
+            attempt += 1
+    
+    def _retry_delay(self, attempt: int, response) -> Optional[float]:
+        """Jeda sebelum percobaan berikutnya, None bila tidak perlu/tidak boleh retry"""
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return None
+        if attempt >= Config.MAX_RETRIES:
+            return None
+        
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        if retry_after is not None:
+            if retry_after > Config.RETRY_AFTER_MAX:
+                return None
+            delay = retry_after
+        else:
+            ceiling = min(Config.RETRY_BACKOFF_MAX, Config.RETRY_BACKOFF_BASE * 2 ** attempt)
+            delay = random.uniform(0, ceiling)
+        
+        # Jangan retry bila jedanya saja sudah menghabiskan sisa deadline
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+        return delay
+    
+    def _acquire(self, rate_limited: bool, circuit_breaker=None):
+        """
+        Cek circuit breaker lalu ambil token rate limit. Return breaker yang
+        harus menerima hasil request; SourceUnavailable bila sumber dilewati.
+        """
+        if expired():
+            raise SourceUnavailable(f'{self.source_name} skipped: request deadline exceeded.', 'timed_out')
+        
+        breaker = circuit_breaker or self.circuit_breaker
+        if breaker is not None and not breaker.allow():
+            raise SourceUnavailable(
+                f'{self.source_name} is failing, skipped until the circuit breaker recovers.',
+                'circuit_open'
+            )
+        
+        if rate_limited and self.rate_limiter is not None:
+            try:
+                acquired = self.rate_limiter.acquire(timeout=self._rate_limit_timeout())
+            except BaseException:
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            if not acquired:
+                if breaker is not None:
+                    breaker.cancel()
+                raise SourceUnavailable(
+                    f'{self.source_name} local rate limit exceeded. Try again later.',
+                    'rate_limited'
+                )
+        return breaker
+    
+    def _rate_limit_timeout(self) -> Optional[float]:
+        """Lama maksimal menunggu token: max_wait, dibatasi sisa deadline"""
+        left = remaining()
+        if left is None:
+            return self.rate_limit_wait
+        return left if self.rate_limit_wait is None else min(self.rate_limit_wait, left)
+    
+    def _record_outcome(self, breaker, status_code: Optional[int], started: float):
+        """Request gagal (None), 429 dan 5xx dihitung error oleh breaker"""
+        latency = time.monotonic() - started
+        metrics.observe_upstream(breaker.name if breaker is not None else self.source_name.lower(),
+                                 status_code, latency)
+        if breaker is not None:
+            healthy = status_code is not None and status_code != 429 and status_code < 500
+            breaker.record(healthy, latency)
 
 class HIBPClient(BaseAPIClient):
     """Client untuk Have I Been Pwned API"""
     
-    def __init__(self):
+    source_name = 'HIBP'
+    
+    def __init__(self, range_cache: Optional[TTLCache] = None):
         super().__init__()
         self.base_url = APICredentials.HIBP['base_url']
         self.breaches_url = APICredentials.HIBP['breaches_url']
+        self._init_rate_limiter('hibp', APICredentials.HIBP['rate_limit'])
+        self._init_circuit_breaker('hibp')
+        # Range API (api.pwnedpasswords.com) adalah host terpisah dengan breaker sendiri
+        self.range_breaker = get_circuit_breaker('hibp_passwords')
+        # Client async di proses yang sama memakai cache milik client sync
+        if range_cache is None:
+            range_cache = TTLCache('hibp_range', **CacheConfig.PASSWORD_RANGE)
+        self.range_cache = range_cache
+    
+    @property
+    def offline_db(self) -> Optional[PwnedPasswordsFile]:
+        """Index Pwned Passwords lokal terbaru (di-map ulang setelah build baru), None bila tidak ada"""
+        return get_pwned_passwords_db()
     
     def check_password(self, password: str) -> Dict:
-        """Check password menggunakan k-anonymity"""
+        """Check password menggunakan k-anonymity (atau index offline bila ada)"""
         try:
-            # Hash password dengan SHA-1
-            sha1_hash = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
-            prefix = sha1_hash[:5]
-            suffix = sha1_hash[5:]
+            prefix, suffix = self._hash_password(password)
+            offline_db = self.offline_db
+            if offline_db is not None:
+                return self._offline_result(offline_db, prefix + suffix)
             
-            # Query API dengan prefix saja (k-anonymity)
-            url = f"{self.base_url}/range/{prefix}"
-            response = self._make_request('GET', url)
-            
-            if response.status_code == 200:
-                # Cari suffix dalam response
-                for line in response.text.split('\n'):
-                    if line.startswith(suffix):
-                        count = int(line.split(':')[1])
-                        return {
-                            'pwned': True,
-                            'count': count,
-                            'message': f'Password ditemukan dalam {count} breach',
-                            'status': 'found',
-                            'source': 'HIBP'
-                        }
-                
-                return {
-                    'pwned': False,
-                    'count': 0,
-                    'message': 'Password tidak ditemukan dalam database',
-                    'status': 'clean',
-                    'source': 'HIBP'
-                }
-            else:
-                return {
-                    'error': f'HIBP API error: HTTP {response.status_code}',
-                    'status': 'api_error',
-                    'source': 'HIBP'
-                }
+            password_range, status_code = self._get_range(prefix)
+            return self._password_result(password_range, status_code, suffix)
             
         except Exception as e:
             return {
@@ -88,67 +304,218 @@ class HIBPClient(BaseAPIClient):
                 'source': 'HIBP'
             }
     
-    def check_email(self, email: str) -> Dict:
-        """Check email breaches (rate limited)"""
-        try:
-            url = f"{self.breaches_url}/breachedaccount/{email}"
-            headers = {
-                'Accept': 'application/json'
-            }
-            
-            response = self._make_request('GET', url, headers=headers)
-            
-            if response.status_code == 200:
-                breaches = response.json()
-                return {
-                    'found': True,
-                    'breaches': breaches,
-                    'total': len(breaches),
-                    'message': f'Found {len(breaches)} breaches in HIBP',
-                    'status': 'found',
-                    'source': 'HIBP'
-                }
-            elif response.status_code == 404:
-                return {
-                    'found': False,
-                    'message': 'Email tidak ditemukan dalam HIBP database',
-                    'status': 'clean',
-                    'source': 'HIBP'
-                }
-            elif response.status_code == 429:
-                return {
-                    'error': 'HIBP rate limit exceeded. Try again later.',
-                    'status': 'rate_limited',
-                    'source': 'HIBP'
-                }
-            elif response.status_code == 401:
-                return {
-                    'error': 'HIBP API requires authentication for this request',
-                    'status': 'auth_required',
+    def check_passwords(self, passwords: List[str]) -> List[Dict]:
+        """Batch versi check_password; hasil mengikuti urutan input"""
+        return self.check_password_hashes([
+            hashlib.sha1(password.encode('utf-8')).hexdigest() for password in passwords
+        ])
+    
+    def check_password_hashes(self, sha1_hashes: List[str],
+                              max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Batch check SHA-1 hex (plaintext tidak pernah dibutuhkan). Hash
+        dikelompokkan per prefix 5-hex sehingga setiap range diambil sekali,
+        lalu semua suffix dalam grup di-resolve dari payload yang sama.
+        Range berbeda diambil paralel, maksimal `max_workers` sekaligus.
+        """
+        results: List[Optional[Dict]] = [None] * len(sha1_hashes)
+        groups: Dict[str, List[Tuple[int, str]]] = {}
+        offline_db = self.offline_db
+        for index, sha1_hash in enumerate(sha1_hashes):
+            sha1_hash = sha1_hash.strip().upper()
+            if not SHA1_HEX.fullmatch(sha1_hash):
+                results[index] = {
+                    'error': 'Invalid SHA-1 hash (expected 40 hex characters)',
+                    'status': 'invalid_hash',
                     'source': 'HIBP'
                 }
+            elif offline_db is not None:
+                results[index] = self._offline_result(offline_db, sha1_hash)
             else:
-                return {
-                    'error': f'HIBP API error: HTTP {response.status_code}',
-                    'status': 'api_error',
-                    'source': 'HIBP'
-                }
+                groups.setdefault(sha1_hash[:5], []).append((index, sha1_hash[5:]))
+        
+        def resolve(prefix: str, members: List[Tuple[int, str]]):
+            try:
+                password_range, status_code = self._get_range(prefix)
+                for index, suffix in members:
+                    results[index] = self._password_result(password_range, status_code, suffix)
+            except Exception as e:
+                for index, _ in members:
+                    results[index] = {
+                        'error': f'Error checking password: {str(e)}',
+                        'status': 'exception',
+                        'source': 'HIBP'
+                    }
+        
+        if groups:
+            workers = min(max_workers or Config.PASSWORD_BATCH_CONCURRENCY, len(groups))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hibp-range') as executor:
+                for future in [executor.submit(resolve, prefix, members)
+                               for prefix, members in groups.items()]:
+                    future.result()
+        
+        return results
+    
+    def _hash_password(self, password: str) -> Tuple[str, str]:
+        """Hash password dengan SHA-1, return (prefix, suffix)"""
+        sha1_hash = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+        return sha1_hash[:5], sha1_hash[5:]
+    
+    def _range_url(self, prefix: str) -> str:
+        return f"{self.base_url}/range/{prefix}"
+    
+    def _get_range(self, prefix: str) -> Tuple[Optional[PasswordRange], int]:
+        """Ambil range untuk prefix (dari cache bila masih fresh)"""
+        password_range, headers = self._cached_range(prefix)
+        if password_range is not None:
+            return password_range, 200
+        return range_flight.do(prefix, lambda: self._fetch_range(prefix, headers))
+    
+    def _fetch_range(self, prefix: str, headers: Dict) -> Tuple[Optional[PasswordRange], int]:
+        """Query API dengan prefix saja (k-anonymity)"""
+        response = self._make_request('GET', self._range_url(prefix), rate_limited=False,
+                                      circuit_breaker=self.range_breaker, headers=headers)
+        password_range = self._store_range(prefix, response)
+        if password_range is None and response.status_code == 304:
+            # Entry ter-evict selama request berjalan, ambil ulang tanpa ETag
+            response = self._make_request('GET', self._range_url(prefix), rate_limited=False,
+                                          circuit_breaker=self.range_breaker)
+            password_range = self._store_range(prefix, response)
+        return password_range, response.status_code
+    
+    def _cached_range(self, prefix: str) -> Tuple[Optional[PasswordRange], Dict]:
+        """Return (range fresh, None) atau (None, header conditional request)"""
+        password_range = self.range_cache.get(prefix)
+        if password_range is not None:
+            return password_range, None
+        
+        stale = self.range_cache.get_stale(prefix)
+        if stale is not None and stale.etag:
+            return None, {'If-None-Match': stale.etag}
+        return None, {}
+    
+    def _store_range(self, prefix: str, response) -> Optional[PasswordRange]:
+        """Parse response 200 sekali lalu cache; perpanjang entry lama untuk 304"""
+        if response.status_code == 304:
+            return self.range_cache.revalidate(prefix)
+        if response.status_code != 200:
+            return None
+        
+        password_range = PasswordRange.parse(response.content)
+        self.range_cache.set(prefix, password_range, size=password_range.nbytes,
+                             etag=response.headers.get('ETag'))
+        return password_range
+    
+    def _password_result(self, password_range: Optional[PasswordRange],
+                         status_code: int, suffix: str) -> Dict:
+        """Interpretasi range API untuk satu suffix"""
+        if password_range is not None:
+            return self._count_result(password_range.lookup(suffix))
+        else:
+            return {
+                'error': f'HIBP API error: HTTP {status_code}',
+                'status': 'api_error',
+                'source': 'HIBP'
+            }
+    
+    def _offline_result(self, offline_db: PwnedPasswordsFile, sha1_hash: str) -> Dict:
+        """Lookup di index Pwned Passwords lokal (tanpa network)"""
+        result = self._count_result(offline_db.lookup(sha1_hash))
+        result['mode'] = 'offline'
+        return result
+    
+    def _count_result(self, count: int) -> Dict:
+        """Result dict dari jumlah kemunculan password"""
+        if count > 0:
+            return {
+                'pwned': True,
+                'count': count,
+                'message': f'Password ditemukan dalam {count} breach',
+                'status': 'found',
+                'source': 'HIBP'
+            }
+        return {
+            'pwned': False,
+            'count': 0,
+            'message': 'Password tidak ditemukan dalam database',
+            'status': 'clean',
+            'source': 'HIBP'
+        }
+    
+    def _fetch_email(self, email: str) -> Dict:
+        """Check email breaches (rate limited)"""
+        try:
+            url, headers = self._email_request(email)
+            response = self._make_request('GET', url, headers=headers)
+            return self._email_result(response)
                 
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
         except Exception as e:
             return {
                 'error': f'Error with HIBP API: {str(e)}',
                 'status': 'exception',
                 'source': 'HIBP'
             }
+    
+    def _email_request(self, email: str) -> Tuple[str, Dict]:
+        # Hanya nama breach; metadata lengkap ada di katalog lokal (breach_catalog.py)
+        url = f"{self.breaches_url}/breachedaccount/{email}?truncateResponse=true"
+        headers = {
+            'Accept': 'application/json'
+        }
+        return url, headers
+    
+    def _email_result(self, response) -> Dict:
+        """Interpretasi response breachedaccount"""
+        if response.status_code == 200:
+            breaches = breach_refs(response.json())
+            return {
+                'found': True,
+                'breaches': breaches,
+                'total': len(breaches),
+                'message': f'Found {len(breaches)} breaches in HIBP',
+                'status': 'found',
+                'source': 'HIBP'
+            }
+        elif response.status_code == 404:
+            return {
+                'found': False,
+                'message': 'Email tidak ditemukan dalam HIBP database',
+                'status': 'clean',
+                'source': 'HIBP'
+            }
+        elif response.status_code == 429:
+            return {
+                'error': 'HIBP rate limit exceeded. Try again later.',
+                'status': 'rate_limited',
+                'source': 'HIBP'
+            }
+        elif response.status_code == 401:
+            return {
+                'error': 'HIBP API requires authentication for this request',
+                'status': 'auth_required',
+                'source': 'HIBP'
+            }
+        else:
+            return {
+                'error': f'HIBP API error: HTTP {response.status_code}',
+                'status': 'api_error',
+                'source': 'HIBP'
+            }
 
 class DeHashedClient(BaseAPIClient):
     """Client untuk DeHashed API v2"""
     
+    source_name = 'DeHashed'
+    
     def __init__(self):
         super().__init__()
         self.config = APICredentials.DEHASHED
         self.base_url = self.config['base_url']
         self.api_key = self.config['api_key']
+        self._init_rate_limiter('dehashed', self.config['rate_limit'])
+        self._init_circuit_breaker('dehashed')
     
     def _get_headers(self) -> Dict:
         """Get headers untuk DeHashed API"""
@@ -156,70 +523,29 @@ class DeHashedClient(BaseAPIClient):
         headers['DeHashed-Api-Key'] = self.api_key
         return headers
     
-    def check_email(self, email: str) -> Dict:
+    def _not_configured(self) -> Optional[Dict]:
+        """Result not_configured bila API key belum diisi"""
+        if not self.config['enabled'] or self.api_key == 'YOUR_DEHASHED_API_KEY':
+            return {
+                'error': 'DeHashed API not configured',
+                'status': 'not_configured',
+                'source': 'DeHashed'
+            }
+        return None
+    
+    def _fetch_email(self, email: str) -> Dict:
         """Check email menggunakan DeHashed v2 API"""
         try:
-            if not self.config['enabled'] or self.api_key == 'YOUR_DEHASHED_API_KEY':
-                return {
-                    'error': 'DeHashed API not configured',
-                    'status': 'not_configured',
-                    'source': 'DeHashed'
-                }
-            
-            url = f"{self.base_url}{self.config['endpoints']['search']}"
-            payload = {
-                "query": f"email:{email}",
-                "size": self.config['free_tier_limit']
-            }
+            not_configured = self._not_configured()
+            if not_configured:
+                return not_configured
             
+            url, payload = self._email_request(email)
             response = self._make_request('POST', url, json=payload, headers=self._get_headers())
+            return self._email_result(response)
             
-            if response.status_code == 200:
-                data = response.json()
-                entries = data.get('entries', [])
-                return {
-                    'found': len(entries) > 0,
-                    'breaches': entries,
-                    'total': data.get('total', 0),
-                    'message': f"Found {data.get('total', 0)} entries in DeHashed",
-                    'status': 'success',
-                    'source': 'DeHashed',
-                    'api_version': 'v2'
-                }
-            elif response.status_code == 401:
-                # Check if it's subscription issue
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get('error', '')
-                    if 'subscription' in error_msg.lower():
-                        return {
-                            'error': 'DeHashed email search requires paid subscription',
-                            'status': 'subscription_required',
-                            'source': 'DeHashed',
-                            'note': 'Password search still works with current API key'
-                        }
-                except:
-                    pass
-                
-                return {
-                    'error': 'DeHashed API authentication failed',
-                    'status': 'auth_failed',
-                    'source': 'DeHashed'
-                }
-            elif response.status_code == 429:
-                return {
-                    'error': 'DeHashed rate limit exceeded',
-                    'status': 'rate_limited',
-                    'source': 'DeHashed'
-                }
-            else:
-                return {
-                    'error': f'DeHashed API error: HTTP {response.status_code}',
-                    'status': 'api_error',
-                    'source': 'DeHashed',
-                    'response_text': response.text[:200] if response.text else 'No response'
-                }
-            
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
         except Exception as e:
             return {
                 'error': f'Error with DeHashed: {str(e)}',
@@ -227,143 +553,419 @@ class DeHashedClient(BaseAPIClient):
                 'source': 'DeHashed'
             }
     
+    def _email_request(self, email: str) -> Tuple[str, Dict]:
+        url = f"{self.base_url}{self.config['endpoints']['search']}"
+        payload = {
+            "query": f"email:{email}",
+            "size": self.config['free_tier_limit']
+        }
+        return url, payload
+    
+    def _email_result(self, response) -> Dict:
+        """Interpretasi response search DeHashed"""
+        if response.status_code == 200:
+            data = response.json()
+            entries = data.get('entries', [])
+            return {
+                'found': len(entries) > 0,
+                'breaches': entries,
+                'total': data.get('total', 0),
+                'message': f"Found {data.get('total', 0)} entries in DeHashed",
+                'status': 'success',
+                'source': 'DeHashed',
+                'api_version': 'v2'
+            }
+        elif response.status_code == 401:
+            # Check if it's subscription issue
+            try:
+                error_data = response.json()
+                error_msg = error_data.get('error', '')
+                if 'subscription' in error_msg.lower():
+                    return {
+                        'error': 'DeHashed email search requires paid subscription',
+                        'status': 'subscription_required',
+                        'source': 'DeHashed',
+                        'note': 'Password search still works with current API key'
+                    }
+            except:
+                pass
+            
+            return {
+                'error': 'DeHashed API authentication failed',
+                'status': 'auth_failed',
+                'source': 'DeHashed'
+            }
+        elif response.status_code == 429:
+            return {
+                'error': 'DeHashed rate limit exceeded',
+                'status': 'rate_limited',
+                'source': 'DeHashed'
+            }
+        else:
+            return {
+                'error': f'DeHashed API error: HTTP {response.status_code}',
+                'status': 'api_error',
+                'source': 'DeHashed',
+                'response_text': response.text[:200] if response.text else 'No response'
+            }
+    
     def check_password(self, password: str) -> Dict:
         """Check password menggunakan DeHashed v2 API"""
         try:
-            if not self.config['enabled'] or self.api_key == 'YOUR_DEHASHED_API_KEY':
-                return {
-                    'error': 'DeHashed API not configured',
-                    'status': 'not_configured',
-                    'source': 'DeHashed'
-                }
-            
-            # Hash password dengan SHA256
-            sha256_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
-            
-            url = f"{self.base_url}{self.config['endpoints']['search_password']}"
-            payload = {
-                "sha256_hashed_password": sha256_hash
-            }
+            not_configured = self._not_configured()
+            if not_configured:
+                return not_configured
             
+            url, payload = self._password_request(password)
             response = self._make_request('POST', url, json=payload, headers=self._get_headers())
-            
-            if response.status_code == 200:
-                data = response.json()
-                results_found = data.get('results_found', 0)
-                return {
-                    'found': results_found > 0,
-                    'count': results_found,
-                    'message': f"Password found in {results_found} DeHashed entries",
-                    'status': 'success',
-                    'source': 'DeHashed',
-                    'api_version': 'v2'
-                }
-            elif response.status_code == 401:
-                return {
-                    'error': 'DeHashed API authentication failed',
-                    'status': 'auth_failed',
-                    'source': 'DeHashed'
-                }
-            elif response.status_code == 429:
-                return {
-                    'error': 'DeHashed rate limit exceeded',
-                    'status': 'rate_limited',
-                    'source': 'DeHashed'
-                }
-            else:
-                return {
-                    'error': f'DeHashed password API error: HTTP {response.status_code}',
-                    'status': 'api_error',
-                    'source': 'DeHashed'
-                }
+            return self._password_result(response)
                 
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
         except Exception as e:
             return {
                 'error': f'Error with DeHashed password check: {str(e)}',
                 'status': 'exception',
                 'source': 'DeHashed'
             }
+    
+    def _password_request(self, password: str) -> Tuple[str, Dict]:
+        # Hash password dengan SHA256
+        sha256_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
+        
+        url = f"{self.base_url}{self.config['endpoints']['search_password']}"
+        payload = {
+            "sha256_hashed_password": sha256_hash
+        }
+        return url, payload
+    
+    def _password_result(self, response) -> Dict:
+        """Interpretasi response search-password DeHashed"""
+        if response.status_code == 200:
+            data = response.json()
+            results_found = data.get('results_found', 0)
+            return {
+                'found': results_found > 0,
+                'count': results_found,
+                'message': f"Password found in {results_found} DeHashed entries",
+                'status': 'success',
+                'source': 'DeHashed',
+                'api_version': 'v2'
+            }
+        elif response.status_code == 401:
+            return {
+                'error': 'DeHashed API authentication failed',
+                'status': 'auth_failed',
+                'source': 'DeHashed'
+            }
+        elif response.status_code == 429:
+            return {
+                'error': 'DeHashed rate limit exceeded',
+                'status': 'rate_limited',
+                'source': 'DeHashed'
+            }
+        else:
+            return {
+                'error': f'DeHashed password API error: HTTP {response.status_code}',
+                'status': 'api_error',
+                'source': 'DeHashed'
+            }
 
 class IntelligenceXClient(BaseAPIClient):
     """Client untuk Intelligence X API"""
     
+    source_name = 'IntelligenceX'
+    
     def __init__(self):
         super().__init__()
         self.config = APICredentials.INTELX
         self.base_url = self.config['base_url']
         self.api_key = self.config['api_key']
+        self._init_rate_limiter('intelx', self.config['rate_limit'])
+        self._init_circuit_breaker('intelx')
     
-    def check_email(self, email: str) -> Dict:
+    def _not_configured(self) -> Optional[Dict]:
+        """Result not_configured bila API key belum diisi"""
+        if not self.config['enabled'] or self.api_key == 'YOUR_INTELX_API_KEY':
+            return {
+                'error': 'Intelligence X API key not configured',
+                'status': 'not_configured',
+                'source': 'IntelligenceX'
+            }
+        return None
+    
+    def _fetch_email(self, email: str) -> Dict:
         """Check email menggunakan Intelligence X API"""
         try:
-            if not self.config['enabled'] or self.api_key == 'YOUR_INTELX_API_KEY':
-                return {
-                    'error': 'Intelligence X API key not configured',
-                    'status': 'not_configured',
-                    'source': 'IntelligenceX'
-                }
-            
-            url = f"{self.base_url}{self.config['endpoints']['search']}"
-            data = {
-                'term': email,
-                'maxresults': self.config['free_tier_limit'],
-                'media': 0,
-                'target': 1
-            }
-            
-            headers = {
-                'x-key': self.api_key,
-                'Content-Type': 'application/json'
-            }
+            not_configured = self._not_configured()
+            if not_configured:
+                return not_configured
             
+            url, data, headers = self._email_request(email)
             response = self._make_request('POST', url, json=data, headers=headers)
+            return self._email_result(response)
             
-            if response.status_code == 200:
-                result = response.json()
-                selectors = result.get('selectors', [])
-                return {
-                    'found': len(selectors) > 0,
-                    'results': selectors,
-                    'total': len(selectors),
-                    'message': f"Found {len(selectors)} results in Intelligence X",
-                    'status': 'success',
-                    'source': 'IntelligenceX'
-                }
-            else:
-                return {
-                    'error': f'Intelligence X API error: HTTP {response.status_code}',
-                    'status': 'api_error',
-                    'source': 'IntelligenceX'
-                }
-            
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
         except Exception as e:
             return {
                 'error': f'Error with Intelligence X: {str(e)}',
                 'status': 'exception',
                 'source': 'IntelligenceX'
             }
+    
+    def _email_request(self, email: str) -> Tuple[str, Dict, Dict]:
+        url = f"{self.base_url}{self.config['endpoints']['search']}"
+        data = {
+            'term': email,
+            'maxresults': self.config['free_tier_limit'],
+            'media': 0,
+            'target': 1
+        }
+        
+        headers = {
+            'x-key': self.api_key,
+            'Content-Type': 'application/json'
+        }
+        return url, data, headers
+    
+    def _email_result(self, response) -> Dict:
+        """Interpretasi response phonebook search"""
+        if response.status_code == 200:
+            result = response.json()
+            selectors = result.get('selectors', [])
+            return {
+                'found': len(selectors) > 0,
+                'results': selectors,
+                'total': len(selectors),
+                'message': f"Found {len(selectors)} results in Intelligence X",
+                'status': 'success',
+                'source': 'IntelligenceX'
+            }
+        else:
+            return {
+                'error': f'Intelligence X API error: HTTP {response.status_code}',
+                'status': 'api_error',
+                'source': 'IntelligenceX'
+            }
+
+class LocalIndexSnapshot:
+    """Snapshot immutable dari database lokal; diganti utuh saat file berubah"""
+    
+    __slots__ = ('key', 'emails', 'total_lines', 'file_size', 'mtime')
+    
+    def __init__(self, key: Tuple[int, int], emails: frozenset, total_lines: int,
+                 file_size: int, mtime: float):
+        self.key = key
+        self.emails = emails
+        self.total_lines = total_lines
+        self.file_size = file_size
+        self.mtime = mtime
+    
+    def __contains__(self, email: str) -> bool:
+        return email in self.emails
+    
+    def get_stats(self) -> Dict:
+        return {
+            'engine': 'memory',
+            'total_emails': self.total_lines,
+            'unique_emails': len(self.emails),
+            'file_size': self.file_size,
+            'last_modified': self.mtime
+        }
 
 class LocalDatabaseClient:
-    """Client untuk local breach database"""
+    """
+    Client untuk local breach database.
+    
+    Lookup memakai snapshot (hash set atau index sharded) ditambah overlay
+    `_additions`: email yang sudah ada di file tapi belum masuk snapshot,
+    termasuk yang masih di buffer tulis. File diperlakukan append-only selama
+    aplikasi berjalan; penulisan ulang file dideteksi lewat mtime/size.
+    """
     
     def __init__(self):
         from config import DatabaseConfig
         self.config = DatabaseConfig.LOCAL_DB
         self.file_path = self.config['file']
+        self.encoding = self.config['encoding']
+        self.sharded = self.config['engine'] == 'sharded'
+        # Engine sharded memantau manifest; index ditulis ulang utuh saat rebuild
+        self.watch_path = (os.path.join(self.config['index_dir'], 'manifest.json')
+                           if self.sharded else self.file_path)
+        self._snapshot = None
+        self._reload_lock = threading.Lock()
+        self._last_stat_check = 0.0
+        
+        # Write path: buffer (normalized -> baris asli) + overlay lookup
+        self._pending: Dict[str, str] = {}
+        self._additions = set()
+        self._source_offset = 0
+        # (mtime_ns, size) file sumber saat terakhir dibaca/ditulis proses ini
+        self._journal_key: Optional[Tuple[int, int]] = None
+        self._overlay_warned = False
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+    
+    def _normalize(self, email: str) -> str:
+        """Normalisasi email sesuai setting case_sensitive"""
+        return normalize_email(email, self.config['case_sensitive'])
+    
+    def _get_snapshot(self):
+        """
+        Index untuk database lokal (LocalIndexSnapshot atau ShardedEmailIndex).
+        File di-stat paling sering sekali per `reload_check_interval`; index
+        dibangun/dibuka ulang hanya bila mtime/size berubah. Reader lain tetap
+        memakai snapshot lama selama reload berjalan.
+        """
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._last_stat_check < self.config['reload_check_interval']:
+            return snapshot
+        self._last_stat_check = now
+        
+        stat = os.stat(self.watch_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if snapshot is not None and snapshot.key == key:
+            if self.sharded:
+                self._read_journal()
+            return snapshot
+        
+        # Hanya satu thread yang reload; yang lain tidak menunggu bila ada snapshot lama
+        if not self._reload_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            if self._snapshot is None or self._snapshot.key != key:
+                # flush ditahan selama reload supaya overlay konsisten dengan file
+                with self._flush_lock:
+                    snapshot, offset, tail = self._load_snapshot()
+                    with self._buffer_lock:
+                        self._additions = tail | self._pending.keys()
+                        self._source_offset = offset
+                    self._journal_key = None  # stat berikutnya membaca sisa tail bila ada
+                    self._snapshot = snapshot
+            return self._snapshot
+        finally:
+            self._reload_lock.release()
+    
+    def _load_snapshot(self) -> Tuple[object, int, set]:
+        """
+        Buka index sharded, atau baca file sekali dan bangun hash set email.
+        Return (snapshot, offset file sumber yang sudah tercakup, email overlay).
+        """
+        if self.sharded:
+            index = ShardedEmailIndex(self.config['index_dir'], self.config['case_sensitive'])
+            offset = index.manifest.get('source_size', 0)
+            try:
+                with open(self.file_path, 'rb') as f:
+                    tail, offset = self._read_tail(f, offset)
+            except FileNotFoundError:
+                tail = set()
+            return index, offset, {email for email in tail if email not in index}
+        
+        with open(self.file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            emails = set()
+            total_lines = 0
+            for line in f:
+                total_lines += 1
+                email = self._normalize(line.decode(self.encoding, errors='replace'))
+                if email:
+                    emails.add(email)
+            offset = f.tell()
+        
+        snapshot = LocalIndexSnapshot(
+            key=(stat.st_mtime_ns, stat.st_size),
+            emails=frozenset(emails),
+            total_lines=total_lines,
+            file_size=stat.st_size,
+            mtime=stat.st_mtime
+        )
+        return snapshot, offset, set()
+    
+    def _stat_journal(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_journal(self):
+        """
+        Engine sharded: manifest tidak berubah saat worker lain meng-append ke
+        file sumber, jadi file itu di-stat sendiri dan baris barunya dibaca ke
+        overlay. File yang mengecil atau ditulis ulang dibaca dari awal.
+        """
+        key = self._stat_journal()
+        if key is None or key == self._journal_key:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return  # flush yang sedang berjalan juga membaca tail
+        try:
+            snapshot = self._snapshot
+            with open(self.file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                start = self._source_offset if size > self._source_offset else 0
+                tail, offset = self._read_tail(f, start)
+            with self._buffer_lock:
+                self._additions |= {email for email in tail if email not in snapshot}
+                self._source_offset = offset
+            self._journal_key = key
+        finally:
+            self._flush_lock.release()
+        self._check_overlay()
+    
+    def _check_overlay(self):
+        """
+        Batasi overlay (`overlay_max_entries`): buffer di-flush, lalu engine
+        memory menggabungkan overlay ke snapshot baru. Engine sharded hanya
+        bisa dikecilkan dengan rebuild index, jadi cukup diberi peringatan.
+        """
+        if len(self._additions) <= self.config['overlay_max_entries']:
+            return
+        self.flush()
+        with self._flush_lock:
+            snapshot = self._snapshot
+            if isinstance(snapshot, LocalIndexSnapshot):
+                with self._buffer_lock:
+                    flushed = self._additions.difference(self._pending)
+                    self._snapshot = LocalIndexSnapshot(
+                        key=snapshot.key,
+                        emails=snapshot.emails | flushed,
+                        total_lines=snapshot.total_lines,
+                        file_size=snapshot.file_size,
+                        mtime=snapshot.mtime
+                    )
+                    self._additions -= flushed
+            elif not self._overlay_warned:
+                self._overlay_warned = True
+                print(f"⚠️ Local index overlay has {len(self._additions):,} emails, "
+                      f"rebuild it with: python local_index.py build {self.file_path} {self.config['index_dir']}")
+    
+    def _read_tail(self, f, offset: int) -> Tuple[set, int]:
+        """Email yang ditulis (oleh proses mana pun) setelah `offset`"""
+        size = os.fstat(f.fileno()).st_size
+        if size <= offset:
+            return set(), size
+        
+        f.seek(offset)
+        emails = set()
+        for line in f.read(size - offset).splitlines():
+            email = self._normalize(line.decode(self.encoding, errors='replace'))
+            if email:
+                emails.add(email)
+        return emails, size
     
     def check_email(self, email: str) -> Dict:
         """Check email terhadap database lokal"""
         try:
             try:
-                with open(self.file_path, 'r', encoding=self.config['encoding']) as f:
-                    breached_emails = f.read().splitlines()
-                
-                # Case insensitive comparison if configured
-                if not self.config['case_sensitive']:
-                    email_lower = email.lower()
-                    found = email_lower in [e.lower() for e in breached_emails]
-                else:
-                    found = email in breached_emails
+                email = self._normalize(email)
+                started = time.perf_counter()
+                found = email in self._get_snapshot() or email in self._additions
+                metrics.observe_local_lookup(self.config['engine'], time.perf_counter() - started)
                 
                 if found:
                     return {
@@ -382,7 +984,7 @@ class LocalDatabaseClient:
                     
             except FileNotFoundError:
                 return {
-                    'error': f'Local breach database not found: {self.file_path}',
+                    'error': f'Local breach database not found: {self.watch_path}',
                     'status': 'db_missing',
                     'source': 'LocalDB'
                 }
@@ -395,26 +997,137 @@ class LocalDatabaseClient:
             }
     
     def add_email(self, email: str) -> bool:
-        """Add email to local database"""
+        """Add email to local database (buffered, lihat add_emails)"""
         try:
-            with open(self.file_path, 'a', encoding=self.config['encoding']) as f:
-                f.write(f"{email}\n")
+            self.add_emails([email])
             return True
         except Exception:
             return False
     
+    def add_emails(self, emails) -> int:
+        """
+        Tambahkan banyak email sekaligus. Email yang sudah ada (di snapshot,
+        overlay, atau buffer) dilewati; sisanya langsung terlihat oleh
+        check_email dan ditulis ke file per batch (`write_batch_size`) atau
+        paling lambat setelah `write_flush_interval` detik.
+        Return jumlah email baru.
+        """
+        try:
+            snapshot = self._get_snapshot()
+        except FileNotFoundError:
+            snapshot = None  # file dibuat saat flush pertama
+        
+        added = 0
+        with self._buffer_lock:
+            for email in emails:
+                line = email.strip()
+                if not line or '\n' in line or '\r' in line:
+                    continue
+                key = self._normalize(line)
+                if key in self._additions or (snapshot is not None and key in snapshot):
+                    continue
+                self._additions.add(key)
+                self._pending[key] = line
+                added += 1
+            
+            pending = len(self._pending)
+            interval = self.config['write_flush_interval']
+            if pending and interval > 0 and self._flush_timer is None:
+                self._flush_timer = threading.Timer(interval, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if pending >= self.config['write_batch_size'] or (pending and interval <= 0):
+            self.flush()
+        self._check_overlay()
+        return added
+    
+    def _timed_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️ Local database flush failed: {e}")
+    
+    def flush(self) -> int:
+        """
+        Tulis buffer ke file: satu append + fsync per batch di bawah flock,
+        sehingga worker lain tidak bisa menyisipkan tulisan di tengah batch.
+        Baris yang ditulis worker lain sejak flush/reload terakhir dibaca dulu
+        untuk dedupe dan dimasukkan ke overlay. Return jumlah baris ditulis.
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._pending = self._pending, {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if not batch:
+                return 0
+            
+            try:
+                return self._append(batch)
+            except Exception:
+                # Kembalikan ke buffer supaya dicoba lagi pada flush berikutnya
+                with self._buffer_lock:
+                    batch.update(self._pending)
+                    self._pending = batch
+                raise
+    
+    def _append(self, batch: Dict[str, str]) -> int:
+        """Append batch ke file database (flush lock sudah dipegang)"""
+        snapshot = self._snapshot
+        with open(self.file_path, 'ab+') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                before = os.fstat(f.fileno())
+                appended = before.st_size >= self._source_offset
+                if appended:
+                    existing, _ = self._read_tail(f, self._source_offset)
+                else:
+                    existing = set()  # file ditulis ulang; reload berikutnya membaca semuanya
+                
+                lines = [line for key, line in batch.items() if key not in existing]
+                payload = ''.join(f'{line}\n' for line in lines).encode(self.encoding)
+                if payload and before.st_size:
+                    f.seek(before.st_size - 1)
+                    if f.read(1) != b'\n':
+                        payload = b'\n' + payload
+                if payload:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                after = os.fstat(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        
+        if snapshot is not None:
+            existing = {email for email in existing if email not in snapshot}
+        with self._buffer_lock:
+            self._additions |= existing
+            if appended:
+                self._source_offset = after.st_size
+                self._journal_key = (after.st_mtime_ns, after.st_size)
+        
+        # Tulisan sendiri (dan tail yang sudah dibaca) tidak perlu memicu reload penuh
+        if appended and isinstance(snapshot, LocalIndexSnapshot) and self._snapshot is snapshot:
+            self._snapshot = LocalIndexSnapshot(
+                key=(after.st_mtime_ns, after.st_size),
+                emails=snapshot.emails,
+                total_lines=snapshot.total_lines + len(existing) + len(lines),
+                file_size=after.st_size,
+                mtime=after.st_mtime
+            )
+        return len(lines)
+    
     def get_stats(self) -> Dict:
         """Get statistics about local database"""
         try:
-            with open(self.file_path, 'r', encoding=self.config['encoding']) as f:
-                emails = f.read().splitlines()
-            
-            return {
-                'total_emails': len(emails),
-                'unique_emails': len(set(emails)),
-                'file_size': os.path.getsize(self.file_path),
-                'last_modified': os.path.getmtime(self.file_path)
-            }
+            stats = self._get_snapshot().get_stats()
+            stats['unique_emails'] += len(self._additions)
+            stats['pending_writes'] = len(self._pending)
+            return stats
         except Exception as e:
             return {
                 'error': str(e),
@@ -4,24 +4,50 @@ Flask Application untuk Breach Checker
 Clean architecture dengan separation of concerns
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, abort, g, render_template, request, jsonify, stream_with_context, url_for
+from werkzeug.middleware.proxy_fix import ProxyFix
 import sys
 import os
+import math
 import time
 from datetime import datetime
 
 # Import refactored components
-from config import get_config, validate_config
+from config import DatabaseConfig, SecurityConfig, get_config, validate_config
 from breach_checker import BreachChecker
+from breach_catalog import FLAG_FILTERS, get_breach_catalog
+from deadline import deadline_scope
+import client_rate_limit
+import compression
+import json_provider
+import metrics
 
 # Get configuration
 config_class = get_config()
 app = Flask(__name__)
 app.config.from_object(config_class)
 
+# orjson untuk semua jsonify (fallback ke json stdlib), waktu encode diukur
+json_provider.init_app(app)
+
 # Initialize breach checker
 checker = BreachChecker()
 
+# Prometheus /metrics (no-op tanpa prometheus-flask-exporter)
+metrics.init_app(app)
+
+# Client identity dari X-Forwarded-For hanya bila ada proxy terpercaya
+if SecurityConfig.TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=SecurityConfig.TRUSTED_PROXIES)
+
+# Rate limit per client untuk /api (SecurityConfig.RATE_LIMITS)
+client_limiter = client_rate_limit.init_app(app)
+
+# ETag/304 dan gzip/brotli untuk response buffered, asset_url() untuk template
+compression.init_app(app)
+
+STATIC_DIR = os.path.join(app.root_path, 'static')
+
 @app.route('/')
 def index():
     """Homepage - render existing index.html"""
@@ -44,6 +70,19 @@ def stats():
 
 # API Endpoints
 
+def request_deadline(endpoint: str, header_value: str = None) -> float:
+    """
+    Deadline (detik) untuk satu request: header X-Request-Deadline bila valid
+    (detik, dibatasi MAX_REQUEST_DEADLINE), selain itu default per endpoint
+    """
+    try:
+        seconds = float(header_value) if header_value else 0.0
+    except ValueError:
+        seconds = 0.0
+    if not 0 < seconds < float('inf'):
+        return config_class.REQUEST_DEADLINES[endpoint]
+    return min(seconds, config_class.MAX_REQUEST_DEADLINE)
+
 @app.route('/api/check-account', methods=['POST'])
 def api_check_account():
     """API endpoint untuk check email/username"""
@@ -55,30 +94,194 @@ def api_check_account():
             return jsonify({'error': 'Account tidak boleh kosong'}), 400
         
         # Check menggunakan refactored breach checker
-        results = checker.check_email(account)
-        
-        # Format response untuk frontend compatibility
-        response = {
-            'found': results['summary']['found'],
-            'breaches': [],
-            'sources': results['sources'],
-            'summary': results['summary'],
-            'timestamp': results['timestamp']
-        }
+        fields = requested_fields(ACCOUNT_FIELDS)
+        with deadline_scope(request_deadline('check_account', request.headers.get(config_class.DEADLINE_HEADER))):
+            results = checker.check_email(account)
+        
+        return jsonify(format_account_response(results, expand_breaches(), fields))
         
-        # Extract breach details
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Sumber yang `breaches`-nya berisi nama breach katalog HIBP
+CATALOG_SOURCES = ('hibp',)
+
+# Key top-level yang bisa dipilih lewat ?fields=
+ACCOUNT_FIELDS = ('found', 'breaches', 'sources', 'summary', 'timings_ms', 'timestamp', 'breach_details')
+PASSWORD_FIELDS = ('pwned', 'count', 'message', 'sources', 'summary', 'timings_ms', 'timestamp')
+COMPREHENSIVE_FIELDS = ('email', 'timestamp', 'config_status', 'email_check', 'password_check', 'overall_summary')
+
+def format_account_response(results: dict, expand: bool = False, fields: frozenset = None) -> dict:
+    """
+    Format hasil check_email untuk frontend. breaches[] ringkas: sumber, total
+    dan nama breach; hasil per sumber hanya ada di `sources` (tidak disalin).
+    expand=True menambahkan `breach_details`, metadata katalog satu kali per
+    nama breach. `fields` (requested_fields) membatasi key top-level; bagian
+    yang tidak diminta tidak dibangun.
+    """
+    def wanted(name: str) -> bool:
+        return fields is None or name in fields
+    
+    expand = expand and wanted('breach_details')
+    response = {}
+    if wanted('found'):
+        response['found'] = results['summary']['found']
+    
+    if wanted('breaches') or expand:
+        breaches = []
         for source_name, source_result in results['sources'].items():
             if source_result.get('found'):
-                response['breaches'].append({
+                breach = {
                     'source': source_name,
-                    'data': source_result
-                })
+                    'total': source_result.get('total', 1)
+                }
+                if source_name in CATALOG_SOURCES:
+                    breach['names'] = source_result.get('breaches', [])
+                breaches.append(breach)
+        if wanted('breaches'):
+            response['breaches'] = breaches
+    
+    for key in ('sources', 'summary', 'timings_ms', 'timestamp'):
+        if wanted(key):
+            response[key] = results[key]
+    
+    if expand:
+        names = [name for breach in breaches for name in breach.get('names', ())]
+        response['breach_details'] = get_breach_catalog().expand(names)
+    
+    return response
+
+class InvalidFields(ValueError):
+    """?fields= berisi key yang tidak ada di response"""
+
+def parse_fields(value: str, allowed: tuple) -> frozenset:
+    """'summary,found' -> subset key top-level response; None = semua"""
+    fields = frozenset(field.strip() for field in (value or '').split(',') if field.strip())
+    if not fields:
+        return None
+    unknown = fields.difference(allowed)
+    if unknown:
+        raise InvalidFields(f"fields tidak dikenal: {', '.join(sorted(unknown))} (pilihan: {', '.join(allowed)})")
+    return fields
+
+def requested_fields(allowed: tuple) -> frozenset:
+    """parse_fields() untuk ?fields= request Flask"""
+    return parse_fields(request.args.get('fields'), allowed)
+
+def select_fields(response: dict, fields: frozenset = None) -> dict:
+    return response if fields is None else {key: value for key, value in response.items() if key in fields}
+
+def expand_breaches() -> bool:
+    """?expand=breaches: sertakan metadata katalog untuk setiap breach yang ditemukan"""
+    return 'breaches' in request.args.get('expand', '').split(',')
+
+@app.route('/api/check-account/stream', methods=['POST'])
+def api_check_account_stream():
+    """
+    Check email/username via Server-Sent Events: event `start`, lalu `source`
+    per sumber begitu selesai, terakhir `summary` (bentuk sama dengan
+    /api/check-account). Hanya POST JSON (dibaca lewat fetch): account tidak
+    boleh masuk query string, access log dan history browser.
+    """
+    try:
+        account = (request.get_json() or {}).get('account', '').strip()
         
-        return jsonify(response)
+        if not account:
+            return jsonify({'error': 'Account tidak boleh kosong'}), 400
         
+        seconds = request_deadline('check_account', request.headers.get(config_class.DEADLINE_HEADER))
+        expand = expand_breaches()
+        fields = requested_fields(ACCOUNT_FIELDS)
+        
+        def generate():
+            try:
+                with deadline_scope(seconds):
+                    for event, payload in checker.check_email_stream(account):
+                        if event == 'summary':
+                            payload = format_account_response(payload, expand, fields)
+                        yield sse_event(event, payload)
+            except Exception as e:
+                yield sse_event('error', {'error': str(e)})
+        
+        return Response(stream_with_context(generate()), mimetype='text/event-stream', headers=SSE_HEADERS)
+        
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Jangan di-cache dan jangan di-buffer reverse proxy (nginx)
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+}
+
+def sse_event(event: str, payload: dict) -> bytes:
+    """Satu event Server-Sent Events dengan data JSON satu baris"""
+    return b'event: ' + event.encode('utf-8') + b'\ndata: ' + json_provider.dumps(payload) + b'\n\n'
+
+@app.route('/api/check-accounts', methods=['POST'])
+def api_check_accounts():
+    """
+    Bulk account check. Input: JSON {"accounts": [...]}, upload file
+    (field `file`, satu account per baris) atau body text/plain.
+    Output: NDJSON, satu baris per account begitu hasilnya selesai.
+    """
+    try:
+        lines = None
+        if request.is_json:
+            data = request.get_json()
+            lines = data.get('accounts') if isinstance(data, dict) else None
+            if not isinstance(lines, list):
+                return jsonify({'error': 'accounts harus berupa list'}), 400
+        expand = expand_breaches()
+        fields = requested_fields(ACCOUNT_FIELDS)
+        
+        def generate():
+            # Upload dibaca di dalam generator, selagi request context masih aktif
+            source = lines if lines is not None else iter_upload_lines()
+            # Satu unit rate limit per account; input berhenti dibaca begitu kuota habis
+            accounts = client_rate_limit.charge_each(iter_bulk_accounts(source, config_class.BULK_MAX_ACCOUNTS))
+            try:
+                for results in checker.check_emails_iter(accounts):
+                    line = format_account_response(results, expand, fields)
+                    line['account'] = results['email']
+                    yield json_provider.dumps(line) + b'\n'
+            except BulkLimitExceeded as e:
+                yield json_provider.dumps({'error': str(e)}) + b'\n'
+            except client_rate_limit.ClientRateLimitExceeded as e:
+                yield json_provider.dumps({'error': str(e), 'retry_after': e.retry_after}) + b'\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+class BulkLimitExceeded(Exception):
+    """Input bulk melebihi Config.BULK_MAX_ACCOUNTS"""
+
+def iter_upload_lines():
+    """Baris dari upload multipart (field `file`) atau body text/plain"""
+    stream = request.files['file'].stream if 'file' in request.files else request.stream
+    for line in stream:
+        yield line.decode('utf-8', errors='replace')
+
+def iter_bulk_accounts(lines, limit: int):
+    """Normalisasi (strip + lowercase) dan dedupe account dari input bulk"""
+    seen = set()
+    for line in lines:
+        account = str(line).strip().lower()
+        if not account or account in seen:
+            continue
+        if len(seen) >= limit:
+            raise BulkLimitExceeded(f'Maksimal {limit} account per request')
+        seen.add(account)
+        yield account
+
 @app.route('/api/check-password', methods=['POST'])
 def api_check_password():
     """API endpoint untuk check password menggunakan k-anonymity"""
@@ -89,22 +292,63 @@ def api_check_password():
         if not password:
             return jsonify({'error': 'Password tidak boleh kosong'}), 400
         
+        fields = requested_fields(PASSWORD_FIELDS)
         # Check password menggunakan refactored checker
-        results = checker.check_password(password)
-        
-        # Format response untuk frontend compatibility
-        hibp_result = results['sources'].get('hibp', {})
-        response = {
-            'pwned': hibp_result.get('pwned', False),
-            'count': hibp_result.get('count', 0),
-            'message': hibp_result.get('message', 'Password check completed'),
-            'sources': results['sources'],
-            'summary': results['summary'],
-            'timestamp': results['timestamp']
-        }
+        with deadline_scope(request_deadline('check_password', request.headers.get(config_class.DEADLINE_HEADER))):
+            results = checker.check_password(password)
         
-        return jsonify(response)
+        return jsonify(format_password_response(results, fields))
         
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def format_password_response(results: dict, fields: frozenset = None) -> dict:
+    """Format hasil check_password untuk frontend compatibility"""
+    hibp_result = results['sources'].get('hibp', {})
+    return select_fields({
+        'pwned': hibp_result.get('pwned', False),
+        'count': hibp_result.get('count', 0),
+        'message': hibp_result.get('message', 'Password check completed'),
+        'sources': results['sources'],
+        'summary': results['summary'],
+        'timings_ms': results['timings_ms'],
+        'timestamp': results['timestamp']
+    }, fields)
+
+@app.route('/api/check-passwords', methods=['POST'])
+@client_rate_limit.charged_by_view
+def api_check_passwords():
+    """
+    Batch password audit. Body: {"passwords": [...]} atau {"hashes": [...]}
+    (SHA-1 hex, sehingga plaintext tidak perlu dikirim ke server).
+    """
+    try:
+        data = request.get_json()
+        passwords = data.get('passwords')
+        hashes = data.get('hashes')
+        items = hashes if hashes is not None else passwords
+        # Satu unit rate limit per item dalam satu hit (maksimal satu burst penuh);
+        # body yang ditolak validasi tetap satu unit
+        valid = isinstance(items, list) and 0 < len(items) <= config_class.PASSWORD_BATCH_MAX
+        client_rate_limit.charge(len(items) if valid else 1)
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'passwords atau hashes harus berupa list yang tidak kosong'}), 400
+        if len(items) > config_class.PASSWORD_BATCH_MAX:
+            return jsonify({'error': f'Maksimal {config_class.PASSWORD_BATCH_MAX} item per request'}), 413
+        items = [str(item) for item in items]
+        
+        if hashes is not None:
+            results = checker.check_password_batch(sha1_hashes=items)
+        else:
+            results = checker.check_password_batch(passwords=items)
+        
+        return jsonify(results)
+        
+    except client_rate_limit.ClientRateLimitExceeded:
+        abort(429)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -119,11 +363,15 @@ def api_comprehensive_check():
         if not email:
             return jsonify({'error': 'Email tidak boleh kosong'}), 400
         
+        fields = requested_fields(COMPREHENSIVE_FIELDS)
         # Comprehensive check
-        results = checker.comprehensive_check(email, password if password else None)
+        with deadline_scope(request_deadline('comprehensive_check', request.headers.get(config_class.DEADLINE_HEADER))):
+            results = checker.comprehensive_check(email, password if password else None)
         
-        return jsonify(results)
+        return jsonify(select_fields(results, fields))
         
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -153,6 +401,7 @@ def api_status():
     """API endpoint untuk system status"""
     try:
         status = checker.get_status()
+        status['client_rate_limit'] = client_limiter.get_stats() if client_limiter else None
         
         # Add system info
         status['system'] = {
@@ -172,6 +421,7 @@ def api_sources():
     """API untuk mendapatkan status sumber data"""
     try:
         config_status = validate_config()
+        local_status = config_status['api_status'].get('local_db', 'unknown')
         
         sources_status = {
             'hibp_passwords': {
@@ -179,109 +429,221 @@ def api_sources():
                 'status': 'active',
                 'free': True,
                 'description': 'Check password breaches menggunakan k-anonymity',
-                'reliability': 'high'
+                **source_health(checker.hibp_client.range_breaker)
             },
             'local_db': {
                 'name': 'Local Database',
-                'status': config_status['api_status'].get('local_db', 'unknown'),
+                'status': local_status,
                 'free': True,
                 'description': 'Database breach lokal',
-                'reliability': 'high'
+                'reliability': 'high' if local_status == 'available' else 'down'
             },
             'hibp_api': {
                 'name': 'HIBP Breached Accounts',
                 'status': 'limited',
                 'free': True,
                 'description': 'Rate limited, requires API key for full access',
-                'reliability': 'medium'
+                **source_health(checker.hibp_client.circuit_breaker)
             },
             'dehashed': {
                 'name': 'DeHashed API v2',
                 'status': config_status['api_status'].get('dehashed', 'unknown'),
                 'free': True,
                 'description': 'Password search working, email search requires subscription',
-                'reliability': 'medium'
+                **source_health(checker.dehashed_client.circuit_breaker)
             },
             'intelx': {
                 'name': 'Intelligence X',
                 'status': config_status['api_status'].get('intelx', 'unknown'),
                 'free': True,
                 'description': 'Limited queries gratis',
-                'reliability': 'unknown'
+                **source_health(checker.intelx_client.circuit_breaker)
             }
         }
         
+        # Sumber dengan breaker terbuka sedang dilewati
+        for source in sources_status.values():
+            if source.get('circuit', {}).get('state') == 'open':
+                source['status'] = 'circuit_open'
+        
         return jsonify(sources_status)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def source_health(breaker) -> dict:
+    """Reliability dari circuit breaker sumber (error rate dan latency terbaru)"""
+    return {
+        'reliability': breaker.reliability(),
+        'circuit': breaker.get_stats()
+    }
+
 @app.route('/api/breaches')
 def api_breaches():
-    """API endpoint untuk mendapatkan daftar breaches"""
-    # Sample data - implement with real breach database later
-    breaches = [
-        {
-            'name': 'LinkedIn',
-            'date': '2012-06-05',
-            'accounts': 164000000,
-            'description': 'Professional networking platform breach',
-            'verified': True
-        },
-        {
-            'name': 'Yahoo',
-            'date': '2013-08-01',
-            'accounts': 3000000000,
-            'description': 'Massive email service breach',
-            'verified': True
-        },
-        {
-            'name': 'Facebook',
-            'date': '2019-04-01',
-            'accounts': 533000000,
-            'description': 'Social media platform data exposure',
-            'verified': True
-        }
-    ]
+    """
+    Katalog breach HIBP (format /api/v3/breaches) dengan filter, sort dan
+    pagination. Filter: q, domain, data_class (boleh berulang), since/until
+    (BreachDate), verified/sensitive/spam_list/... = true|false.
+    Total ada di X-Total-Count, halaman lain di header Link.
+    """
+    catalog = get_breach_catalog()
+    not_modified = catalog_not_modified(catalog)
+    if not_modified is not None:
+        return not_modified
+    
+    settings = DatabaseConfig.BREACH_CATALOG
+    args = request.args
+    try:
+        page = positive_int_arg('page', 1)
+        per_page = min(positive_int_arg('per_page', settings['page_size']), settings['max_page_size'])
+        flags = {flag: bool_arg(param) for param, flag in FLAG_FILTERS.items() if param in args}
+        results = catalog.query(
+            q=args.get('q', ''),
+            domain=args.get('domain', ''),
+            data_classes=args.getlist('data_class'),
+            since=args.get('since', ''),
+            until=args.get('until', ''),
+            flags=flags,
+            sort=args.get('sort', 'date'),
+            order=args.get('order', '')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    start = (page - 1) * per_page
+    response = jsonify([breach.to_dict() for breach in results[start:start + per_page]])
+    response.headers['X-Total-Count'] = str(len(results))
+    links = pagination_links(page, per_page, len(results))
+    if links:
+        response.headers['Link'] = links
+    return catalog_cache_headers(response, catalog)
+
+@app.route('/api/breach/<name>')
+def api_breach(name):
+    """Satu breach berdasarkan Name (case-insensitive)"""
+    catalog = get_breach_catalog()
+    breach = catalog.get(name)
+    if breach is None:
+        return jsonify({'error': 'Breach tidak ditemukan'}), 404
+    
+    not_modified = catalog_not_modified(catalog)
+    if not_modified is not None:
+        return not_modified
+    return catalog_cache_headers(jsonify(breach.to_dict()), catalog)
+
+@app.route('/api/top-dataclasses')
+def api_top_dataclasses():
+    """Data class paling sering muncul di katalog breach"""
+    catalog = get_breach_catalog()
+    not_modified = catalog_not_modified(catalog)
+    if not_modified is not None:
+        return not_modified
     
-    return jsonify(breaches)
+    try:
+        limit = positive_int_arg('limit', 20)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return catalog_cache_headers(jsonify(catalog.top_data_classes(limit)), catalog)
+
+def positive_int_arg(name: str, default: int) -> int:
+    value = request.args.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(f'{name} harus bilangan bulat >= 1')
+    return int(value)
+
+def bool_arg(name: str) -> bool:
+    value = request.args.get(name, '').lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'{name} harus true atau false')
+
+def pagination_links(page: int, per_page: int, total: int) -> str:
+    """Header Link (first/prev/next/last) dengan query string yang sama"""
+    last = max(1, math.ceil(total / per_page))
+    pages = {'first': 1, 'last': last}
+    if page > 1:
+        pages['prev'] = min(page - 1, last)
+    if page < last:
+        pages['next'] = page + 1
+    
+    query = request.args.to_dict(flat=False)
+    links = []
+    for rel, number in pages.items():
+        url = url_for(request.endpoint, **{**query, 'page': number, 'per_page': per_page})
+        links.append(f'<{url}>; rel="{rel}"')
+    return ', '.join(links)
+
+def catalog_not_modified(catalog):
+    """304 bila If-None-Match / If-Modified-Since cocok dengan snapshot katalog"""
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(catalog.etag)
+    elif request.if_modified_since and catalog.mtime:
+        matched = int(catalog.mtime) <= request.if_modified_since.timestamp()
+    else:
+        return None
+    return catalog_cache_headers(Response(status=304), catalog) if matched else None
+
+def catalog_cache_headers(response, catalog):
+    """Validator dari snapshot katalog: ETag = hash isi file, Last-Modified = mtime"""
+    response.set_etag(catalog.etag, weak=True)
+    if catalog.mtime:
+        response.last_modified = catalog.mtime
+    response.cache_control.public = True
+    response.cache_control.max_age = DatabaseConfig.BREACH_CATALOG['cache_max_age']
+    return response
 
 @app.route('/api/stats')
 def api_stats():
-    """API endpoint untuk statistik aplikasi"""
+    """
+    API endpoint untuk statistik aplikasi. Isinya live (counter worker yang
+    belum di-flush, waktu response), jadi tanpa ETag/304: no-store.
+    """
     try:
         # Get system stats
         system_stats = checker.get_status()
         
         # Get local database stats
         local_stats = checker.get_local_db_stats()
+        catalog = get_breach_catalog()
         
         stats = {
+            'totalBreaches': len(catalog),
+            'totalAccounts': catalog.total_accounts,
+            'catalog': catalog.get_stats(),
             'system': system_stats,
             'local_database': local_stats,
-            'last_updated': datetime.now().isoformat()
+            'history': checker.stats_store.history(),
+            'store': checker.stats_store.get_stats(),
+            'last_updated': datetime.now().isoformat(),
+            'last_check': system_stats['stats']['last_check']
         }
         
-        return jsonify(stats)
+        response = jsonify(stats)
+        response.cache_control.no_store = True
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# Static file serving
+# Static file serving (varian .br/.gz precompressed, lihat compression.py)
 @app.route('/assets/<path:filename>')
 def serve_assets(filename):
     """Serve static assets"""
-    return send_from_directory('static/assets', filename)
+    return compression.send_static(os.path.join(STATIC_DIR, 'assets'), filename)
 
 @app.route('/manifest.webmanifest')
 def manifest():
     """Serve PWA manifest"""
-    return send_from_directory('static', 'manifest.webmanifest')
+    return compression.send_static(STATIC_DIR, 'manifest.webmanifest')
 
 @app.route('/sw.js')
 def service_worker():
     """Serve service worker"""
-    return send_from_directory('static', 'sw.js')
+    return compression.send_static(STATIC_DIR, 'sw.js')
 
 # Error handlers
 @app.errorhandler(404)
@@ -294,7 +656,11 @@ def internal_error(error):
 
 @app.errorhandler(429)
 def rate_limit_error(error):
-    return jsonify({'error': 'Rate limit exceeded. Please try again later.'}), 429
+    response = {'error': 'Rate limit exceeded. Please try again later.'}
+    result = g.get('rate_limit')
+    if result is not None:
+        response['retry_after'] = client_rate_limit.retry_after_seconds(result)
+    return jsonify(response), 429
 
 # Application startup
 def create_app(config_name=None):
@@ -311,6 +677,8 @@ if __name__ == '__main__':
     # Validate configuration on startup
     config_status = validate_config()
     
+    compression.precompress(STATIC_DIR)
+    
     print("🚀 Starting BreachedCheck Flask App...")
     print("=" * 50)
     print(f"📱 Access at: http://localhost:{app.config['PORT']}")
@@ -325,12 +693,17 @@ if __name__ == '__main__':
     print("\n🔍 Available API endpoints:")
     endpoints = [
         "POST /api/check-account",
+        "POST /api/check-account/stream",
+        "POST /api/check-accounts",
         "POST /api/check-password", 
+        "POST /api/check-passwords",
         "POST /api/comprehensive-check",
         "POST /api/notify",
         "GET /api/status",
         "GET /api/sources",
         "GET /api/breaches",
+        "GET /api/breach/<name>",
+        "GET /api/top-dataclasses",
         "GET /api/stats"
     ]
     for endpoint in endpoints:
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point untuk Breach Checker
+Endpoint check dilayani langsung oleh AsyncBreachChecker di event loop,
+route lain diteruskan ke Flask app lewat WsgiToAsgi.
+
+Jalankan dengan: uvicorn asgi:application --workers 4
+"""
+
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import (
+    app as flask_app,
+    checker as sync_checker,
+    client_limiter,
+    config_class,
+    SSE_HEADERS,
+    ACCOUNT_FIELDS,
+    COMPREHENSIVE_FIELDS,
+    PASSWORD_FIELDS,
+    InvalidFields,
+    format_account_response,
+    format_password_response,
+    parse_fields,
+    request_deadline,
+    select_fields,
+    sse_event
+)
+from async_breach_checker import AsyncBreachChecker
+import client_rate_limit
+from deadline import deadline_scope
+import json_provider
+import metrics
+
+checker = AsyncBreachChecker(sync_checker)
+wsgi_application = WsgiToAsgi(flask_app)
+
+async def _read_json(receive) -> dict:
+    """Baca seluruh body request sebagai JSON object"""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    data = json.loads(body or b'{}')
+    if not isinstance(data, dict):
+        raise ValueError('Request body harus berupa JSON object')
+    return data
+
+def _deadline(scope, endpoint: str) -> float:
+    """request_deadline() dari header X-Request-Deadline di scope ASGI"""
+    name = config_class.DEADLINE_HEADER.lower().encode('latin-1')
+    value = next((v for k, v in scope.get('headers', []) if k == name), None)
+    return request_deadline(endpoint, value.decode('latin-1') if value else None)
+
+def _query(scope) -> dict:
+    return parse_qs(scope.get('query_string', b'').decode('latin-1'))
+
+def _expand_breaches(scope) -> bool:
+    """expand_breaches() dari query string scope ASGI"""
+    return any('breaches' in value.split(',') for value in _query(scope).get('expand', []))
+
+def _fields(scope, allowed: tuple) -> frozenset:
+    """requested_fields() dari query string scope ASGI"""
+    return parse_fields(','.join(_query(scope).get('fields', [])), allowed)
+
+def _encode_headers(headers: dict) -> list:
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+
+async def _send_json(send, payload: dict, status: int = 200, headers: dict = None):
+    body = json_provider.dumps(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii'))
+        ] + _encode_headers(headers or {})
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def check_account(scope, receive, send):
+    """Async versi POST /api/check-account"""
+    try:
+        data = await _read_json(receive)
+        account = data.get('account', '').strip()
+        
+        if not account:
+            return await _send_json(send, {'error': 'Account tidak boleh kosong'}, 400)
+        
+        fields = _fields(scope, ACCOUNT_FIELDS)
+        with deadline_scope(_deadline(scope, 'check_account')):
+            results = await checker.check_email(account)
+        await _send_json(send, format_account_response(results, _expand_breaches(scope), fields))
+    
+    except InvalidFields as e:
+        await _send_json(send, {'error': str(e)}, 400)
+    except Exception as e:
+        await _send_json(send, {'error': str(e)}, 500)
+
+async def check_account_stream(scope, receive, send):
+    """Async versi POST /api/check-account/stream (Server-Sent Events)"""
+    try:
+        data = await _read_json(receive)
+        account = data.get('account', '').strip()
+    except Exception as e:
+        return await _send_json(send, {'error': str(e)}, 500)
+    
+    if not account:
+        return await _send_json(send, {'error': 'Account tidak boleh kosong'}, 400)
+    try:
+        fields = _fields(scope, ACCOUNT_FIELDS)
+    except InvalidFields as e:
+        return await _send_json(send, {'error': str(e)}, 400)
+    
+    headers = [(b'content-type', b'text/event-stream; charset=utf-8')] + _encode_headers(SSE_HEADERS)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    
+    try:
+        with deadline_scope(_deadline(scope, 'check_account')):
+            async for event, payload in checker.check_email_stream(account):
+                if event == 'summary':
+                    payload = format_account_response(payload, _expand_breaches(scope), fields)
+                await send({'type': 'http.response.body', 'body': sse_event(event, payload), 'more_body': True})
+    except Exception as e:
+        await send({'type': 'http.response.body', 'body': sse_event('error', {'error': str(e)}), 'more_body': True})
+    
+    await send({'type': 'http.response.body', 'body': b''})
+
+async def check_password(scope, receive, send):
+    """Async versi POST /api/check-password"""
+    try:
+        data = await _read_json(receive)
+        password = data.get('password', '').strip()
+        
+        if not password:
+            return await _send_json(send, {'error': 'Password tidak boleh kosong'}, 400)
+        
+        fields = _fields(scope, PASSWORD_FIELDS)
+        with deadline_scope(_deadline(scope, 'check_password')):
+            results = await checker.check_password(password)
+        await _send_json(send, format_password_response(results, fields))
+    
+    except InvalidFields as e:
+        await _send_json(send, {'error': str(e)}, 400)
+    except Exception as e:
+        await _send_json(send, {'error': str(e)}, 500)
+
+async def comprehensive_check(scope, receive, send):
+    """Async versi POST /api/comprehensive-check"""
+    try:
+        data = await _read_json(receive)
+        email = data.get('email', '').strip()
+        password = data.get('password', '').strip()
+        
+        if not email:
+            return await _send_json(send, {'error': 'Email tidak boleh kosong'}, 400)
+        
+        fields = _fields(scope, COMPREHENSIVE_FIELDS)
+        with deadline_scope(_deadline(scope, 'comprehensive_check')):
+            results = await checker.comprehensive_check(email, password if password else None)
+        await _send_json(send, select_fields(results, fields))
+    
+    except InvalidFields as e:
+        await _send_json(send, {'error': str(e)}, 400)
+    except Exception as e:
+        await _send_json(send, {'error': str(e)}, 500)
+
+async def _rate_limit(scope):
+    """client_limiter.hit untuk IP client (uvicorn --proxy-headers untuk X-Forwarded-For)"""
+    client = (scope.get('client') or ('unknown',))[0]
+    if client_limiter.store.shared:
+        # Backend Redis: jangan blok event loop dengan I/O jaringan
+        return await asyncio.to_thread(client_limiter.hit, client)
+    return client_limiter.hit(client)
+
+ASYNC_ROUTES = {
+    '/api/check-account': check_account,
+    '/api/check-account/stream': check_account_stream,
+    '/api/check-password': check_password,
+    '/api/comprehensive-check': comprehensive_check
+}
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await checker.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    """ASGI application"""
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    
+    handler = ASYNC_ROUTES.get(scope.get('path'))
+    if scope['type'] == 'http' and scope['method'] == 'POST' and handler:
+        with metrics.track_async_request(scope['path']) as response:
+            limit_headers = {}
+            if client_limiter is not None and client_limiter.applies(scope['path']):
+                result = await _rate_limit(scope)
+                if result is not None:
+                    limit_headers = client_limiter.headers(result)
+                    if not result.allowed:
+                        response['status'] = 429
+                        return await _send_json(send, {
+                            'error': 'Rate limit exceeded. Please try again later.',
+                            'retry_after': client_rate_limit.retry_after_seconds(result)
+                        }, 429, limit_headers)
+            
+            async def send_tracked(message):
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                    message = {**message, 'headers': list(message['headers']) + _encode_headers(limit_headers)}
+                await send(message)
+            
+            return await handler(scope, receive, send_tracked)
+    
+    await wsgi_application(scope, receive, send)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Asyncio API clients - mirror dari api_clients.py
+Interpretasi response dipakai ulang dari client sync, hanya transport yang
+diganti aiohttp sehingga banyak lookup bisa berjalan di satu event loop.
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from config import Config
+from deadline import cap_timeout, expired
+from api_clients import (
+    SourceUnavailable,
+    email_cache_key,
+    HIBPClient,
+    DeHashedClient,
+    IntelligenceXClient,
+    LocalDatabaseClient
+)
+from password_range import PasswordRange
+from singleflight import get_single_flight
+
+email_flight = get_single_flight('email_results', use_async=True)
+range_flight = get_single_flight('hibp_range', use_async=True)
+
+_sessions: Dict[int, aiohttp.ClientSession] = {}
+
+async def get_session() -> aiohttp.ClientSession:
+    """Satu aiohttp.ClientSession bersama per event loop"""
+    loop_id = id(asyncio.get_running_loop())
+    session = _sessions.get(loop_id)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=Config.ASYNC_CONNECTION_LIMIT,
+            limit_per_host=Config.ASYNC_CONNECTION_LIMIT_PER_HOST
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
+            headers={'User-Agent': 'BreachChecker/1.0'}
+        )
+        _sessions[loop_id] = session
+    return session
+
+async def close_sessions():
+    """Tutup session milik event loop yang sedang berjalan (dipanggil saat shutdown)"""
+    session = _sessions.pop(id(asyncio.get_running_loop()), None)
+    if session is not None:
+        await session.close()
+
+class AsyncResponse:
+    """Response aiohttp yang sudah dibaca, dengan interface minimal requests.Response"""
+    
+    def __init__(self, status_code: int, headers, content: bytes, encoding: Optional[str] = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+    
+    def json(self):
+        return json.loads(self.content)
+
+class AsyncAPIClientMixin:
+    """Transport aiohttp untuk client turunan BaseAPIClient"""
+    
+    async def _make_request(self, method: str, url: str, rate_limited: bool = True,
+                            circuit_breaker=None, **kwargs) -> AsyncResponse:
+        """Make async HTTP request with error handling (retry seperti BaseAPIClient)"""
+        attempt = 0
+        while True:
+            breaker = await self._acquire_async(rate_limited, circuit_breaker)
+            started = time.monotonic()
+            try:
+                session = await get_session()
+                timeout = aiohttp.ClientTimeout(total=cap_timeout(Config.REQUEST_TIMEOUT))
+                async with session.request(method, url, timeout=timeout, **kwargs) as response:
+                    content = await response.read()
+                    result = AsyncResponse(response.status, response.headers, content,
+                                           response.get_encoding() if content else None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._record_outcome(breaker, None, started)
+                delay = self._retry_delay(attempt, None) if isinstance(
+                    e, aiohttp.ClientConnectionError) else None
+                if delay is None:
+                    raise Exception(f"Request failed: {str(e) or type(e).__name__}")
+            except BaseException:
+                # Dibatalkan (mis. client disconnect) tanpa hasil upstream: lepas probe half-open
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            else:
+                self._record_outcome(breaker, result.status_code, started)
+                delay = self._retry_delay(attempt, result)
+                if delay is None:
+                    return result
+            
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _acquire_async(self, rate_limited: bool, circuit_breaker=None):
+        """Versi asyncio dari BaseAPIClient._acquire"""
+        if expired():
+            raise SourceUnavailable(f'{self.source_name} skipped: request deadline exceeded.', 'timed_out')
+        
+        breaker = circuit_breaker or self.circuit_breaker
+        if breaker is not None and not breaker.allow():
+            raise SourceUnavailable(
+                f'{self.source_name} is failing, skipped until the circuit breaker recovers.',
+                'circuit_open'
+            )
+        
+        if rate_limited and self.rate_limiter is not None:
+            try:
+                acquired = await self.rate_limiter.acquire_async(timeout=self._rate_limit_timeout())
+            except BaseException:
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            if not acquired:
+                if breaker is not None:
+                    breaker.cancel()
+                raise SourceUnavailable(
+                    f'{self.source_name} local rate limit exceeded. Try again later.',
+                    'rate_limited'
+                )
+        return breaker
+    
+    async def check_email(self, email: str) -> Dict:
+        """Check email breach (memakai email_result_cache yang sama dengan client sync)"""
+        cached = self._cached_email_result(email)
+        if cached is not None:
+            return cached
+        return dict(await email_flight.do(email_cache_key(self.source_name, email),
+                                          lambda: self._fetch_and_cache_email(email)))
+    
+    async def _fetch_and_cache_email(self, email: str) -> Dict:
+        return self._cache_email_result(email, await self._fetch_email(email))
+
+class AsyncHIBPClient(AsyncAPIClientMixin, HIBPClient):
+    """Async client untuk Have I Been Pwned API"""
+    
+    async def _get_range(self, prefix: str) -> Tuple[Optional[PasswordRange], int]:
+        """Ambil range untuk prefix (dari cache bila masih fresh)"""
+        password_range, headers = self._cached_range(prefix)
+        if password_range is not None:
+            return password_range, 200
+        return await range_flight.do(prefix, lambda: self._fetch_range(prefix, headers))
+    
+    async def _fetch_range(self, prefix: str, headers: Dict) -> Tuple[Optional[PasswordRange], int]:
+        """Query API dengan prefix saja (k-anonymity)"""
+        response = await self._make_request('GET', self._range_url(prefix), rate_limited=False,
+                                            circuit_breaker=self.range_breaker, headers=headers)
+        password_range = self._store_range(prefix, response)
+        if password_range is None and response.status_code == 304:
+            # Entry ter-evict selama request berjalan, ambil ulang tanpa ETag
+            response = await self._make_request('GET', self._range_url(prefix), rate_limited=False,
+                                                circuit_breaker=self.range_breaker)
+            password_range = self._store_range(prefix, response)
+        return password_range, response.status_code
+    
+    async def check_password(self, password: str) -> Dict:
+        """Check password menggunakan k-anonymity (atau index offline bila ada)"""
+        try:
+            prefix, suffix = self._hash_password(password)
+            offline_db = self.offline_db
+            if offline_db is not None:
+                return self._offline_result(offline_db, prefix + suffix)
+            
+            password_range, status_code = await self._get_range(prefix)
+            return self._password_result(password_range, status_code, suffix)
+        
+        except Exception as e:
+            return {
+                'error': f'Error checking password: {str(e)}',
+                'status': 'exception',
+                'source': 'HIBP'
+            }
+    
+    async def _fetch_email(self, email: str) -> Dict:
+        """Check email breaches (rate limited)"""
+        try:
+            url, headers = self._email_request(email)
+            response = await self._make_request('GET', url, headers=headers)
+            return self._email_result(response)
+        
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
+        except Exception as e:
+            return {
+                'error': f'Error with HIBP API: {str(e)}',
+                'status': 'exception',
+                'source': 'HIBP'
+            }
+
+class AsyncDeHashedClient(AsyncAPIClientMixin, DeHashedClient):
+    """Async client untuk DeHashed API v2"""
+    
+    async def _fetch_email(self, email: str) -> Dict:
+        """Check email menggunakan DeHashed v2 API"""
+        try:
+            not_configured = self._not_configured()
+            if not_configured:
+                return not_configured
+            
+            url, payload = self._email_request(email)
+            response = await self._make_request('POST', url, json=payload, headers=self._get_headers())
+            return self._email_result(response)
+        
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
+        except Exception as e:
+            return {
+                'error': f'Error with DeHashed: {str(e)}',
+                'status': 'exception',
+                'source': 'DeHashed'
+            }
+    
+    async def check_password(self, password: str) -> Dict:
+        """Check password menggunakan DeHashed v2 API"""
+        try:
+            not_configured = self._not_configured()
+            if not_configured:
+                return not_configured
+            
+            url, payload = self._password_request(password)
+            response = await self._make_request('POST', url, json=payload, headers=self._get_headers())
+            return self._password_result(response)
+        
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
+        except Exception as e:
+            return {
+                'error': f'Error with DeHashed password check: {str(e)}',
+                'status': 'exception',
+                'source': 'DeHashed'
+            }
+
+class AsyncIntelligenceXClient(AsyncAPIClientMixin, IntelligenceXClient):
+    """Async client untuk Intelligence X API"""
+    
+    async def _fetch_email(self, email: str) -> Dict:
+        """Check email menggunakan Intelligence X API"""
+        try:
+            not_configured = self._not_configured()
+            if not_configured:
+                return not_configured
+            
+            url, data, headers = self._email_request(email)
+            response = await self._make_request('POST', url, json=data, headers=headers)
+            return self._email_result(response)
+        
+        except SourceUnavailable as e:
+            return self._unavailable_result(e)
+        except Exception as e:
+            return {
+                'error': f'Error with Intelligence X: {str(e)}',
+                'status': 'exception',
+                'source': 'IntelligenceX'
+            }
+
+class AsyncLocalDatabaseClient:
+    """Async wrapper untuk LocalDatabaseClient (file I/O dijalankan di thread)"""
+    
+    def __init__(self, client: Optional[LocalDatabaseClient] = None):
+        self.client = client or LocalDatabaseClient()
+    
+    async def check_email(self, email: str) -> Dict:
+        """Check email terhadap database lokal"""
+        return await asyncio.to_thread(self.client.check_email, email)
+    
+    async def add_email(self, email: str) -> bool:
+        """Add email to local database"""
+        return await asyncio.to_thread(self.client.add_email, email)
+    
+    async def get_stats(self) -> Dict:
+        """Get statistics about local database"""
+        return await asyncio.to_thread(self.client.get_stats)
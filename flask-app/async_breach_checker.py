@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Async Breach Checker - versi asyncio dari BreachChecker
+Semua sumber dicek bersamaan di satu event loop tanpa thread per request.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from breach_checker import BreachChecker
+from deadline import DeadlineExceeded, remaining
+import metrics
+from singleflight import get_single_flight
+from async_api_clients import (
+    AsyncHIBPClient,
+    AsyncDeHashedClient,
+    AsyncIntelligenceXClient,
+    AsyncLocalDatabaseClient,
+    close_sessions
+)
+
+# Referensi kuat ke task sumber yang masih jalan setelah deadline habis
+_background_tasks = set()
+
+class AsyncBreachChecker(BreachChecker):
+    """BreachChecker dengan client aiohttp; agregasi hasil sama persis"""
+    
+    def __init__(self, sync_checker: Optional[BreachChecker] = None):
+        # BreachChecker sync di proses yang sama (asgi.py): database lokal dan
+        # cache range HIBP miliknya dipakai bersama, bukan dibuat ulang
+        self.sync_checker = sync_checker
+        super().__init__()
+    
+    def _init_clients(self):
+        """Initialize async API clients"""
+        shared = self.sync_checker
+        self.hibp_client = AsyncHIBPClient(shared.hibp_client.range_cache if shared else None)
+        self.dehashed_client = AsyncDeHashedClient()
+        self.intelx_client = AsyncIntelligenceXClient()
+        self.local_client = AsyncLocalDatabaseClient(shared.local_client if shared else None)
+        self.email_flight = get_single_flight('check_email', use_async=True)
+    
+    async def check_password(self, password: str) -> Dict:
+        """
+        Comprehensive password checking menggunakan multiple sources
+        """
+        results = {
+            'password_hash': '***hidden***',  # Don't log actual password
+            'timestamp': time.time(),
+            'sources': {}
+        }
+        
+        sources = self._password_sources(password)
+        results['sources'], results['timings_ms'] = await self._run_sources(sources)
+        
+        # Aggregate results
+        results['summary'] = self._aggregate_password_results(results['sources'])
+        
+        return results
+    
+    async def check_email(self, email: str) -> Dict:
+        """
+        Comprehensive email checking menggunakan multiple sources.
+        Check identik yang sedang berjalan berbagi satu fan-out (single-flight).
+        """
+        try:
+            shared = await self.email_flight.do(email.strip().lower(), lambda: self._check_email(email))
+        except DeadlineExceeded:
+            # Fan-out milik request lain belum selesai dalam deadline request ini
+            shared = self._timed_out_email_results(email)
+        results = self._caller_results(shared, email)
+        
+        # Update statistics
+        self._update_stats(results['summary']['found'])
+        
+        return results
+    
+    async def _check_email(self, email: str) -> Dict:
+        """Fan-out ke semua sumber untuk satu email"""
+        results = {
+            'email': email,
+            'timestamp': time.time(),
+            'sources': {}
+        }
+        
+        sources = self._email_sources(email)
+        results['sources'], results['timings_ms'] = await self._run_sources(sources)
+        
+        # Aggregate results
+        results['summary'] = self._aggregate_email_results(results['sources'])
+        
+        return results
+    
+    async def check_email_stream(self, email: str) -> AsyncIterator[Tuple[str, Dict]]:
+        """Versi async BreachChecker.check_email_stream"""
+        results = {
+            'email': email,
+            'timestamp': time.time(),
+            'sources': {},
+            'timings_ms': {}
+        }
+        
+        sources = self._email_sources(email)
+        yield 'start', {'email': email, 'sources': list(sources)}
+        
+        async for name, result, elapsed_ms in self._iter_sources(sources):
+            results['sources'][name], results['timings_ms'][name] = result, elapsed_ms
+            yield 'source', {'source': name, 'result': result, 'elapsed_ms': elapsed_ms}
+        
+        results['sources'] = {name: results['sources'][name] for name in sources}
+        results['timings_ms'] = {name: results['timings_ms'][name] for name in sources}
+        results['summary'] = self._aggregate_email_results(results['sources'])
+        self._update_stats(results['summary']['found'])
+        
+        yield 'summary', results
+    
+    async def comprehensive_check(self, email: str, password: str = None) -> Dict:
+        """
+        Complete breach check untuk email dan password (email & password paralel)
+        """
+        results = {
+            'email': email,
+            'timestamp': time.time(),
+            'config_status': self.config_status
+        }
+        
+        if password:
+            results['email_check'], results['password_check'] = await asyncio.gather(
+                self.check_email(email),
+                self.check_password(password)
+            )
+        else:
+            results['email_check'] = await self.check_email(email)
+        
+        # Overall summary
+        results['overall_summary'] = self._create_overall_summary(results)
+        
+        return results
+    
+    async def _run_sources(self, sources: Dict[str, Callable]) -> Tuple[Dict, Dict]:
+        """Jalankan semua sumber bersamaan, urutan key mengikuti `sources`"""
+        results, timings = {}, {}
+        async for name, result, elapsed_ms in self._iter_sources(sources):
+            results[name], timings[name] = result, elapsed_ms
+        return {name: results[name] for name in sources}, {name: timings[name] for name in sources}
+    
+    async def _iter_sources(self, sources: Dict[str, Callable]) -> AsyncIterator[Tuple[str, Dict, float]]:
+        """
+        Yield (name, result, elapsed_ms) per sumber begitu selesai. Sumber yang
+        belum selesai saat deadline habis di-yield sebagai `timed_out`.
+        """
+        started = time.perf_counter()
+        tasks = {}
+        for name, check in sources.items():
+            task = asyncio.ensure_future(self._timed_check(name, check))
+            # Task yang tertinggal tidak dibatalkan (bisa jadi leader single-flight
+            # request lain); timeout aiohttp-nya sudah dibatasi deadline
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            tasks[task] = name
+        
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=remaining(), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                yield (tasks[task], *task.result())
+        
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        for task in pending:
+            yield tasks[task], self._timed_out_result(tasks[task]), elapsed_ms
+    
+    async def _timed_check(self, name: str, check: Callable) -> Tuple[Dict, float]:
+        """Await satu sumber, ukur durasi dan tangkap exception tak terduga"""
+        started = time.perf_counter()
+        try:
+            result = await check()
+        except DeadlineExceeded:
+            result = self._timed_out_result(name)
+        except Exception as e:
+            result = self._exception_result(name, e)
+        elapsed = time.perf_counter() - started
+        metrics.observe_source_check(name, result.get('status'), elapsed)
+        return result, round(elapsed * 1000, 2)
+    
+    async def get_local_db_stats(self) -> Dict:
+        """Get local database statistics"""
+        return await self.local_client.get_stats()
+    
+    async def close(self):
+        """Tutup HTTP session milik event loop ini"""
+        await close_sessions()
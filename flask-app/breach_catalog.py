@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Katalog breach HIBP untuk /api/breaches dan /api/breach/<name>
+
+Sumber data adalah snapshot lokal respons HIBP GET /api/v3/breaches
+(python breach_catalog.py download). Katalog baru dimuat saat pertama
+dipakai, bukan saat worker start, dan diganti utuh bila file berubah
+(di-stat paling sering sekali per `reload_check_interval`).
+
+Penyimpanan ringkas: satu objek __slots__ per breach, flag Is* dipadatkan
+jadi satu bitmask, dan daftar DataClasses yang sama (string maupun tuple)
+dipakai bersama semua breach. Index dibangun sekali per snapshot: nama,
+domain, data class, urutan per kolom sort dan BreachDate untuk filter
+rentang tanggal.
+
+CLI:
+    python breach_catalog.py download breaches.json
+    python breach_catalog.py info breaches.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import APICredentials, DatabaseConfig
+
+# Urutan field mengikuti respons HIBP
+FLAGS = (
+    'IsVerified', 'IsFabricated', 'IsSensitive', 'IsRetired',
+    'IsSpamList', 'IsMalware', 'IsSubscriptionFree', 'IsStealerLog'
+)
+FLAG_BITS = {name: 1 << i for i, name in enumerate(FLAGS)}
+KNOWN_FIELDS = {
+    'Name', 'Title', 'Domain', 'BreachDate', 'AddedDate', 'ModifiedDate',
+    'PwnCount', 'Description', 'LogoPath', 'DataClasses', *FLAGS
+}
+
+# Parameter query -> flag (?verified=true, ?spam_list=false, ...)
+FLAG_FILTERS = {
+    'verified': 'IsVerified',
+    'fabricated': 'IsFabricated',
+    'sensitive': 'IsSensitive',
+    'retired': 'IsRetired',
+    'spam_list': 'IsSpamList',
+    'malware': 'IsMalware'
+}
+
+# Kolom sort -> (atribut, arah default)
+SORTS = {
+    'date': ('breach_date', 'desc'),
+    'added': ('added_date', 'desc'),
+    'modified': ('modified_date', 'desc'),
+    'pwn_count': ('pwn_count', 'desc'),
+    'name': ('name_key', 'asc')
+}
+
+class Breach:
+    """Satu entry katalog; to_dict() mengembalikan format HIBP"""
+    
+    __slots__ = ('name', 'name_key', 'title', 'domain', 'breach_date', 'added_date',
+                 'modified_date', 'pwn_count', 'description', 'logo_path',
+                 'data_classes', 'flags', 'extra')
+    
+    def __init__(self, entry: Dict, data_classes: Tuple[str, ...]):
+        self.name = str(entry['Name'])
+        self.name_key = self.name.lower()
+        self.title = entry.get('Title') or self.name
+        self.domain = entry.get('Domain') or ''
+        self.breach_date = entry.get('BreachDate') or ''
+        self.added_date = entry.get('AddedDate') or ''
+        self.modified_date = entry.get('ModifiedDate') or ''
+        self.pwn_count = int(entry.get('PwnCount') or 0)
+        self.description = entry.get('Description') or ''
+        self.logo_path = entry.get('LogoPath') or ''
+        self.data_classes = data_classes
+        self.flags = sum(bit for name, bit in FLAG_BITS.items() if entry.get(name))
+        # Field HIBP yang belum dikenal tetap dikembalikan apa adanya
+        extra = {key: value for key, value in entry.items() if key not in KNOWN_FIELDS}
+        self.extra = extra or None
+    
+    def has_flag(self, name: str) -> bool:
+        return bool(self.flags & FLAG_BITS[name])
+    
+    def to_dict(self) -> Dict:
+        result = {
+            'Name': self.name,
+            'Title': self.title,
+            'Domain': self.domain,
+            'BreachDate': self.breach_date,
+            'AddedDate': self.added_date,
+            'ModifiedDate': self.modified_date,
+            'PwnCount': self.pwn_count,
+            'Description': self.description,
+            'LogoPath': self.logo_path,
+            'DataClasses': list(self.data_classes)
+        }
+        for name, bit in FLAG_BITS.items():
+            result[name] = bool(self.flags & bit)
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+class BreachCatalog:
+    """Snapshot immutable katalog beserta index-nya; aman dipakai banyak thread"""
+    
+    def __init__(self, entries: Iterable[Dict], key: Optional[Tuple[int, int]] = None,
+                 etag: str = 'empty', mtime: Optional[float] = None, path: Optional[str] = None):
+        self.key = key
+        self.etag = etag
+        self.mtime = mtime
+        self.path = path
+        
+        interned: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        breaches: List[Breach] = []
+        by_name: Dict[str, int] = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get('Name'):
+                continue
+            classes = tuple(sys.intern(str(name)) for name in entry.get('DataClasses') or ())
+            breach = Breach(entry, interned.setdefault(classes, classes))
+            if breach.name_key in by_name:
+                continue
+            by_name[breach.name_key] = len(breaches)
+            breaches.append(breach)
+        
+        self.breaches: Tuple[Breach, ...] = tuple(breaches)
+        self.by_name = by_name
+        
+        by_domain: Dict[str, List[int]] = {}
+        by_data_class: Dict[str, List[int]] = {}
+        data_class_names: Dict[str, str] = {}
+        for i, breach in enumerate(self.breaches):
+            if breach.domain:
+                by_domain.setdefault(breach.domain.lower(), []).append(i)
+            for name in breach.data_classes:
+                by_data_class.setdefault(name.lower(), []).append(i)
+                data_class_names.setdefault(name.lower(), name)
+        self.by_domain = {domain: frozenset(ids) for domain, ids in by_domain.items()}
+        self.by_data_class = {name: frozenset(ids) for name, ids in by_data_class.items()}
+        self.data_class_names = data_class_names
+        
+        # Urutan naik per kolom sort (nama sebagai tie-breaker) dan rank untuk subset
+        self.orders: Dict[str, Tuple[int, ...]] = {}
+        self.ranks: Dict[str, List[int]] = {}
+        for sort, (attr, _) in SORTS.items():
+            order = sorted(range(len(self.breaches)),
+                           key=lambda i: (getattr(self.breaches[i], attr), self.breaches[i].name_key))
+            rank = [0] * len(order)
+            for position, i in enumerate(order):
+                rank[i] = position
+            self.orders[sort] = tuple(order)
+            self.ranks[sort] = rank
+        
+        # Filter since/until: bisect di atas BreachDate terurut
+        self.date_order = self.orders['date']
+        self.dates = [self.breaches[i].breach_date for i in self.date_order]
+        
+        self._search = [
+            f'{breach.name_key} {breach.title.lower()} {breach.domain.lower()}'
+            for breach in self.breaches
+        ]
+        self.total_accounts = sum(breach.pwn_count for breach in self.breaches)
+    
+    def __len__(self) -> int:
+        return len(self.breaches)
+    
+    def get(self, name: str) -> Optional[Breach]:
+        i = self.by_name.get(name.strip().lower())
+        return self.breaches[i] if i is not None else None
+    
+    def query(self, q: str = '', domain: str = '', data_classes: Iterable[str] = (),
+              since: str = '', until: str = '', flags: Optional[Dict[str, bool]] = None,
+              sort: str = 'date', order: str = '') -> List[Breach]:
+        """
+        Breach yang cocok dengan semua filter, sudah terurut. Filter ber-index
+        (domain, data class, tanggal) dipotong dulu sebagai himpunan kandidat;
+        pencarian teks dan flag hanya memeriksa kandidat yang tersisa.
+        """
+        if sort not in SORTS:
+            raise ValueError(f"sort harus salah satu dari: {', '.join(SORTS)}")
+        order = order or SORTS[sort][1]
+        if order not in ('asc', 'desc'):
+            raise ValueError("order harus 'asc' atau 'desc'")
+        
+        candidates: Optional[frozenset] = None
+        
+        def narrow(ids: Optional[frozenset]):
+            nonlocal candidates
+            ids = ids or frozenset()
+            candidates = ids if candidates is None else candidates & ids
+        
+        if domain:
+            narrow(self.by_domain.get(domain.strip().lower()))
+        for name in data_classes:
+            narrow(self.by_data_class.get(name.strip().lower()))
+        if since or until:
+            start = bisect_left(self.dates, _parse_date(since, 'since')) if since else 0
+            end = bisect_right(self.dates, _parse_date(until, 'until')) if until else len(self.dates)
+            narrow(frozenset(self.date_order[start:end]))
+        
+        if candidates is None:
+            ids: Iterable[int] = self.orders[sort]
+        else:
+            ids = sorted(candidates, key=self.ranks[sort].__getitem__)
+        if order == 'desc':
+            ids = reversed(ids)
+        
+        q = q.strip().lower()
+        flags = flags or {}
+        results = []
+        for i in ids:
+            if q and q not in self._search[i]:
+                continue
+            breach = self.breaches[i]
+            if any(breach.has_flag(name) != wanted for name, wanted in flags.items()):
+                continue
+            results.append(breach)
+        return results
+    
+    def expand(self, names: Iterable[str]) -> Dict[str, Dict]:
+        """Metadata lengkap per nama breach, sekali per nama; nama di luar katalog dilewati"""
+        details = {}
+        for name in names:
+            if name not in details:
+                breach = self.get(name)
+                if breach is not None:
+                    details[name] = breach.to_dict()
+        return details
+    
+    def top_data_classes(self, limit: int = 20) -> List[Dict]:
+        """Data class terbanyak berdasarkan jumlah breach (dan total akun terdampak)"""
+        ranked = sorted(self.by_data_class.items(), key=lambda item: (-len(item[1]), item[0]))
+        return [
+            {
+                'name': self.data_class_names[name],
+                'count': len(ids),
+                'accounts': sum(self.breaches[i].pwn_count for i in ids)
+            }
+            for name, ids in ranked[:limit]
+        ]
+    
+    def get_stats(self) -> Dict:
+        return {
+            'file': self.path,
+            'breaches': len(self.breaches),
+            'accounts': self.total_accounts,
+            'data_classes': len(self.by_data_class),
+            'etag': self.etag,
+            'last_modified': self.mtime
+        }
+
+def breach_refs(entries: Iterable) -> List[str]:
+    """
+    Nama breach saja dari respons breachedaccount, baik truncated
+    ([{"Name": ...}]) maupun lengkap; metadata diambil dari katalog bila perlu
+    """
+    refs = []
+    for entry in entries or ():
+        name = entry.get('Name') if isinstance(entry, dict) else entry
+        if name:
+            refs.append(str(name))
+    return refs
+
+def _parse_date(value: str, field: str) -> str:
+    """Validasi YYYY-MM-DD (BreachDate dibandingkan sebagai string)"""
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f'{field} harus berformat YYYY-MM-DD')
+
+def load_catalog(path: str) -> BreachCatalog:
+    """Baca snapshot JSON (array breach format HIBP) dan bangun index-nya"""
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        raw = f.read()
+    
+    entries = json.loads(raw)
+    if not isinstance(entries, list):
+        raise ValueError(f'{path}: expected a JSON array of breaches')
+    
+    return BreachCatalog(
+        entries,
+        key=(stat.st_mtime_ns, stat.st_size),
+        etag=hashlib.blake2b(raw, digest_size=12).hexdigest(),
+        mtime=stat.st_mtime,
+        path=path
+    )
+
+class BreachCatalogStore:
+    """Memegang snapshot katalog terbaru; reload bila file berubah"""
+    
+    def __init__(self, path: str, reload_check_interval: float = 5.0):
+        self.path = path
+        self.reload_check_interval = reload_check_interval
+        self._catalog: Optional[BreachCatalog] = None
+        self._key: Optional[Tuple[int, int]] = None  # stat file saat load terakhir
+        self._reload_lock = threading.Lock()
+        self._last_stat_check = 0.0
+    
+    def get(self) -> BreachCatalog:
+        """
+        Snapshot katalog. Pemanggilan pertama memuat file; setelahnya file
+        hanya di-stat sekali per interval. Selama reload berjalan thread lain
+        tetap memakai snapshot lama. File yang hilang = katalog kosong, file
+        rusak = snapshot terakhir yang valid tetap dipakai.
+        """
+        catalog = self._catalog
+        now = time.monotonic()
+        if catalog is not None and now - self._last_stat_check < self.reload_check_interval:
+            return catalog
+        self._last_stat_check = now
+        
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        if catalog is not None and self._key == key:
+            return catalog
+        
+        if not self._reload_lock.acquire(blocking=catalog is None):
+            return catalog
+        try:
+            if self._catalog is None or self._key != key:
+                catalog = self._load(key)
+                if catalog is not None or self._catalog is None:
+                    self._catalog = catalog or BreachCatalog([])
+                self._key = key
+            return self._catalog
+        finally:
+            self._reload_lock.release()
+    
+    def _load(self, key: Optional[Tuple[int, int]]) -> Optional[BreachCatalog]:
+        if key is None:
+            print(f"⚠️ Breach catalog not found: {self.path} (python breach_catalog.py download {self.path})")
+            return BreachCatalog([])
+        try:
+            return load_catalog(self.path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Breach catalog {self.path} could not be loaded: {e}")
+            return None
+
+_store: Optional[BreachCatalogStore] = None
+_store_lock = threading.Lock()
+
+def get_breach_catalog() -> BreachCatalog:
+    """Snapshot katalog dari DatabaseConfig.BREACH_CATALOG (store satu per proses)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            settings = DatabaseConfig.BREACH_CATALOG
+            _store = BreachCatalogStore(settings['file'], settings['reload_check_interval'])
+    return _store.get()
+
+def download(output: str) -> int:
+    """Ambil katalog lengkap dari HIBP (tanpa API key) dan tulis atomik ke `output`"""
+    from http_transport import get_session
+    
+    response = get_session().get(f"{APICredentials.HIBP['breaches_url']}/breaches", timeout=60)
+    response.raise_for_status()
+    entries = response.json()
+    if not isinstance(entries, list):
+        raise ValueError('Unexpected response from HIBP /breaches')
+    
+    tmp_path = f'{output}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output)
+    return len(entries)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='HIBP breach catalog snapshot')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    download_cmd = commands.add_parser('download', help='Fetch the full catalog from HIBP')
+    download_cmd.add_argument('output', nargs='?', default=DatabaseConfig.BREACH_CATALOG['file'])
+    
+    info_cmd = commands.add_parser('info', help='Show catalog statistics')
+    info_cmd.add_argument('path', nargs='?', default=DatabaseConfig.BREACH_CATALOG['file'])
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'download':
+        print(f"⬇️  Downloading breach catalog to {args.output}...")
+        count = download(args.output)
+        print(f"✅ {count:,} breaches written ({os.path.getsize(args.output):,} bytes)")
+    elif args.command == 'info':
+        started = time.perf_counter()
+        catalog = load_catalog(args.path)
+        print(f"load_seconds: {time.perf_counter() - started:.3f}")
+        for key, value in catalog.get_stats().items():
+            print(f"{key}: {value}")
+
+if __name__ == '__main__':
+    sys.exit(main())
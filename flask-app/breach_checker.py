@@ -5,17 +5,32 @@ Refactored Breach Checker - Clean architecture dengan API clients terpisah
 
 import time
 import json
-from typing import Dict, List, Optional
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from config import Config, validate_config
+from circuit_breaker import get_all_stats as get_circuit_breaker_stats
+from deadline import DeadlineExceeded, deadline_scope, remaining
+from http_transport import get_stats as get_http_pool_stats
+import metrics
+from rate_limiter import get_all_stats as get_rate_limiter_stats
+from singleflight import get_single_flight, get_all_stats as get_single_flight_stats
+from stats_store import get_stats_store
 from api_clients import (
     HIBPClient, 
     DeHashedClient, 
     IntelligenceXClient, 
-    LocalDatabaseClient
+    LocalDatabaseClient,
+    email_result_cache
 )
 
+PARTIAL_RESULT_RECOMMENDATION = 'Some sources did not respond in time; run the check again for complete results'
+
 class BreachChecker:
     """Main breach checker class dengan clean architecture"""
     
@@ -23,19 +38,29 @@ class BreachChecker:
         self.config = Config()
         self.config_status = validate_config()
         
-        # Initialize API clients
+        self._init_clients()
+        
+        # Statistics, persisten dan digabung antar worker (lihat stats_store.py)
+        self.stats_store = get_stats_store()
+    
+    def _init_clients(self):
+        """Initialize API clients dan executor untuk fan-out"""
         self.hibp_client = HIBPClient()
         self.dehashed_client = DeHashedClient()
         self.intelx_client = IntelligenceXClient()
         self.local_client = LocalDatabaseClient()
         
-        # Statistics
-        self.stats = {
-            'total_checks': 0,
-            'successful_checks': 0,
-            'failed_checks': 0,
-            'last_check': None
-        }
+        # Bounded executor untuk fan-out ke semua sumber sekaligus
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.MAX_SOURCE_WORKERS,
+            thread_name_prefix='breach-source'
+        )
+        
+        # Check email identik yang bersamaan berbagi satu fan-out
+        self.email_flight = get_single_flight('check_email')
+        
+        # Lane per sumber untuk bulk check (lihat _bulk_lanes)
+        self._lanes: Optional[Dict[str, threading.BoundedSemaphore]] = None
     
     def check_password(self, password: str) -> Dict:
         """
@@ -49,26 +74,87 @@ class BreachChecker:
         
         print("Checking password with multiple sources...")
         
-        # Check with HIBP (always available)
-        print("- Checking HIBP...")
-        results['sources']['hibp'] = self.hibp_client.check_password(password)
-        time.sleep(self.config.RATE_LIMIT_DELAY)
-        
-        # Check with DeHashed if available
-        if self.config_status['api_status'].get('dehashed') == 'configured':
-            print("- Checking DeHashed...")
-            results['sources']['dehashed'] = self.dehashed_client.check_password(password)
-            time.sleep(self.config.RATE_LIMIT_DELAY)
+        sources = self._password_sources(password)
+        results['sources'], results['timings_ms'] = self._run_sources(sources)
         
         # Aggregate results
         results['summary'] = self._aggregate_password_results(results['sources'])
         
         return results
     
+    def check_password_batch(self, passwords: Optional[List[str]] = None,
+                             sha1_hashes: Optional[List[str]] = None) -> Dict:
+        """
+        Audit banyak password (atau SHA-1 hex) sekaligus lewat HIBP range API,
+        satu request per prefix unik. Hasil per item mengikuti urutan input.
+        """
+        results = {
+            'timestamp': time.time(),
+            'results': []
+        }
+        
+        started = time.perf_counter()
+        if sha1_hashes is not None:
+            items = self.hibp_client.check_password_hashes(sha1_hashes)
+        else:
+            items = self.hibp_client.check_passwords(passwords or [])
+        results['timings_ms'] = {'hibp': round((time.perf_counter() - started) * 1000, 2)}
+        
+        summary = {
+            'checked': len(items),
+            'pwned': 0,
+            'clean': 0,
+            'failed': 0
+        }
+        for index, item in enumerate(items):
+            item['index'] = index
+            if sha1_hashes is not None:
+                item['hash'] = sha1_hashes[index].strip().upper()
+            if item.get('pwned'):
+                summary['pwned'] += 1
+            elif item.get('status') == 'clean':
+                summary['clean'] += 1
+            else:
+                summary['failed'] += 1
+        
+        results['results'] = items
+        results['summary'] = summary
+        return results
+    
     def check_email(self, email: str) -> Dict:
         """
-        Comprehensive email checking menggunakan multiple sources
+        Comprehensive email checking menggunakan multiple sources.
+        Check identik yang sedang berjalan berbagi satu fan-out (single-flight).
+        """
+        try:
+            shared = self.email_flight.do(email.strip().lower(), partial(self._check_email, email))
+        except DeadlineExceeded:
+            # Fan-out milik request lain belum selesai dalam deadline request ini
+            shared = self._timed_out_email_results(email)
+        results = self._caller_results(shared, email)
+        
+        # Update statistics
+        self._update_stats(results['summary']['found'])
+        
+        return results
+    
+    def _caller_results(self, shared: Dict, email: str) -> Dict:
+        """
+        Salinan hasil single-flight untuk satu caller. Hasil itu dibagi semua
+        caller yang digabung, jadi dict per sumber, timings dan summary
+        disalin; isi di dalamnya (list breaches/entries) tetap dibagi dan
+        tidak boleh diubah.
         """
+        return {
+            **shared,
+            'email': email,
+            'sources': {name: dict(result) for name, result in shared['sources'].items()},
+            'timings_ms': dict(shared['timings_ms']),
+            'summary': dict(shared['summary'])
+        }
+    
+    def _check_email(self, email: str) -> Dict:
+        """Fan-out ke semua sumber untuk satu email"""
         results = {
             'email': email,
             'timestamp': time.time(),
@@ -77,35 +163,141 @@ class BreachChecker:
         
         print(f"Checking {email} with multiple sources...")
         
-        # Check local database first (fastest)
-        print("- Checking local database...")
-        results['sources']['local'] = self.local_client.check_email(email)
+        sources = self._email_sources(email)
+        results['sources'], results['timings_ms'] = self._run_sources(sources)
         
-        # Check DeHashed if configured
-        if self.config_status['api_status'].get('dehashed') == 'configured':
-            print("- Checking DeHashed...")
-            results['sources']['dehashed'] = self.dehashed_client.check_email(email)
-            time.sleep(self.config.RATE_LIMIT_DELAY)
+        # Aggregate results
+        results['summary'] = self._aggregate_email_results(results['sources'])
         
-        # Check HIBP (rate limited)
-        print("- Checking HIBP...")
-        results['sources']['hibp'] = self.hibp_client.check_email(email)
-        time.sleep(self.config.RATE_LIMIT_DELAY)
+        return results
+    
+    def check_email_stream(self, email: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Versi progresif check_email: yield ('start', {...}), lalu ('source', {...})
+        per sumber begitu selesai, terakhir ('summary', results) dengan bentuk
+        sama seperti check_email. Tanpa single-flight level email (setiap stream
+        butuh event per sumber); cache dan single-flight per sumber tetap berlaku.
+        """
+        results = {
+            'email': email,
+            'timestamp': time.time(),
+            'sources': {},
+            'timings_ms': {}
+        }
         
-        # Check Intelligence X if configured
-        if self.config_status['api_status'].get('intelx') == 'configured':
-            print("- Checking Intelligence X...")
-            results['sources']['intelx'] = self.intelx_client.check_email(email)
-            time.sleep(self.config.RATE_LIMIT_DELAY)
+        sources = self._email_sources(email)
+        yield 'start', {'email': email, 'sources': list(sources)}
         
-        # Aggregate results
+        for name, result, elapsed_ms in self._iter_sources(sources):
+            results['sources'][name], results['timings_ms'][name] = result, elapsed_ms
+            yield 'source', {'source': name, 'result': result, 'elapsed_ms': elapsed_ms}
+        
+        results['sources'] = {name: results['sources'][name] for name in sources}
+        results['timings_ms'] = {name: results['timings_ms'][name] for name in sources}
         results['summary'] = self._aggregate_email_results(results['sources'])
+        self._update_stats(results['summary']['found'])
         
-        # Update statistics
+        yield 'summary', results
+    
+    def _timed_out_email_results(self, email: str) -> Dict:
+        """Hasil check_email dengan semua sumber timed_out"""
+        sources = {name: self._timed_out_result(name) for name in self._email_sources(email)}
+        return {
+            'email': email,
+            'timestamp': time.time(),
+            'sources': sources,
+            'timings_ms': {name: 0.0 for name in sources},
+            'summary': self._aggregate_email_results(sources)
+        }
+    
+    def check_emails_iter(self, emails: Iterable[str],
+                          max_in_flight: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Bulk email checking: yield hasil (bentuk sama dengan check_email) per
+        email begitu selesai, bukan dalam urutan input. Paling banyak
+        `max_in_flight` email diproses bersamaan dan input dibaca secara lazy,
+        sehingga memori tetap terbatas berapa pun jumlah email.
+        
+        Exception dari iterator input (mis. melebihi limit bulk) menghentikan
+        pembacaan input; email yang sudah diterima tetap diselesaikan dan
+        di-yield, baru setelah itu exception diteruskan.
+        """
+        window = max_in_flight or self.config.BULK_MAX_IN_FLIGHT
+        executor = ThreadPoolExecutor(max_workers=window, thread_name_prefix='breach-bulk')
+        pending = set()
+        emails = iter(emails)
+        try:
+            while True:
+                try:
+                    email = next(emails)
+                except StopIteration:
+                    break
+                except Exception:
+                    for future in as_completed(pending):
+                        yield future.result()
+                    pending = set()
+                    raise
+                
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(self._bulk_check_email, email))
+            
+            for future in as_completed(pending):
+                yield future.result()
+        finally:
+            # Client disconnect / generator ditutup: jangan proses sisa antrian
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _bulk_check_email(self, email: str) -> Dict:
+        """
+        check_email untuk bulk: sumber dipanggil berurutan di thread bulk
+        (tidak memakai executor fan-out yang dipakai request interaktif) dan
+        setiap sumber dibatasi lane-nya.
+        """
+        results = {
+            'email': email,
+            'timestamp': time.time(),
+            'sources': {},
+            'timings_ms': {}
+        }
+        
+        lanes = self._bulk_lanes()
+        for name, check in self._email_sources(email).items():
+            with lanes[name]:
+                results['sources'][name], results['timings_ms'][name] = self._timed_check(name, check)
+        
+        results['summary'] = self._aggregate_email_results(results['sources'])
         self._update_stats(results['summary']['found'])
         
         return results
     
+    def _bulk_lanes(self) -> Dict[str, threading.BoundedSemaphore]:
+        """
+        Jumlah request bulk yang boleh menunggu token per sumber. Lane =
+        per_second x max_wait, sehingga antrian di token bucket tidak pernah
+        melebihi max_wait dan email bulk tidak berakhir `rate_limited`;
+        sumber tanpa rate limit (local) memakai window penuh.
+        """
+        if self._lanes is None:
+            clients = {
+                'local': self.local_client,
+                'hibp': self.hibp_client,
+                'dehashed': self.dehashed_client,
+                'intelx': self.intelx_client
+            }
+            lanes = {}
+            for name, client in clients.items():
+                limiter = getattr(client, 'rate_limiter', None)
+                if limiter is None:
+                    size = self.config.BULK_MAX_IN_FLIGHT
+                else:
+                    size = max(1, int(limiter.rate * (client.rate_limit_wait or 1.0)))
+                lanes[name] = threading.BoundedSemaphore(size)
+            self._lanes = lanes
+        return self._lanes
+    
     def comprehensive_check(self, email: str, password: str = None) -> Dict:
         """
         Complete breach check untuk email dan password
@@ -118,8 +310,10 @@ class BreachChecker:
         
         print(f"Starting comprehensive check for {email}...")
         
-        # Check email
-        email_results = self.check_email(email)
+        # Check email; bila ada password, sisakan ~30% deadline untuk password check
+        left = remaining()
+        with deadline_scope(left * 0.7 if password and left is not None else None):
+            email_results = self.check_email(email)
         results['email_check'] = email_results
         
         # Check password if provided
@@ -132,6 +326,110 @@ class BreachChecker:
         
         return results
     
+    def _password_sources(self, password: str) -> Dict[str, Callable]:
+        """HIBP selalu tersedia, DeHashed bila dikonfigurasi"""
+        sources = {'hibp': partial(self.hibp_client.check_password, password)}
+        if self.config_status['api_status'].get('dehashed') == 'configured':
+            sources['dehashed'] = partial(self.dehashed_client.check_password, password)
+        return sources
+    
+    def _email_sources(self, email: str) -> Dict[str, Callable]:
+        """Local database (fastest), lalu sumber eksternal yang dikonfigurasi"""
+        sources = {'local': partial(self.local_client.check_email, email)}
+        if self.config_status['api_status'].get('dehashed') == 'configured':
+            sources['dehashed'] = partial(self.dehashed_client.check_email, email)
+        sources['hibp'] = partial(self.hibp_client.check_email, email)
+        if self.config_status['api_status'].get('intelx') == 'configured':
+            sources['intelx'] = partial(self.intelx_client.check_email, email)
+        return sources
+    
+    def _run_sources(self, sources: Dict[str, Callable[[], Dict]]) -> Tuple[Dict, Dict]:
+        """
+        Jalankan setiap sumber dan kumpulkan hasil beserta durasinya (ms);
+        urutan key tetap mengikuti `sources` (lihat _iter_sources)
+        """
+        results, timings = {}, {}
+        for name, result, elapsed_ms in self._iter_sources(sources):
+            results[name], timings[name] = result, elapsed_ms
+        
+        return (
+            {name: results[name] for name in sources},
+            {name: timings[name] for name in sources}
+        )
+    
+    def _iter_sources(self, sources: Dict[str, Callable[[], Dict]]) -> Iterator[Tuple[str, Dict, float]]:
+        """
+        Yield (name, result, elapsed_ms) per sumber begitu sumber itu selesai.
+        Dengan CONCURRENT_SOURCES semua sumber berjalan bersamaan di executor.
+        
+        Deadline request (deadline.py) ikut ke thread executor. Sumber yang
+        belum selesai saat deadline habis di-yield sebagai `timed_out`.
+        """
+        if not self.config.CONCURRENT_SOURCES:
+            # Berurutan: sisa deadline dibagi rata ke sumber yang belum jalan
+            for index, (name, check) in enumerate(sources.items()):
+                left = remaining()
+                if left is not None and left <= 0:
+                    yield name, self._timed_out_result(name), 0.0
+                    continue
+                print(f"- Checking {name}...")
+                share = None if left is None else left / (len(sources) - index)
+                with deadline_scope(share):
+                    result, elapsed_ms = self._timed_check(name, check)
+                yield name, result, elapsed_ms
+            return
+        
+        futures = {}
+        started = time.perf_counter()
+        for name, check in sources.items():
+            print(f"- Checking {name}...")
+            context = contextvars.copy_context()
+            futures[self.executor.submit(context.run, self._timed_check, name, check)] = name
+        
+        finished = set()
+        try:
+            for future in as_completed(futures, timeout=remaining()):
+                finished.add(future)
+                yield (futures[future], *future.result())
+        except FuturesTimeoutError:
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            for future, name in futures.items():
+                if future in finished:
+                    continue
+                if future.done():
+                    yield (name, *future.result())
+                else:
+                    # Thread yang sudah jalan berhenti sendiri: timeout HTTP-nya dibatasi deadline
+                    future.cancel()
+                    yield name, self._timed_out_result(name), elapsed_ms
+    
+    def _timed_check(self, name: str, check: Callable[[], Dict]) -> Tuple[Dict, float]:
+        """Panggil satu sumber, ukur durasi dan tangkap exception tak terduga"""
+        started = time.perf_counter()
+        try:
+            result = check()
+        except DeadlineExceeded:
+            result = self._timed_out_result(name)
+        except Exception as e:
+            result = self._exception_result(name, e)
+        elapsed = time.perf_counter() - started
+        metrics.observe_source_check(name, result.get('status'), elapsed)
+        return result, round(elapsed * 1000, 2)
+    
+    def _exception_result(self, name: str, error: Exception) -> Dict:
+        return {
+            'error': f'Error checking {name}: {str(error)}',
+            'status': 'exception',
+            'source': name
+        }
+    
+    def _timed_out_result(self, name: str) -> Dict:
+        return {
+            'error': f'{name} did not respond before the request deadline.',
+            'status': 'timed_out',
+            'source': name
+        }
+    
     def _aggregate_password_results(self, sources: Dict) -> Dict:
         """Aggregate password results from multiple sources"""
         summary = {
@@ -141,10 +439,14 @@ class BreachChecker:
             'sources_successful': 0,
             'sources_failed': 0,
             'highest_count': 0,
+            'timed_out_sources': [],
+            'partial': False,
             'recommendations': []
         }
         
         for source_name, result in sources.items():
+            if result.get('status') == 'timed_out':
+                summary['timed_out_sources'].append(source_name)
             if result.get('status') in ['found', 'success']:
                 summary['sources_successful'] += 1
                 if result.get('pwned') or result.get('found'):
@@ -171,6 +473,10 @@ class BreachChecker:
                 'Regular security checkups recommended'
             ]
         
+        summary['partial'] = bool(summary['timed_out_sources'])
+        if summary['partial']:
+            summary['recommendations'].append(PARTIAL_RESULT_RECOMMENDATION)
+        
         return summary
     
     def _aggregate_email_results(self, sources: Dict) -> Dict:
@@ -182,10 +488,14 @@ class BreachChecker:
             'sources_successful': 0,
             'sources_failed': 0,
             'breach_sources': [],
+            'timed_out_sources': [],
+            'partial': False,
             'recommendations': []
         }
         
         for source_name, result in sources.items():
+            if result.get('status') == 'timed_out':
+                summary['timed_out_sources'].append(source_name)
             if result.get('status') in ['found', 'success', 'clean']:
                 summary['sources_successful'] += 1
                 if result.get('found'):
@@ -213,6 +523,10 @@ class BreachChecker:
                 'Enable security notifications'
             ]
         
+        summary['partial'] = bool(summary['timed_out_sources'])
+        if summary['partial']:
+            summary['recommendations'].append(PARTIAL_RESULT_RECOMMENDATION)
+        
         return summary
     
     def _create_overall_summary(self, results: Dict) -> Dict:
@@ -223,6 +537,7 @@ class BreachChecker:
             'password_status': 'unknown',
             'risk_level': 'unknown',
             'action_required': False,
+            'partial': False,
             'recommendations': []
         }
         
@@ -236,6 +551,12 @@ class BreachChecker:
             password_summary = results['password_check']['summary']
             summary['password_status'] = 'breached' if password_summary['found'] else 'clean'
         
+        # Sebagian sumber timed_out: status di atas hanya dari sumber yang sempat menjawab
+        summary['partial'] = any(
+            results[check]['summary'].get('partial', False)
+            for check in ('email_check', 'password_check') if check in results
+        )
+        
         # Risk assessment
         if summary['email_status'] == 'breached' and summary['password_status'] == 'breached':
             summary['risk_level'] = 'high'
@@ -259,13 +580,21 @@ class BreachChecker:
     
     def _update_stats(self, breach_found: bool):
         """Update internal statistics"""
-        self.stats['total_checks'] += 1
-        self.stats['last_check'] = datetime.now().isoformat()
-        
-        if breach_found:
-            self.stats['successful_checks'] += 1
-        else:
-            self.stats['failed_checks'] += 1
+        self.stats_store.incr('total_checks')
+        self.stats_store.incr('successful_checks' if breach_found else 'failed_checks')
+        self.stats_store.mark('last_check')
+    
+    @property
+    def stats(self) -> Dict:
+        """Total check semua worker (tanpa I/O, lihat StatsStore.totals)"""
+        totals = self.stats_store.totals()
+        last_check = self.stats_store.marks().get('last_check')
+        return {
+            'total_checks': int(totals.get('total_checks', 0)),
+            'successful_checks': int(totals.get('successful_checks', 0)),
+            'failed_checks': int(totals.get('failed_checks', 0)),
+            'last_check': datetime.fromtimestamp(last_check).isoformat() if last_check else None
+        }
     
     def get_status(self) -> Dict:
         """Get current status of breach checker"""
@@ -277,6 +606,14 @@ class BreachChecker:
                 'dehashed': self.config_status['api_status'].get('dehashed') == 'configured',
                 'intelx': self.config_status['api_status'].get('intelx') == 'configured',
                 'local_db': self.config_status['api_status'].get('local_db') == 'available'
+            },
+            'rate_limiters': get_rate_limiter_stats(),
+            'single_flight': get_single_flight_stats(),
+            'circuit_breakers': get_circuit_breaker_stats(),
+            'http_pool': get_http_pool_stats(),
+            'caches': {
+                'hibp_range': self.hibp_client.range_cache.get_stats(),
+                'email_results': email_result_cache.get_stats()
             }
         }
     
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+In-process TTL/LRU cache dengan batas jumlah entry dan memori
+Dipakai untuk response API upstream (mis. HIBP range per prefix)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import metrics
+
+class CacheEntry:
+    """Satu entry cache; entry kadaluarsa disimpan untuk revalidasi ETag"""
+    
+    __slots__ = ('value', 'expires_at', 'size', 'etag')
+    
+    def __init__(self, value: Any, expires_at: float, size: int, etag: Optional[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.etag = etag
+    
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+class TTLCache:
+    """
+    Thread-safe LRU cache dengan TTL per entry.
+    Eviction terjadi bila jumlah entry melebihi `max_entries` atau total
+    ukuran (perkiraan bytes) melebihi `max_bytes`.
+    """
+    
+    # Perkiraan overhead per entry (key, CacheEntry, node OrderedDict)
+    ENTRY_OVERHEAD = 200
+    
+    def __init__(self, name: str, ttl: float, max_entries: int = 1024,
+                 max_bytes: Optional[int] = None, enabled: bool = True):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled and max_entries > 0
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'revalidations': 0
+        }
+    
+    def get(self, key: Hashable) -> Any:
+        """Ambil value yang masih fresh, None bila miss/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and entry.fresh
+            if hit:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+        
+        if self.enabled:
+            metrics.count_cache_lookup(self.name, hit)
+        return entry.value if hit else None
+    
+    def get_stale(self, key: Hashable) -> Optional[CacheEntry]:
+        """Ambil entry apa adanya (termasuk yang expired), tanpa menghitung statistik"""
+        with self._lock:
+            return self._entries.get(key)
+    
+    def set(self, key: Hashable, value: Any, size: int = 0,
+            etag: Optional[str] = None, ttl: Optional[float] = None):
+        """Simpan value; `size` adalah perkiraan bytes untuk batas memori"""
+        if not self.enabled:
+            return
+        
+        size += self.ENTRY_OVERHEAD
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = CacheEntry(value, expires_at, size, etag)
+            self._bytes += size
+            self._evict()
+    
+    def revalidate(self, key: Hashable, ttl: Optional[float] = None) -> Any:
+        """Perpanjang TTL entry setelah upstream menjawab 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries.move_to_end(key)
+            self.stats['revalidations'] += 1
+            return entry.value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def _evict(self):
+        """Buang entry paling lama tidak dipakai sampai di bawah batas (lock sudah dipegang)"""
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.stats['evictions'] += 1
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict:
+        """Statistik cache untuk /api/status"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'name': self.name,
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                **self.stats,
+                'hit_ratio': round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker per sumber upstream
+State closed -> open saat error rate (exception, 429, 5xx) atau rate panggilan
+lambat di jendela terakhir melewati ambang; selama open request langsung
+ditolak. Setelah `open_seconds` breaker half-open dan meloloskan beberapa
+probe: sukses -> closed, gagal -> open lagi. Probe yang tidak pernah
+melapor (record/cancel) dianggap hilang setelah `open_seconds` dan
+digantikan probe baru, sehingga breaker tidak terkunci di half-open.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from config import Config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """Breaker thread-safe untuk satu sumber (per proses)"""
+    
+    def __init__(self, name: str, window_size: int = 20, window_seconds: float = 60.0,
+                 min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 5.0, slow_call_rate: float = 0.8,
+                 open_seconds: float = 30.0, half_open_calls: int = 1):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_at = 0.0
+        # (monotonic time, sukses, latency detik) untuk panggilan terakhir
+        self._calls = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'failures': 0,
+            'rejected': 0,
+            'opened': 0
+        }
+    
+    def allow(self) -> bool:
+        """Boleh kirim request sekarang?"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self._opened_at < self.open_seconds:
+                    self.stats['rejected'] += 1
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+            
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls and now - self._probe_at < self.open_seconds:
+                    self.stats['rejected'] += 1
+                    return False
+                if self._probes >= self.half_open_calls:
+                    self._probes = 0  # probe sebelumnya tidak pernah melapor
+                self._probes += 1
+                self._probe_at = now
+            return True
+    
+    def cancel(self):
+        """Request yang sudah di-allow batal dikirim (mis. rate limit lokal)"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+    
+    def record(self, success: bool, latency: float):
+        """Catat hasil satu request yang sudah di-allow"""
+        with self._lock:
+            now = time.monotonic()
+            self.stats['calls'] += 1
+            if not success:
+                self.stats['failures'] += 1
+            self._calls.append((now, success, latency))
+            
+            if self.state == HALF_OPEN:
+                if success and latency < self.slow_call_seconds:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+            
+            if self.state == CLOSED and self._should_open(now):
+                self._open(now)
+    
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self.stats['opened'] += 1
+    
+    def _recent(self, now: float):
+        return [call for call in self._calls if now - call[0] <= self.window_seconds]
+    
+    def _should_open(self, now: float) -> bool:
+        recent = self._recent(now)
+        if len(recent) < self.min_calls:
+            return False
+        failures = sum(1 for _, success, _ in recent if not success)
+        slow = sum(1 for _, _, latency in recent if latency >= self.slow_call_seconds)
+        return (failures / len(recent) >= self.failure_rate
+                or slow / len(recent) >= self.slow_call_rate)
+    
+    def get_stats(self) -> Dict:
+        """State dan statistik jendela terakhir untuk /api/sources"""
+        with self._lock:
+            recent = self._recent(time.monotonic())
+            latencies = sorted(latency for _, _, latency in recent)
+            successes = sum(1 for _, success, _ in recent if success)
+            
+            def percentile(p: float) -> Optional[float]:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+            
+            state = self.state
+            if state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                state = HALF_OPEN
+            
+            return {
+                'name': self.name,
+                'state': state,
+                'recent_calls': len(recent),
+                'success_rate': round(successes / len(recent), 3) if recent else None,
+                'latency_ms': {
+                    'avg': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+                    'p50': percentile(0.5),
+                    'p95': percentile(0.95)
+                },
+                **self.stats
+            }
+    
+    def reliability(self) -> str:
+        """Label reliability dari state dan success rate terbaru"""
+        stats = self.get_stats()
+        if stats['state'] != CLOSED:
+            return 'down'
+        if stats['success_rate'] is None:
+            return 'unknown'
+        if stats['success_rate'] >= 0.95:
+            return 'high'
+        if stats['success_rate'] >= 0.8:
+            return 'medium'
+        return 'low'
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str, settings: Optional[Dict] = None) -> CircuitBreaker:
+    """Breaker bersama per sumber (satu per proses), default dari Config.CIRCUIT_BREAKER"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **{**Config.CIRCUIT_BREAKER, **(settings or {})})
+            _breakers[name] = breaker
+        return breaker
+
+def get_all_stats() -> Dict[str, Dict]:
+    """Statistik semua breaker yang sudah dibuat"""
+    with _breakers_lock:
+        return {name: breaker.get_stats() for name, breaker in _breakers.items()}
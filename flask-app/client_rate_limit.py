@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Rate limiting per client untuk endpoint /api (SecurityConfig.RATE_LIMITS)
+
+GCRA (generic cell rate algorithm): per client dan per window hanya satu
+angka yang disimpan, TAT (theoretical arrival time). Limit L per periode P
+memberi interval T = P / L; request diterima bila TAT baru, max(TAT, now) + T,
+tidak lebih dari P di depan now. O(1) per request, burst maksimal L.
+
+Backend 'memory' per proses (LRU berbatas, key idle dibuang otomatis), jadi
+dengan N worker limit efektifnya N x limit; 'redis' dibagi semua worker
+lewat satu script Lua atomik, key idle kedaluwarsa sendiri lewat PX.
+
+Setiap request /api berbiaya satu unit; endpoint bulk membayar satu unit per
+item (charge/charge_each). Biaya satu request dibatasi limit window terkecil:
+biaya di atas burst tidak akan pernah diterima berapa lama pun client menunggu,
+jadi batch besar cukup menghabiskan satu burst penuh.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from config import SecurityConfig
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+PERIODS = {
+    'per_second': 1,
+    'per_minute': 60,
+    'per_hour': 3600,
+    'per_day': 86400
+}
+
+# (limit, period detik)
+Limits = List[Tuple[int, int]]
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int  # limit yang paling dekat habis
+    remaining: int
+    reset: float  # detik sampai kuota limit itu penuh lagi
+    retry_after: float  # 0 bila diterima, inf bila biaya melebihi limit (tidak pernah diterima)
+
+def evaluate(limits: Limits, tats: List[float], now: float, cost: int = 1) -> Tuple[bool, List[float], float]:
+    """GCRA untuk semua window sekaligus: (diterima, TAT baru, retry_after)"""
+    new_tats, retry_after = [], 0.0
+    for (limit, period), tat in zip(limits, tats):
+        new_tat = max(tat, now) + period / limit * cost
+        retry_after = max(retry_after, new_tat - now - period)
+        new_tats.append(new_tat)
+        if cost > limit:
+            retry_after = math.inf
+    return retry_after <= 0, new_tats, retry_after
+
+def retry_after_seconds(result: RateLimitResult) -> Optional[int]:
+    """Retry-After dalam detik bulat, None bila menunggu tidak akan membantu"""
+    if math.isinf(result.retry_after):
+        return None
+    return max(1, math.ceil(result.retry_after))
+
+class MemoryGCRAStore:
+    """TAT per client di memori proses; key paling lama tidak dipakai dibuang lebih dulu"""
+    
+    shared = False
+    
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def update(self, key: str, limits: Limits, cost: int) -> Tuple[bool, float, List[float]]:
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            tats = self._tats.get(key) or [now] * len(limits)
+            allowed, new_tats, _ = evaluate(limits, tats, now, cost)
+            if allowed:
+                tats = self._tats[key] = new_tats
+                self._tats.move_to_end(key)
+                while len(self._tats) > self.max_keys:
+                    self._tats.popitem(last=False)
+            return allowed, now, tats
+    
+    def _expire(self, now: float):
+        """Buang maksimal dua key idle di ujung LRU (TAT lewat = state sama dengan key baru)"""
+        for _ in range(2):
+            if not self._tats:
+                return
+            key, tats = next(iter(self._tats.items()))
+            if max(tats) > now:
+                return
+            del self._tats[key]
+    
+    def __len__(self) -> int:
+        return len(self._tats)
+
+class RedisGCRAStore:
+    """TAT per client di Redis, dibagi semua worker; jam memakai TIME milik Redis"""
+    
+    shared = True
+    
+    SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local tats, new_tats, allowed = {}, {}, 1
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i])
+    local period = tonumber(ARGV[2 * i + 1])
+    local tat = tonumber(redis.call('GET', key)) or now
+    tats[i] = tat
+    new_tats[i] = math.max(tat, now) + period / limit * cost
+    if new_tats[i] - now > period then allowed = 0 end
+end
+local result = {allowed, string.format('%.6f', now)}
+for i, key in ipairs(KEYS) do
+    if allowed == 1 then
+        redis.call('SET', key, string.format('%.6f', new_tats[i]), 'PX', math.ceil((new_tats[i] - now) * 1000))
+        tats[i] = new_tats[i]
+    end
+    result[#result + 1] = string.format('%.6f', tats[i])
+end
+return result
+"""
+    
+    def __init__(self, url: str, prefix: str = 'breachchecker:ratelimit:'):
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._script = self.client.register_script(self.SCRIPT)
+    
+    def update(self, key: str, limits: Limits, cost: int) -> Tuple[bool, float, List[float]]:
+        # Hash tag {key}: semua window satu client di slot yang sama (Redis Cluster)
+        keys = [f'{self.prefix}{{{key}}}:{period}' for _, period in limits]
+        args = [cost]
+        for limit, period in limits:
+            args += [limit, period]
+        allowed, now, *tats = self._script(keys=keys, args=args)
+        return bool(int(allowed)), float(now), [float(tat) for tat in tats]
+
+class ClientRateLimiter:
+    """Limiter per client identity (IP) untuk semua window di SecurityConfig.RATE_LIMITS"""
+    
+    def __init__(self, limits: Dict[str, int], store, exempt=()):
+        self.limits: Limits = [
+            (int(limit), PERIODS[name]) for name, limit in limits.items()
+            if name in PERIODS and limit and int(limit) > 0
+        ]
+        self.store = store
+        self.exempt = set(exempt)
+        self.policy = ', '.join(f'{limit};w={period}' for limit, period in self.limits)
+        # Biaya maksimal satu request: satu burst penuh window yang paling ketat
+        self.max_cost = min((limit for limit, _ in self.limits), default=0)
+        self.stats = {
+            'allowed': 0,
+            'rejected': 0,
+            'backend_errors': 0
+        }
+    
+    def applies(self, path: str) -> bool:
+        return path.startswith('/api/') and path not in self.exempt
+    
+    def hit(self, client: str, cost: int = 1) -> Optional[RateLimitResult]:
+        """Catat satu request; None bila backend tidak bisa dihubungi (fail open)"""
+        try:
+            allowed, now, tats = self.store.update(client, self.limits, cost)
+        except Exception as e:
+            self.stats['backend_errors'] += 1
+            print(f"Client rate limit backend error: {e}")
+            return None
+        
+        self.stats['allowed' if allowed else 'rejected'] += 1
+        return self._result(allowed, now, tats, cost)
+    
+    def _result(self, allowed: bool, now: float, tats: List[float], cost: int) -> RateLimitResult:
+        retry_after = 0.0 if allowed else evaluate(self.limits, tats, now, cost)[2]
+        
+        # Header melaporkan window dengan sisa kuota paling sedikit
+        tightest = None
+        for (limit, period), tat in zip(self.limits, tats):
+            used = max(0.0, tat - now)
+            remaining = max(0, min(limit, math.floor((period - used) / (period / limit))))
+            if tightest is None or remaining < tightest[1]:
+                tightest = (limit, remaining, used)
+        
+        limit, remaining, reset = tightest
+        return RateLimitResult(allowed, limit, remaining, reset, retry_after)
+    
+    def headers(self, result: RateLimitResult) -> Dict[str, str]:
+        """RateLimit-* (draft IETF httpapi-ratelimit-headers) dan Retry-After saat ditolak"""
+        headers = {
+            'RateLimit-Limit': str(result.limit),
+            'RateLimit-Remaining': str(result.remaining),
+            'RateLimit-Reset': str(math.ceil(result.reset)),
+            'RateLimit-Policy': self.policy
+        }
+        retry_after = None if result.allowed else retry_after_seconds(result)
+        if retry_after is not None:
+            headers['Retry-After'] = str(retry_after)
+        return headers
+    
+    def get_stats(self) -> Dict:
+        return {
+            'backend': 'redis' if self.store.shared else 'memory',
+            # memory: setiap worker menghitung sendiri, limit efektif = limit x jumlah worker
+            'scope': 'all_workers' if self.store.shared else 'per_worker',
+            'policy': self.policy,
+            'tracked_clients': len(self.store) if not self.store.shared else None,
+            **self.stats
+        }
+
+_limiter: Optional[ClientRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_client_rate_limiter() -> Optional[ClientRateLimiter]:
+    """Limiter bersama (satu per proses), None bila dimatikan atau tanpa limit"""
+    global _limiter
+    if not SecurityConfig.CLIENT_RATE_LIMIT_ENABLED:
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            storage = SecurityConfig.CLIENT_RATE_LIMIT_STORAGE
+            if storage == 'redis' and redis is not None:
+                store = RedisGCRAStore(SecurityConfig.CLIENT_RATE_LIMIT_REDIS_URL)
+            else:
+                if storage == 'redis':
+                    print("⚠️  redis package not installed, client rate limits are per process")
+                store = MemoryGCRAStore(SecurityConfig.CLIENT_RATE_LIMIT_MAX_KEYS)
+            limiter = ClientRateLimiter(SecurityConfig.RATE_LIMITS, store,
+                                        SecurityConfig.CLIENT_RATE_LIMIT_EXEMPT)
+            if not limiter.limits:
+                return None
+            _limiter = limiter
+        return _limiter
+
+class ClientRateLimitExceeded(Exception):
+    """Biaya tambahan request (item bulk) ditolak limiter"""
+    
+    def __init__(self, result: RateLimitResult):
+        super().__init__('Rate limit exceeded. Please try again later.')
+        self.result = result
+        self.retry_after = retry_after_seconds(result)
+
+def charged_by_view(view):
+    """
+    Endpoint yang membayar seluruh biayanya sendiri lewat satu charge(): before_request
+    tidak mengambil unit, jadi request yang ditolak tidak memakai kuota dan
+    Retry-After adalah waktu tunggu sampai request yang sama diterima
+    """
+    view.client_rate_limit_charged = True
+    return view
+
+def charge(cost: int = 1) -> Optional[RateLimitResult]:
+    """
+    Biaya tambahan untuk request Flask yang sedang berjalan, dipotong supaya
+    total request (termasuk unit before_request) tidak melebihi max_cost.
+    ClientRateLimitExceeded bila ditolak; tanpa efek bila limit dimatikan
+    atau backend tidak bisa dihubungi.
+    """
+    limiter = get_client_rate_limiter()
+    if limiter is None or cost <= 0:
+        return None
+    
+    from flask import g, request
+    if not limiter.applies(request.path):
+        return None
+    charged = g.get('rate_limit_cost', 0)
+    cost = min(cost, limiter.max_cost - charged)
+    if cost <= 0:
+        return None
+    result = limiter.hit(request.remote_addr or 'unknown', cost)
+    if result is None:
+        return None
+    g.rate_limit = result
+    if not result.allowed:
+        raise ClientRateLimitExceeded(result)
+    g.rate_limit_cost = charged + cost
+    return result
+
+def charge_each(items: Iterable, free: int = 1) -> Iterator:
+    """Yield item input bulk sambil men-charge satu unit per item setelah `free` item pertama"""
+    for count, item in enumerate(items, 1):
+        if count > free:
+            charge()
+        yield item
+
+def init_app(app):
+    """Terapkan limit ke setiap request /api Flask; header RateLimit-* di semua response"""
+    limiter = get_client_rate_limiter()
+    if limiter is None:
+        return None
+    from flask import abort, g, request
+    
+    @app.before_request
+    def _limit_client():
+        if not limiter.applies(request.path):
+            return None
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, 'client_rate_limit_charged', False):
+            return None
+        g.rate_limit = limiter.hit(request.remote_addr or 'unknown')
+        if g.rate_limit is not None and not g.rate_limit.allowed:
+            abort(429)
+        g.rate_limit_cost = 1
+    
+    @app.after_request
+    def _rate_limit_headers(response):
+        result = g.pop('rate_limit', None)
+        if result is not None:
+            response.headers.update(limiter.headers(result))
+        return response
+    
+    return limiter
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Kompresi response (brotli/gzip) dan conditional GET
+
+- Response buffered (JSON, HTML) sebesar minimal Config.COMPRESS_MIN_SIZE
+  dikompres sesuai Accept-Encoding. Response streaming (NDJSON, SSE) tidak
+  disentuh supaya tetap dikirim per event.
+- GET tanpa validator sendiri mendapat weak ETag dari hash body dan
+  Cache-Control no-cache; If-None-Match yang cocok dijawab 304 tanpa body.
+- Aset statis dikirim dari varian .br/.gz yang dibuat sekali dengan level
+  maksimal (python compression.py precompress static, otomatis di gunicorn
+  on_starting). URL dari asset_url() membawa ?v=<fingerprint> isi file dan
+  di-cache setahun sebagai immutable; URL lain direvalidasi lewat ETag.
+
+Brotli butuh paket `brotli`; tanpa itu hanya gzip yang dibuat dinamis
+(varian .br yang sudah ada tetap dikirim).
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Urutan preferensi; br hanya bisa dibuat bila modul brotli ada
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+STATIC_ENCODINGS = ('br', 'gzip')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+mimetypes.add_type('application/manifest+json', '.webmanifest')
+mimetypes.add_type('text/javascript', '.js')
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Level default untuk response dinamis; aset statis memakai level maksimal"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESS_LEVEL_BROTLI if level is None else level)
+    return gzip.compress(data, compresslevel=Config.COMPRESS_LEVEL_GZIP if level is None else level, mtime=0)
+
+def negotiate(accept_encodings, available: Tuple[str, ...] = ENCODINGS) -> Optional[str]:
+    """Encoding pertama dari `available` yang diterima client (q > 0)"""
+    for encoding in available:
+        if accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+def compressible(mimetype: Optional[str]) -> bool:
+    return mimetype in Config.COMPRESS_MIMETYPES
+
+def _is_fresh(variant: str, source_stat: os.stat_result) -> bool:
+    """Varian dibuat dari isi file saat ini (precompress menyalin mtime sumber)"""
+    try:
+        return os.stat(variant).st_mtime_ns == source_stat.st_mtime_ns
+    except OSError:
+        return False
+
+_fingerprints: Dict[str, Tuple[int, int, str]] = {}
+
+def fingerprint(path: str) -> str:
+    """Hash pendek isi file, di-cache per (mtime, size)"""
+    stat = os.stat(path)
+    cached = _fingerprints.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+    _fingerprints[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+def send_static(directory: str, filename: str):
+    """
+    send_from_directory dengan varian precompressed dan cache policy:
+    immutable setahun bila ?v= cocok dengan fingerprint, selain itu no-cache
+    (revalidasi ETag, 304 bila tidak berubah)
+    """
+    from flask import abort, request, send_file
+    from werkzeug.utils import safe_join
+    
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    variant, encoding = path, None
+    if compressible(mimetype):
+        stat = os.stat(path)
+        for candidate in STATIC_ENCODINGS:
+            if request.accept_encodings.quality(candidate) > 0 and _is_fresh(path + SUFFIXES[candidate], stat):
+                variant, encoding = path + SUFFIXES[candidate], candidate
+                break
+    
+    # ETag dari send_file berbeda per varian (path, mtime, size)
+    response = send_file(variant, mimetype=mimetype, conditional=True, etag=True)
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    if compressible(mimetype):
+        response.vary.add('Accept-Encoding')
+    
+    version = request.args.get('v')
+    if version and version == fingerprint(path):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.STATIC_IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = None
+        response.cache_control.no_cache = True
+    return response
+
+def precompress(directory: str) -> Dict[str, int]:
+    """
+    Tulis varian .br/.gz (level maksimal) untuk file teks di `directory` yang
+    belum punya varian segar. Aman dijalankan banyak proses (tulis atomik).
+    """
+    written = {'files': 0, 'variants': 0, 'bytes_saved': 0}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(tuple(SUFFIXES.values())):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            if not compressible(mimetypes.guess_type(name)[0]) or stat.st_size < Config.COMPRESS_MIN_SIZE:
+                continue
+            
+            written['files'] += 1
+            data = None
+            for encoding in ENCODINGS:
+                target = path + SUFFIXES[encoding]
+                if _is_fresh(target, stat):
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                compressed = compress(data, encoding, level=11 if encoding == 'br' else 9)
+                if len(compressed) >= len(data):
+                    continue
+                
+                tmp = f'{target}.{os.getpid()}.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(compressed)
+                os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                os.replace(tmp, target)
+                written['variants'] += 1
+                written['bytes_saved'] += len(data) - len(compressed)
+    return written
+
+def init_app(app):
+    """Pasang ETag/304 dan kompresi ke semua response Flask; asset_url() untuk template"""
+    from flask import request, url_for
+    
+    assets_dir = os.path.join(app.root_path, 'static', 'assets')
+    
+    @app.template_global()
+    def asset_url(filename: str) -> str:
+        """URL /assets dengan fingerprint isi file (cache immutable)"""
+        return url_for('serve_assets', filename=filename, v=fingerprint(os.path.join(assets_dir, filename)))
+    
+    @app.after_request
+    def _conditional_and_compress(response):
+        if response.is_streamed or response.direct_passthrough:
+            return response
+        
+        if (request.method in ('GET', 'HEAD') and response.status_code == 200
+                and 'ETag' not in response.headers and not response.cache_control.no_store):
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=12).hexdigest(), weak=True)
+            if 'Cache-Control' not in response.headers:
+                response.cache_control.no_cache = True
+            response.make_conditional(request)
+        
+        if (response.status_code != 200 or 'Content-Encoding' in response.headers
+                or not compressible(response.mimetype)
+                or response.calculate_content_length() < Config.COMPRESS_MIN_SIZE):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+        
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        # Representasi terkompresi bukan byte yang sama: validator kuat jadi weak
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+    
+    return app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompress static assets')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    precompress_cmd = commands.add_parser('precompress', help='Write .br/.gz variants next to text assets')
+    precompress_cmd.add_argument('directory', nargs='?', default='static')
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'precompress':
+        result = precompress(args.directory)
+        encodings = ', '.join(ENCODINGS)
+        print(f"✅ {result['variants']} variants ({encodings}) for {result['files']} files, "
+              f"{result['bytes_saved']:,} bytes saved")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,7 @@ Semua kredensial dan pengaturan disimpan di sini
 """
 
 import os
+import tempfile
 from typing import Dict, Any
 
 class Config:
@@ -17,9 +18,73 @@ class Config:
     PORT = int(os.environ.get('FLASK_PORT', 5000))
     
     # Rate Limiting
-    RATE_LIMIT_DELAY = 1  # seconds between API calls
+    RATE_LIMIT_DELAY = 1  # default seconds between API calls (per source)
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # 'memory' | 'file'
+    RATE_LIMIT_STATE_DIR = os.environ.get('RATE_LIMIT_STATE_DIR', tempfile.gettempdir())
     REQUEST_TIMEOUT = 10  # seconds
-    MAX_RETRIES = 3
+    MAX_RETRIES = 3  # retry untuk connection error, 5xx dan 429
+    RETRY_BACKOFF_BASE = 0.5  # seconds, jeda maksimal = base * 2^attempt (full jitter)
+    RETRY_BACKOFF_MAX = 8.0
+    RETRY_AFTER_MAX = 10.0  # Retry-After lebih lama dari ini -> tidak di-retry
+    
+    # Deadline (time budget) per request dalam detik, bisa diganti caller lewat header
+    DEADLINE_HEADER = 'X-Request-Deadline'
+    REQUEST_DEADLINES = {
+        'check_account': float(os.environ.get('DEADLINE_CHECK_ACCOUNT', 8)),
+        'check_password': float(os.environ.get('DEADLINE_CHECK_PASSWORD', 5)),
+        'comprehensive_check': float(os.environ.get('DEADLINE_COMPREHENSIVE_CHECK', 12))
+    }
+    MAX_REQUEST_DEADLINE = float(os.environ.get('MAX_REQUEST_DEADLINE', 60))
+    
+    # Prometheus metrics (metrics.py); multi-worker: set PROMETHEUS_MULTIPROC_DIR
+    ENABLE_METRICS = os.environ.get('ENABLE_METRICS', 'true').lower() == 'true'
+    METRICS_PATH = '/metrics'
+    
+    # JSON encoder (json_provider.py): 'orjson' (fallback ke json bila tidak terpasang) | 'json'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson').lower()
+    
+    # Kompresi response dan conditional GET (compression.py)
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # bytes
+    COMPRESS_LEVEL_GZIP = int(os.environ.get('COMPRESS_LEVEL_GZIP', 6))
+    COMPRESS_LEVEL_BROTLI = int(os.environ.get('COMPRESS_LEVEL_BROTLI', 4))  # response dinamis; aset statis level 11
+    COMPRESS_MIMETYPES = (
+        'application/json', 'text/html', 'text/css', 'text/javascript', 'application/javascript',
+        'text/plain', 'image/svg+xml', 'application/manifest+json'
+    )
+    STATIC_IMMUTABLE_MAX_AGE = 31536000  # 1 tahun untuk URL aset ber-fingerprint (?v=)
+    
+    # Pool koneksi HTTP bersama (http_transport.py)
+    HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 10))  # jumlah host
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 32))  # koneksi per host
+    HTTP_POOL_BLOCK = os.environ.get('HTTP_POOL_BLOCK', 'false').lower() == 'true'
+    
+    # Source fan-out (jalankan semua sumber secara paralel)
+    CONCURRENT_SOURCES = os.environ.get('CONCURRENT_SOURCES', 'true').lower() == 'true'
+    MAX_SOURCE_WORKERS = int(os.environ.get('MAX_SOURCE_WORKERS', 16))
+    
+    # Circuit breaker per sumber upstream (lihat circuit_breaker.py)
+    CIRCUIT_BREAKER = {
+        'window_size': int(os.environ.get('CIRCUIT_BREAKER_WINDOW', 20)),  # panggilan terakhir
+        'window_seconds': 60.0,
+        'min_calls': int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', 5)),
+        'failure_rate': float(os.environ.get('CIRCUIT_BREAKER_FAILURE_RATE', 0.5)),
+        'slow_call_seconds': 5.0,
+        'slow_call_rate': 0.8,
+        'open_seconds': float(os.environ.get('CIRCUIT_BREAKER_OPEN_SECONDS', 30)),
+        'half_open_calls': 1
+    }
+    
+    # Bulk account check (/api/check-accounts)
+    BULK_MAX_ACCOUNTS = int(os.environ.get('BULK_MAX_ACCOUNTS', 100000))
+    BULK_MAX_IN_FLIGHT = int(os.environ.get('BULK_MAX_IN_FLIGHT', 32))
+    
+    # Batch password audit (/api/check-passwords)
+    PASSWORD_BATCH_MAX = int(os.environ.get('PASSWORD_BATCH_MAX', 10000))
+    PASSWORD_BATCH_CONCURRENCY = int(os.environ.get('PASSWORD_BATCH_CONCURRENCY', 8))
+    
+    # Async stack (asgi.py)
+    ASYNC_CONNECTION_LIMIT = int(os.environ.get('ASYNC_CONNECTION_LIMIT', 100))
+    ASYNC_CONNECTION_LIMIT_PER_HOST = int(os.environ.get('ASYNC_CONNECTION_LIMIT_PER_HOST', 20))
     
     # Local Database
     LOCAL_BREACH_FILE = 'local_breaches.txt'
@@ -37,6 +102,11 @@ class APICredentials:
         },
         'enabled': True,
         'free_tier_limit': 10,
+        'rate_limit': {
+            'per_second': 1.0,
+            'burst': 2,
+            'max_wait': 5.0  # seconds, lebih lama dari ini -> rate_limited
+        },
         'headers': {
             'Content-Type': 'application/json',
             'User-Agent': 'BreachChecker/1.0'
@@ -51,7 +121,12 @@ class APICredentials:
             'search': '/phonebook/search'
         },
         'enabled': False,  # Set True when API key is provided
-        'free_tier_limit': 50
+        'free_tier_limit': 50,
+        'rate_limit': {
+            'per_second': 1.0,
+            'burst': 2,
+            'max_wait': 5.0
+        }
     }
     
     # HIBP Configuration
@@ -63,7 +138,13 @@ class APICredentials:
             'breached_account': '/breachedaccount/'
         },
         'enabled': True,
-        'free': True
+        'free': True,
+        # Hanya untuk breachedaccount; range API Pwned Passwords tidak dibatasi
+        'rate_limit': {
+            'per_second': 1 / 1.5,  # 1 request per 1500ms
+            'burst': 1,
+            'max_wait': 5.0
+        }
     }
 
 class DatabaseConfig:
@@ -74,15 +155,62 @@ class DatabaseConfig:
         'file': 'local_breaches.txt',
         'encoding': 'utf-8',
         'case_sensitive': False,
+        'reload_check_interval': 1.0,  # seconds antara stat() untuk deteksi perubahan file
+        # 'memory' = hash set in-process, 'sharded' = index on-disk (python local_index.py build ...)
+        'engine': os.environ.get('LOCAL_DB_ENGINE', 'memory'),
+        'index_dir': os.environ.get('LOCAL_DB_INDEX_DIR', 'local_index'),
+        # add_email: flush ke file per batch atau setelah interval (0 = langsung)
+        'write_batch_size': int(os.environ.get('LOCAL_DB_WRITE_BATCH_SIZE', '1000')),
+        'write_flush_interval': float(os.environ.get('LOCAL_DB_WRITE_FLUSH_INTERVAL', '1.0')),
+        # Email tambahan di luar snapshot; lebih dari ini buffer di-flush dan overlay digabung
+        'overlay_max_entries': int(os.environ.get('LOCAL_DB_OVERLAY_MAX', '100000')),
         'auto_backup': True,
         'backup_interval': 86400  # 24 hours
     }
     
-    # Statistics storage
+    # Offline Pwned Passwords index (python pwned_offline.py build ...)
+    PWNED_PASSWORDS = {
+        'file': os.environ.get('PWNED_PASSWORDS_FILE', ''),
+        'reload_check_interval': 5.0  # detik antara stat() untuk deteksi build baru
+    }
+    
+    # Statistics storage (stats_store.py), dibagi semua worker lewat file
     STATS = {
-        'file': 'stats.json',
-        'update_interval': 300,  # 5 minutes
-        'keep_history': True
+        'file': os.environ.get('STATS_FILE', 'stats.json'),
+        'update_interval': float(os.environ.get('STATS_UPDATE_INTERVAL', 60)),  # detik antar flush
+        'keep_history': os.environ.get('STATS_KEEP_HISTORY', 'true').lower() == 'true',
+        'history_bucket': 3600,  # 1 jam per bucket
+        'history_buckets': 168  # simpan 7 hari
+    }
+    
+    # Katalog breach HIBP (breach_catalog.py), snapshot JSON GET /api/v3/breaches
+    BREACH_CATALOG = {
+        'file': os.environ.get('BREACH_CATALOG_FILE', 'breaches.json'),
+        'reload_check_interval': 5.0,  # detik antara stat() untuk deteksi snapshot baru
+        'page_size': int(os.environ.get('BREACH_CATALOG_PAGE_SIZE', 50)),
+        'max_page_size': int(os.environ.get('BREACH_CATALOG_MAX_PAGE_SIZE', 1000)),
+        'cache_max_age': int(os.environ.get('BREACH_CATALOG_CACHE_MAX_AGE', 300))  # Cache-Control, detik
+    }
+
+class CacheConfig:
+    """In-process cache settings"""
+    
+    # HIBP Pwned Passwords /range/{prefix} responses (revalidated via ETag)
+    PASSWORD_RANGE = {
+        'enabled': os.environ.get('PASSWORD_RANGE_CACHE', 'true').lower() == 'true',
+        'ttl': int(os.environ.get('PASSWORD_RANGE_CACHE_TTL', 6 * 3600)),  # seconds
+        'max_entries': int(os.environ.get('PASSWORD_RANGE_CACHE_ENTRIES', 16384)),
+        'max_bytes': int(os.environ.get('PASSWORD_RANGE_CACHE_MB', 128)) * 1024 * 1024
+    }
+
+    # Hasil check_email per sumber (HIBP, DeHashed, IntelX); key di-hash
+    EMAIL_RESULTS = {
+        'enabled': os.environ.get('EMAIL_RESULT_CACHE', 'true').lower() == 'true',
+        'ttl_found': int(os.environ.get('EMAIL_RESULT_CACHE_TTL_FOUND', 6 * 3600)),
+        'ttl_clean': int(os.environ.get('EMAIL_RESULT_CACHE_TTL_CLEAN', 3600)),
+        'ttl_error': int(os.environ.get('EMAIL_RESULT_CACHE_TTL_ERROR', 60)),  # 0 = jangan cache error
+        'max_entries': int(os.environ.get('EMAIL_RESULT_CACHE_ENTRIES', 50000)),
+        'max_bytes': int(os.environ.get('EMAIL_RESULT_CACHE_MB', 64)) * 1024 * 1024
     }
 
 class SecurityConfig:
@@ -100,12 +228,20 @@ class SecurityConfig:
     # CORS settings
     CORS_ORIGINS = ['http://localhost:3000', 'http://localhost:5000']
     
-    # Rate limiting
+    # Rate limiting per client untuk /api (client_rate_limit.py, GCRA)
     RATE_LIMITS = {
-        'per_minute': 60,
-        'per_hour': 1000,
-        'per_day': 10000
+        'per_minute': int(os.environ.get('RATE_LIMIT_PER_MINUTE', 60)),
+        'per_hour': int(os.environ.get('RATE_LIMIT_PER_HOUR', 1000)),
+        'per_day': int(os.environ.get('RATE_LIMIT_PER_DAY', 10000))
     }
+    CLIENT_RATE_LIMIT_ENABLED = os.environ.get('CLIENT_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    CLIENT_RATE_LIMIT_STORAGE = os.environ.get('CLIENT_RATE_LIMIT_STORAGE', 'memory')  # 'memory' | 'redis'
+    CLIENT_RATE_LIMIT_REDIS_URL = os.environ.get('CLIENT_RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    CLIENT_RATE_LIMIT_MAX_KEYS = int(os.environ.get('CLIENT_RATE_LIMIT_MAX_KEYS', 100000))  # backend memory
+    CLIENT_RATE_LIMIT_EXEMPT = ['/api/status']
+    
+    # Jumlah reverse proxy di depan app yang X-Forwarded-For-nya dipercaya (0 = langsung)
+    TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
 
 # Environment-specific configurations
 class DevelopmentConfig(Config):
@@ -163,7 +299,13 @@ def validate_config() -> Dict[str, Any]:
         status['api_status']['intelx'] = 'configured'
     
     # Check local database file
-    if os.path.exists(DatabaseConfig.LOCAL_DB['file']):
+    if DatabaseConfig.LOCAL_DB['engine'] == 'sharded':
+        if os.path.exists(os.path.join(DatabaseConfig.LOCAL_DB['index_dir'], 'manifest.json')):
+            status['api_status']['local_db'] = 'available'
+        else:
+            status['warnings'].append('Local breach index not built (python local_index.py build ...)')
+            status['api_status']['local_db'] = 'missing'
+    elif os.path.exists(DatabaseConfig.LOCAL_DB['file']):
         status['api_status']['local_db'] = 'available'
     else:
         status['warnings'].append('Local breach database not found')
@@ -172,6 +314,16 @@ def validate_config() -> Dict[str, Any]:
     # HIBP is always available
     status['api_status']['hibp'] = 'available'
     
+    # Offline Pwned Passwords index (optional)
+    pwned_file = DatabaseConfig.PWNED_PASSWORDS['file']
+    if not pwned_file:
+        status['api_status']['pwned_offline'] = 'not_configured'
+    elif os.path.exists(pwned_file):
+        status['api_status']['pwned_offline'] = 'available'
+    else:
+        status['warnings'].append('Offline Pwned Passwords index not found')
+        status['api_status']['pwned_offline'] = 'missing'
+    
     return status
 
 if __name__ == '__main__':
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Deadline (time budget) untuk satu request
+Deadline disimpan di contextvar sehingga ikut ke coroutine asyncio, dan
+ke thread executor bila task dijalankan lewat contextvars.copy_context().
+Semua waktu memakai time.monotonic().
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+class DeadlineExceeded(TimeoutError):
+    """Deadline request habis sebelum operasi selesai"""
+
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+def current_deadline() -> Optional[float]:
+    """Deadline absolut (monotonic) yang aktif, None bila tanpa batas"""
+    return _deadline.get()
+
+def remaining() -> Optional[float]:
+    """Sisa waktu (detik, minimal 0), None bila tanpa deadline"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+def expired() -> bool:
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+def cap_timeout(timeout: float) -> float:
+    """Timeout per operasi yang tidak melewati deadline"""
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Pasang deadline `seconds` dari sekarang; deadline luar yang lebih ketat tetap berlaku"""
+    if seconds is None:
+        yield current_deadline()
+        return
+    
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Konfigurasi gunicorn: gunicorn -c gunicorn.conf.py app:app
+(atau -k uvicorn.workers.UvicornWorker asgi:application untuk mode async)
+
+Metrik Prometheus multi-proses: setiap worker menulis ke PROMETHEUS_MULTIPROC_DIR
+dan /metrics di worker mana pun menggabungkan semuanya (metrics.py).
+"""
+
+import glob
+import multiprocessing
+import os
+import tempfile
+
+bind = f"{os.environ.get('FLASK_HOST', '0.0.0.0')}:{os.environ.get('FLASK_PORT', 5000)}"
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# Bulk NDJSON dan SSE bisa lama; deadline per request diatur di config.REQUEST_DEADLINES
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Harus di-set sebelum worker meng-import prometheus_client
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'breachchecker-metrics')
+)
+
+def on_starting(server):
+    """
+    Hapus file metrik run sebelumnya (counter lama akan ikut terjumlah),
+    peringatkan limit per client yang tidak dibagi antar worker, dan buat
+    varian .br/.gz aset statis sekali di master, bukan per worker
+    """
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    os.makedirs(path, exist_ok=True)
+    for db_file in glob.glob(os.path.join(path, '*.db')):
+        os.remove(db_file)
+    
+    from config import SecurityConfig
+    if (SecurityConfig.CLIENT_RATE_LIMIT_ENABLED and SecurityConfig.CLIENT_RATE_LIMIT_STORAGE != 'redis'
+            and server.cfg.workers > 1):
+        server.log.warning("Client rate limits use the per-process memory backend: each of the %d workers "
+                           "counts separately, so the effective limit is %dx RATE_LIMITS. "
+                           "Set CLIENT_RATE_LIMIT_STORAGE=redis to share them.",
+                           server.cfg.workers, server.cfg.workers)
+    
+    try:
+        from compression import precompress
+        result = precompress(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+        server.log.info("Precompressed %(variants)s static variants", result)
+    except (ImportError, OSError) as e:
+        server.log.warning("Static precompression skipped: %s", e)
+
+def child_exit(server, worker):
+    """Buang gauge live* milik worker yang mati (mis. in-flight requests)"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
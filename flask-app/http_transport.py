@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Transport HTTP bersama untuk semua API client sync
+Satu HTTPAdapter (satu urllib3 PoolManager) dipakai semua client dan thread,
+sehingga koneksi keep-alive per host dipakai ulang alih-alih di-handshake
+ulang per client. Setiap thread mendapat requests.Session sendiri (Session
+tidak thread-safe), tapi semuanya di-mount ke adapter yang sama.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import Config
+
+USER_AGENT = 'BreachChecker/1.0'
+
+class _PoolStatsMixin:
+    """Hitung saturasi (semua slot terpakai) dan koneksi yang dibuang karena pool penuh"""
+    
+    saturated = 0
+    discarded = 0
+    
+    def _get_conn(self, timeout=None):
+        if self.pool is not None and self.pool.empty():
+            self.saturated += 1
+        return super()._get_conn(timeout)
+    
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            self.discarded += 1
+        super()._put_conn(conn)
+
+class StatsHTTPConnectionPool(_PoolStatsMixin, HTTPConnectionPool):
+    pass
+
+class StatsHTTPSConnectionPool(_PoolStatsMixin, HTTPSConnectionPool):
+    pass
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter dengan pool class yang mencatat statistik"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': StatsHTTPConnectionPool,
+            'https': StatsHTTPSConnectionPool
+        }
+    
+    def get_stats(self) -> Dict:
+        """Statistik per host: koneksi dibuat vs request (reuse), slot terpakai, saturasi"""
+        hosts = {}
+        pools = self.poolmanager.pools
+        with pools.lock:
+            items = [(key, pools[key]) for key in pools.keys()]
+        
+        for key, pool in items:
+            queue = pool.pool
+            available = queue.qsize() if queue is not None else 0
+            idle = sum(1 for conn in list(queue.queue) if conn is not None) if queue is not None else 0
+            hosts[f'{key.key_scheme}://{key.key_host}:{key.key_port}'] = {
+                'connections_created': pool.num_connections,
+                'requests': pool.num_requests,
+                'reused': max(0, pool.num_requests - pool.num_connections),
+                'idle': idle,
+                'in_use': self._pool_maxsize - available,
+                'maxsize': self._pool_maxsize,
+                'saturated': pool.saturated,
+                'discarded': pool.discarded
+            }
+        
+        return {
+            'pool_connections': self._pool_connections,
+            'pool_maxsize': self._pool_maxsize,
+            'pool_block': self._pool_block,
+            'hosts': hosts
+        }
+
+_adapter: Optional[PooledHTTPAdapter] = None
+_adapter_lock = threading.Lock()
+_local = threading.local()
+
+def get_adapter() -> PooledHTTPAdapter:
+    """Adapter bersama (satu per proses)"""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            # max_retries=0: retry ditangani BaseAPIClient._make_request
+            _adapter = PooledHTTPAdapter(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+                pool_block=Config.HTTP_POOL_BLOCK,
+                max_retries=0
+            )
+        return _adapter
+
+def get_session() -> requests.Session:
+    """Session milik thread ini, di-mount ke adapter bersama"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        adapter = get_adapter()
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({'User-Agent': USER_AGENT})
+        _local.session = session
+    return session
+
+def get_stats() -> Dict:
+    """Statistik pool untuk /api/status"""
+    return get_adapter().get_stats()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+JSON provider Flask berbasis orjson, fallback ke json stdlib
+
+orjson meng-encode di C langsung ke bytes dan response dibuat dari bytes
+itu tanpa decode/encode ulang. datetime dan tipe lain di luar JSON tetap
+lewat default Flask (http_date, dataclass, Decimal, UUID) sehingga output
+sama dengan provider bawaan. Key tidak diurutkan: urutan insert dict sudah
+deterministik (ETag tetap stabil) dan sort hanya menambah CPU.
+
+Waktu encode setiap response dicatat ke metrik
+breachchecker_json_encode_seconds{endpoint} dan header Server-Timing.
+dumps() dipakai untuk body yang di-encode manual (NDJSON, SSE, ASGI).
+"""
+
+import json
+import time
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(obj):
+    """Aturan default Flask; tipe yang tetap tidak dikenal jadi str (NDJSON/SSE)"""
+    try:
+        return DefaultJSONProvider.default(obj)
+    except TypeError:
+        return str(obj)
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(obj) -> bytes:
+        """Encode compact ke bytes UTF-8"""
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+else:
+    def dumps(obj) -> bytes:
+        """Encode compact ke bytes UTF-8"""
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _observe_encode(response, seconds: float):
+    endpoint = request.url_rule.rule if has_request_context() and request.url_rule else 'unknown'
+    metrics.observe_json_encode(endpoint, seconds)
+    response.headers.add('Server-Timing', f'json;dur={seconds * 1000:.3f}')
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Provider bawaan (json stdlib) ditambah pengukuran waktu encode"""
+    
+    def response(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().response(*args, **kwargs)
+        _observe_encode(response, time.perf_counter() - started)
+        return response
+
+class OrjsonProvider(TimedJSONProvider):
+    """dumps/loads/response lewat orjson"""
+    
+    sort_keys = False
+    
+    def _options(self, indent: bool) -> int:
+        option = ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._options(bool(kwargs.get('indent')))).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        
+        started = time.perf_counter()
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        seconds = time.perf_counter() - started
+        
+        response = self._app.response_class(body, mimetype=self.mimetype)
+        _observe_encode(response, seconds)
+        return response
+
+def init_app(app) -> str:
+    """Pasang provider sesuai Config.JSON_PROVIDER; return nama provider yang aktif"""
+    if Config.JSON_PROVIDER == 'orjson' and orjson is not None:
+        provider, name = OrjsonProvider, 'orjson'
+    else:
+        provider, name = TimedJSONProvider, 'json'
+    app.json_provider_class = provider
+    app.json = provider(app)
+    return name
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Sharded on-disk hash index untuk database breach lokal yang sangat besar
+Email dinormalisasi lalu di-hash (BLAKE2b 64-bit), dibagi ke shard berdasarkan
+bit teratas hash, dan disimpan sebagai array uint64 terurut. Lookup memakai
+bisect di atas mmap; Bloom filter opsional di depan menjawab sebagian besar
+lookup "clean" tanpa menyentuh shard.
+
+Layout direktori index:
+    manifest.json          parameter index (shard bits, jumlah entry, Bloom)
+    shard-000.idx ...      uint64 terurut (byte order host saat build)
+    bloom.bin              bit array Bloom filter (opsional)
+
+Setiap build ditulis ke direktori versi baru (local_index.v<ns>) lalu
+symlink local_index dialihkan ke sana dengan satu rename atomik. Reader
+me-resolve symlink sekali dan mem-mmap semua file versinya saat dibuka,
+sehingga rebuild tidak pernah mencampur manifest lama dengan shard baru.
+
+Memori per 1 miliar entry:
+    shard (8 byte/entry)   ~8 GB di disk, di-mmap; hanya halaman yang disentuh
+                           yang resident, dan dibagi antar worker via page cache
+    Bloom filter           m/n = -ln(p) / ln(2)^2 bit per entry:
+                           p=1%   -> 9.6 bit  (~1.2 GB), k=7
+                           p=0.1% -> 14.4 bit (~1.8 GB), k=10
+    heap Python            praktis nol (hanya mmap + manifest)
+    collision hash 64-bit  ~n / 2^64 per lookup (~5e-11 untuk 1 miliar entry)
+
+Build:
+    python local_index.py build local_breaches.txt local_index/ --fpr 0.01
+    python local_index.py lookup local_index/ user@example.com
+    python local_index.py info local_index/
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import math
+import mmap
+import os
+import shutil
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional
+
+INDEX_VERSION = 1
+MASK64 = (1 << 64) - 1
+SHARD_BUFFER_BYTES = 1 << 20
+
+def normalize_email(email: str, case_sensitive: bool = False) -> str:
+    """Normalisasi yang sama untuk build dan lookup"""
+    email = email.strip()
+    return email if case_sensitive else email.lower()
+
+def email_key(normalized: str) -> int:
+    """Hash 64-bit dari email yang sudah dinormalisasi"""
+    digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=8,
+                             person=b'breachchecker').digest()
+    return int.from_bytes(digest, 'big')
+
+def _mix64(value: int) -> int:
+    """Finalizer splitmix64, sumber hash kedua untuk double hashing Bloom"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+def bloom_parameters(entries: int, fpr: float) -> Dict:
+    """Ukuran bit array dan jumlah hash optimal untuk false-positive rate `fpr`"""
+    entries = max(1, entries)
+    bits = max(64, math.ceil(-entries * math.log(fpr) / (math.log(2) ** 2)))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / entries * math.log(2)))
+    return {'bits': bits, 'hashes': hashes, 'fpr': fpr}
+
+def _bloom_positions(key: int, bits: int, hashes: int) -> Iterable[int]:
+    step = _mix64(key) | 1
+    for i in range(hashes):
+        yield (key + i * step) % bits
+
+class ShardedEmailIndex:
+    """
+    Read-only index hasil `build`; aman dipakai banyak thread. Semua shard
+    di-mmap saat dibuka, jadi objek ini tetap konsisten walaupun index
+    di-rebuild atau direktori versinya dihapus.
+    """
+    
+    def __init__(self, index_dir: str, case_sensitive: Optional[bool] = None):
+        self.index_dir = index_dir
+        # Resolve symlink sekali: semua file dibaca dari versi yang sama
+        self.path = os.path.realpath(index_dir)
+        with open(os.path.join(self.path, 'manifest.json'), 'r', encoding='utf-8') as f:
+            stat = os.fstat(f.fileno())
+            self.manifest = json.load(f)
+        
+        if self.manifest.get('version') != INDEX_VERSION:
+            raise ValueError(f'Unsupported local index version in {index_dir}')
+        if self.manifest.get('byteorder') != sys.byteorder:
+            raise ValueError(f'Local index {index_dir} was built on a {self.manifest.get("byteorder")}-endian host')
+        if case_sensitive is not None and self.manifest.get('case_sensitive') != case_sensitive:
+            raise ValueError(f'Local index {index_dir} was built with case_sensitive='
+                             f'{self.manifest.get("case_sensitive")}, rebuild it with the current setting')
+        
+        self.key = (stat.st_mtime_ns, stat.st_size)
+        self.shard_bits = self.manifest['shard_bits']
+        self._shift = 64 - self.shard_bits
+        self._maps = []
+        self._shards = [self._map_shard(shard_id) for shard_id in range(1 << self.shard_bits)]
+        
+        self._bloom = None
+        bloom = self.manifest.get('bloom')
+        if bloom:
+            self._bloom_bits = bloom['bits']
+            self._bloom_hashes = bloom['hashes']
+            self._bloom = self._map(os.path.join(self.path, 'bloom.bin'))
+        
+        self.stats = {
+            'lookups': 0,
+            'bloom_rejects': 0,
+            'index_probes': 0
+        }
+    
+    def _map(self, path: str):
+        """mmap read-only; file kosong dipetakan ke buffer kosong"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+    
+    def _map_shard(self, shard_id: int):
+        """View uint64 untuk satu shard"""
+        mapped = self._map(os.path.join(self.path, f'shard-{shard_id:03x}.idx'))
+        return memoryview(mapped).cast('Q') if mapped else ()
+    
+    def _bloom_contains(self, key: int) -> bool:
+        bloom = self._bloom
+        for position in _bloom_positions(key, self._bloom_bits, self._bloom_hashes):
+            if not bloom[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def __contains__(self, normalized: str) -> bool:
+        key = email_key(normalized)
+        self.stats['lookups'] += 1
+        if self._bloom is not None and not self._bloom_contains(key):
+            self.stats['bloom_rejects'] += 1
+            return False
+        
+        self.stats['index_probes'] += 1
+        view = self._shards[key >> self._shift]
+        position = bisect_left(view, key)
+        return position < len(view) and view[position] == key
+    
+    def __len__(self) -> int:
+        return self.manifest['entries']
+    
+    def get_stats(self) -> Dict:
+        bloom = self.manifest.get('bloom')
+        return {
+            'engine': 'sharded',
+            'index_dir': self.index_dir,
+            'index_version': os.path.basename(self.path),
+            'total_emails': self.manifest.get('source_lines'),
+            'unique_emails': self.manifest['entries'],
+            'file_size': self.manifest['entries'] * 8 + (bloom['bits'] // 8 if bloom else 0),
+            'last_modified': self.manifest.get('built_at'),
+            'shards': 1 << self.shard_bits,
+            'bloom': bloom,
+            **self.stats
+        }
+
+def _flush_shard(tmp_dir: str, shard_id: int, buffer: bytearray):
+    with open(os.path.join(tmp_dir, f'shard-{shard_id:03x}.tmp'), 'ab') as f:
+        f.write(buffer)
+    buffer.clear()
+
+def _versions(index_dir: str):
+    """Direktori versi milik `index_dir`, terlama dulu (nama = waktu build dalam hex)"""
+    return sorted(glob.glob(f'{glob.escape(index_dir)}.v*'))
+
+def _switch(index_dir: str, version_dir: str):
+    """Alihkan symlink `index_dir` ke `version_dir` secara atomik"""
+    link_tmp = f'{index_dir}.link-{os.getpid()}'
+    if os.path.lexists(link_tmp):
+        os.remove(link_tmp)
+    os.symlink(os.path.basename(version_dir), link_tmp)
+    
+    if os.path.isdir(index_dir) and not os.path.islink(index_dir):
+        # Index lama berupa direktori biasa: satu kali dipindah ke nama versi
+        os.rename(index_dir, f'{index_dir}.v0')
+    os.replace(link_tmp, index_dir)
+
+def build(source: str, index_dir: str, fpr: Optional[float] = 0.01, shard_bits: int = 8,
+          case_sensitive: bool = False, encoding: str = 'utf-8') -> Dict:
+    """
+    Bangun index dari file teks satu email per baris (format local_breaches.txt).
+    
+    Pass 1 mendistribusikan hash ke file sementara per shard (memori dibatasi
+    buffer per shard), pass 2 mengurutkan + dedupe tiap shard secara terpisah
+    (memori puncak ~ satu shard), pass 3 mengisi Bloom filter dari shard final.
+    Hasil ditulis ke direktori versi baru lalu symlink `index_dir` dialihkan.
+    """
+    if not 1 <= shard_bits <= 12:
+        raise ValueError('shard_bits must be between 1 and 12')
+    
+    index_dir = index_dir.rstrip(os.sep)
+    tmp_dir = f'{index_dir}.v{time.time_ns():x}'
+    os.makedirs(tmp_dir)
+    try:
+        manifest = _build_into(tmp_dir, source, shard_bits, fpr, case_sensitive, encoding)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    
+    _switch(index_dir, tmp_dir)
+    # Versi sebelumnya disimpan untuk reader yang sedang membuka index saat
+    # switch; versi yang lebih tua dari itu sudah tidak bisa dirujuk siapa pun
+    for old_dir in _versions(index_dir)[:-2]:
+        if old_dir != tmp_dir:
+            shutil.rmtree(old_dir, ignore_errors=True)
+    
+    return manifest
+
+def _build_into(tmp_dir: str, source: str, shard_bits: int, fpr: Optional[float],
+                case_sensitive: bool, encoding: str) -> Dict:
+    shard_count = 1 << shard_bits
+    shift = 64 - shard_bits
+    
+    # Pass 1: hash + distribusi ke shard
+    buffers = [bytearray() for _ in range(shard_count)]
+    source_lines = 0
+    with open(source, 'rb') as f:
+        for raw in f:
+            source_lines += 1
+            email = normalize_email(raw.decode(encoding, errors='replace'), case_sensitive)
+            if not email:
+                continue
+            key = email_key(email)
+            shard_id = key >> shift
+            buffer = buffers[shard_id]
+            buffer += key.to_bytes(8, sys.byteorder)
+            if len(buffer) >= SHARD_BUFFER_BYTES:
+                _flush_shard(tmp_dir, shard_id, buffer)
+        # Baris yang ditambahkan setelah build dibaca client sebagai overlay
+        source_size = f.tell()
+    for shard_id, buffer in enumerate(buffers):
+        _flush_shard(tmp_dir, shard_id, buffer)
+    del buffers
+    
+    # Pass 2: sort + dedupe per shard
+    entries = 0
+    for shard_id in range(shard_count):
+        tmp_path = os.path.join(tmp_dir, f'shard-{shard_id:03x}.tmp')
+        keys = array('Q')
+        with open(tmp_path, 'rb') as f:
+            keys.frombytes(f.read())
+        os.remove(tmp_path)
+        
+        keys = array('Q', sorted(set(keys)))
+        entries += len(keys)
+        with open(os.path.join(tmp_dir, f'shard-{shard_id:03x}.idx'), 'wb') as f:
+            keys.tofile(f)
+    
+    # Pass 3: Bloom filter
+    bloom = None
+    if fpr:
+        bloom = bloom_parameters(entries, fpr)
+        bits = bytearray(bloom['bits'] // 8)
+        for shard_id in range(shard_count):
+            keys = array('Q')
+            with open(os.path.join(tmp_dir, f'shard-{shard_id:03x}.idx'), 'rb') as f:
+                keys.frombytes(f.read())
+            for key in keys:
+                for position in _bloom_positions(key, bloom['bits'], bloom['hashes']):
+                    bits[position >> 3] |= 1 << (position & 7)
+        with open(os.path.join(tmp_dir, 'bloom.bin'), 'wb') as f:
+            f.write(bits)
+        del bits
+    
+    manifest = {
+        'version': INDEX_VERSION,
+        'hash': 'blake2b-64',
+        'byteorder': sys.byteorder,
+        'shard_bits': shard_bits,
+        'entries': entries,
+        'source': os.path.abspath(source),
+        'source_lines': source_lines,
+        'source_size': source_size,
+        'case_sensitive': case_sensitive,
+        'bloom': bloom,
+        'built_at': time.time()
+    }
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    return manifest
+
+def main(argv=None):
+    from config import DatabaseConfig
+    
+    parser = argparse.ArgumentParser(description='Sharded local breach index')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build_cmd = commands.add_parser('build', help='Build index from one-email-per-line file')
+    build_cmd.add_argument('source')
+    build_cmd.add_argument('index_dir')
+    build_cmd.add_argument('--fpr', type=float, default=0.01,
+                           help='Bloom filter false-positive rate (default 0.01)')
+    build_cmd.add_argument('--no-bloom', action='store_true', help='Skip the Bloom filter')
+    build_cmd.add_argument('--shard-bits', type=int, default=8, help='2^bits shards (default 8)')
+    
+    lookup_cmd = commands.add_parser('lookup', help='Check one email')
+    lookup_cmd.add_argument('index_dir')
+    lookup_cmd.add_argument('email')
+    
+    info_cmd = commands.add_parser('info', help='Show index statistics')
+    info_cmd.add_argument('index_dir')
+    
+    args = parser.parse_args(argv)
+    case_sensitive = DatabaseConfig.LOCAL_DB['case_sensitive']
+    
+    if args.command == 'build':
+        print(f"🔨 Building {args.index_dir} from {args.source}...")
+        started = time.time()
+        manifest = build(args.source, args.index_dir,
+                         fpr=None if args.no_bloom else args.fpr,
+                         shard_bits=args.shard_bits,
+                         case_sensitive=case_sensitive,
+                         encoding=DatabaseConfig.LOCAL_DB['encoding'])
+        print(f"✅ {manifest['entries']:,} unique emails indexed in {time.time() - started:.1f}s")
+    elif args.command == 'lookup':
+        index = ShardedEmailIndex(args.index_dir, case_sensitive)
+        print(normalize_email(args.email, case_sensitive) in index)
+    elif args.command == 'info':
+        index = ShardedEmailIndex(args.index_dir)
+        for key, value in index.get_stats().items():
+            print(f"{key}: {value}")
+
+if __name__ == '__main__':
+    sys.exit(main())
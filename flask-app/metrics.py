@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrics
+Latency per route dan endpoint /metrics berasal dari prometheus-flask-exporter;
+metrik upstream, cache, rate limiter, in-flight dan local DB didefinisikan di
+sini. Bila PROMETHEUS_MULTIPROC_DIR di-set (gunicorn multi-worker, lihat
+gunicorn.conf.py) setiap proses menulis ke file sendiri dan /metrics di worker
+mana pun menggabungkan semuanya. Tanpa prometheus_client semua fungsi no-op.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from config import Config
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:
+    Counter = Gauge = Histogram = None
+
+try:
+    from prometheus_flask_exporter import PrometheusMetrics
+    from prometheus_flask_exporter.multiprocess import GunicornInternalPrometheusMetrics
+except ImportError:
+    PrometheusMetrics = GunicornInternalPrometheusMetrics = None
+
+ENABLED = Config.ENABLE_METRICS and Histogram is not None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+WAIT_BUCKETS = (0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOKUP_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 0.001, 0.005, 0.01, 0.05)
+ENCODE_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 0.001, 0.0025, 0.005, 0.01, 0.05)
+
+if ENABLED:
+    UPSTREAM_SECONDS = Histogram(
+        'breachchecker_upstream_request_seconds',
+        'Upstream HTTP request latency per attempt',
+        ['source', 'status'], buckets=LATENCY_BUCKETS
+    )
+    SOURCE_CHECK_SECONDS = Histogram(
+        'breachchecker_source_check_seconds',
+        'Per-source check duration including cache, rate limiting and retries',
+        ['source', 'status'], buckets=LATENCY_BUCKETS
+    )
+    CACHE_LOOKUPS = Counter(
+        'breachchecker_cache_lookups_total',
+        'Cache lookups by result (hit ratio = hit / (hit + miss))',
+        ['cache', 'result']
+    )
+    RATE_LIMIT_WAIT_SECONDS = Histogram(
+        'breachchecker_rate_limit_wait_seconds',
+        'Time spent waiting for an upstream rate limiter token',
+        ['limiter'], buckets=WAIT_BUCKETS
+    )
+    RATE_LIMIT_REJECTED = Counter(
+        'breachchecker_rate_limit_rejected_total',
+        'Requests rejected because the rate limiter wait exceeded max_wait',
+        ['limiter']
+    )
+    IN_FLIGHT = Gauge(
+        'breachchecker_in_flight_requests',
+        'Requests currently being served',
+        ['endpoint'], multiprocess_mode='livesum'
+    )
+    ASYNC_REQUEST_SECONDS = Histogram(
+        'breachchecker_async_request_seconds',
+        'Latency of endpoints served natively by asgi.py',
+        ['path', 'status'], buckets=LATENCY_BUCKETS
+    )
+    LOCAL_DB_LOOKUP_SECONDS = Histogram(
+        'breachchecker_local_db_lookup_seconds',
+        'Local breach database membership lookup time',
+        ['engine'], buckets=LOOKUP_BUCKETS
+    )
+    JSON_ENCODE_SECONDS = Histogram(
+        'breachchecker_json_encode_seconds',
+        'Time spent serializing JSON response bodies',
+        ['endpoint'], buckets=ENCODE_BUCKETS
+    )
+
+def observe_upstream(source: str, status: Optional[int], seconds: float):
+    """Satu percobaan HTTP ke upstream; status None = exception (timeout, koneksi)"""
+    if ENABLED:
+        UPSTREAM_SECONDS.labels(source, str(status) if status is not None else 'error').observe(seconds)
+
+def observe_source_check(source: str, status: Optional[str], seconds: float):
+    """Hasil akhir satu sumber dalam fan-out (found, clean, timed_out, ...)"""
+    if ENABLED:
+        SOURCE_CHECK_SECONDS.labels(source, status or 'unknown').observe(seconds)
+
+def count_cache_lookup(cache: str, hit: bool):
+    if ENABLED:
+        CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+def observe_rate_limit(limiter: str, wait: Optional[float]):
+    """Token diambil setelah `wait` detik; None = ditolak"""
+    if not ENABLED:
+        return
+    if wait is None:
+        RATE_LIMIT_REJECTED.labels(limiter).inc()
+    else:
+        RATE_LIMIT_WAIT_SECONDS.labels(limiter).observe(wait)
+
+def observe_local_lookup(engine: str, seconds: float):
+    if ENABLED:
+        LOCAL_DB_LOOKUP_SECONDS.labels(engine).observe(seconds)
+
+def observe_json_encode(endpoint: str, seconds: float):
+    """Waktu encode satu body JSON (json_provider.py)"""
+    if ENABLED:
+        JSON_ENCODE_SECONDS.labels(endpoint).observe(seconds)
+
+@contextmanager
+def track_async_request(path: str):
+    """In-flight dan latency untuk route native asgi.py; yield dict untuk status response"""
+    response = {'status': 500}
+    if not ENABLED:
+        yield response
+        return
+    
+    started = time.perf_counter()
+    with IN_FLIGHT.labels(path).track_inprogress():
+        try:
+            yield response
+        finally:
+            ASYNC_REQUEST_SECONDS.labels(path, str(response['status'])).observe(time.perf_counter() - started)
+
+def init_app(app):
+    """
+    Pasang /metrics dan histogram latency per route (prometheus-flask-exporter)
+    serta gauge in-flight per route. Return exporter, None bila tidak aktif.
+    """
+    if not ENABLED or PrometheusMetrics is None:
+        return None
+    
+    from flask import g, request
+    
+    # group_by url_rule: /api/breach/<id> satu label, bukan satu per id
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        exporter = GunicornInternalPrometheusMetrics(app, path=Config.METRICS_PATH, group_by='url_rule')
+    else:
+        exporter = PrometheusMetrics(app, path=Config.METRICS_PATH, group_by='url_rule')
+    
+    @app.before_request
+    def _track_in_flight():
+        if request.url_rule is not None and request.url_rule.rule != Config.METRICS_PATH:
+            g.metrics_endpoint = request.url_rule.rule
+            IN_FLIGHT.labels(g.metrics_endpoint).inc()
+    
+    @app.teardown_request
+    def _untrack_in_flight(error=None):
+        # Response streaming (NDJSON, SSE): teardown baru jalan setelah stream selesai
+        endpoint = g.pop('metrics_endpoint', None)
+        if endpoint is not None:
+            IN_FLIGHT.labels(endpoint).dec()
+    
+    return exporter
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Representasi ringkas payload HIBP /range/{prefix}
+Payload di-parse sekali menjadi blob suffix fixed-width yang terurut dan
+array count paralel; lookup berikutnya cukup bisect tanpa split string.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Union
+
+# SUFFIX:COUNT, 35 hex uppercase per baris
+_LINE = re.compile(rb'([0-9A-Fa-f]{35}):(\d+)')
+
+class _SuffixView:
+    """Sequence read-only atas blob suffix, supaya bisa dipakai bisect"""
+    
+    __slots__ = ('_blob', '_width', '_length')
+    
+    def __init__(self, blob: bytes, width: int):
+        self._blob = blob
+        self._width = width
+        self._length = len(blob) // width
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index: int) -> bytes:
+        start = index * self._width
+        return self._blob[start:start + self._width]
+
+class PasswordRange:
+    """Suffix terurut + count untuk satu prefix SHA-1"""
+    
+    SUFFIX_LEN = 35
+    
+    __slots__ = ('_suffixes', '_counts')
+    
+    def __init__(self, suffixes: bytes, counts: array):
+        self._suffixes = _SuffixView(suffixes, self.SUFFIX_LEN)
+        self._counts = counts
+    
+    @classmethod
+    def parse(cls, payload: Union[bytes, str]) -> 'PasswordRange':
+        """Parse body response range; entry padding (count 0) dibuang"""
+        if isinstance(payload, str):
+            payload = payload.encode('ascii', errors='ignore')
+        
+        entries = [
+            (suffix.upper(), int(count))
+            for suffix, count in _LINE.findall(payload)
+            if count != b'0'
+        ]
+        entries.sort()
+        
+        return cls(
+            b''.join(suffix for suffix, _ in entries),
+            array('Q', (count for _, count in entries))
+        )
+    
+    def lookup(self, suffix: str) -> int:
+        """Jumlah kemunculan untuk suffix 35 hex (0 bila tidak ada)"""
+        key = suffix.upper().encode('ascii')
+        index = bisect_left(self._suffixes, key)
+        if index < len(self._suffixes) and self._suffixes[index] == key:
+            return self._counts[index]
+        return 0
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    @property
+    def nbytes(self) -> int:
+        """Perkiraan memori (untuk batas ukuran cache)"""
+        return len(self._counts) * (self.SUFFIX_LEN + self._counts.itemsize)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Offline Pwned Passwords lookup engine
+Corpus SHA-1 HIBP (HASH:COUNT) dikonversi ke file biner terurut lalu di-lookup
+dengan binary search di atas mmap. File dibagi antar worker gunicorn lewat
+page cache OS, tidak di-load terpisah per worker. Build baru menggantikan file
+secara atomik; worker me-map ulang begitu inode/mtime berubah (di-stat paling
+sering sekali per `reload_check_interval`).
+
+Format file:
+    header   32 bytes  magic, version, record size, jumlah record
+    index    (2^20 + 1) x uint64 LE  posisi record pertama per prefix 5-hex
+    records  N x (20 byte SHA-1 + uint32 LE count), terurut by hash
+
+Usage:
+    python pwned_offline.py build pwnedpasswords.txt pwned.bin
+    python pwned_offline.py build pwnedpasswords_dir/ pwned.bin
+    python pwned_offline.py lookup pwned.bin <sha1>
+    python pwned_offline.py info pwned.bin
+"""
+
+import argparse
+import array
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from config import DatabaseConfig
+
+MAGIC = b'HIBPSHA1'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQ8x')
+RECORD = struct.Struct('<20sI')
+PREFIX_BITS = 20
+PREFIX_COUNT = 1 << PREFIX_BITS
+INDEX_ENTRY = struct.Struct('<Q')
+INDEX_OFFSET = HEADER.size
+RECORDS_OFFSET = INDEX_OFFSET + INDEX_ENTRY.size * (PREFIX_COUNT + 1)
+MAX_COUNT = 0xFFFFFFFF
+
+class PwnedPasswordsFile:
+    """Read-only lookup di atas file biner hasil `build`"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, record_size, self.records = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f'Not a Pwned Passwords index file: {path}')
+        
+        expected = RECORDS_OFFSET + self.records * RECORD.size
+        if len(self._mm) != expected:
+            self._mm.close()
+            raise ValueError(f'Truncated Pwned Passwords index file: {path}')
+    
+    def _block(self, prefix: int) -> Tuple[int, int]:
+        """Rentang record [lo, hi) untuk prefix 20-bit"""
+        offset = INDEX_OFFSET + prefix * INDEX_ENTRY.size
+        return struct.unpack_from('<QQ', self._mm, offset)
+    
+    def lookup_digest(self, digest: bytes) -> int:
+        """Jumlah kemunculan untuk SHA-1 digest 20 byte (0 bila tidak ada)"""
+        prefix = int.from_bytes(digest[:3], 'big') >> 4
+        lo, hi = self._block(prefix)
+        mm = self._mm
+        
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = RECORDS_OFFSET + mid * RECORD.size
+            current = mm[offset:offset + 20]
+            if current < digest:
+                lo = mid + 1
+            elif current > digest:
+                hi = mid
+            else:
+                return RECORD.unpack_from(mm, offset)[1]
+        return 0
+    
+    def lookup(self, sha1_hex: str) -> int:
+        """Jumlah kemunculan untuk SHA-1 hex (case insensitive)"""
+        return self.lookup_digest(bytes.fromhex(sha1_hex))
+    
+    def get_stats(self) -> Dict:
+        return {
+            'file': self.path,
+            'records': self.records,
+            'file_size': len(self._mm)
+        }
+    
+    def close(self):
+        self._mm.close()
+
+def _iter_text_file(path: str, prefix: str = '') -> Iterator[Tuple[bytes, int]]:
+    """Baca baris HASH:COUNT (atau SUFFIX:COUNT dengan `prefix`)"""
+    with open(path, 'r', encoding='ascii') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            hash_part, _, count_part = line.partition(':')
+            digest = bytes.fromhex(prefix + hash_part)
+            if len(digest) != 20:
+                raise ValueError(f'Invalid SHA-1 line in {path}: {line[:60]}')
+            yield digest, int(count_part or 0)
+
+def iter_corpus(source: str) -> Iterator[Tuple[bytes, int]]:
+    """
+    Iterasi corpus: satu file HASH:COUNT terurut (download "ordered by hash"),
+    atau direktori berisi file per prefix (00000.txt ... FFFFF.txt) hasil
+    PwnedPasswordsDownloader.
+    """
+    if not os.path.isdir(source):
+        yield from _iter_text_file(source)
+        return
+    
+    for name in sorted(os.listdir(source)):
+        stem, ext = os.path.splitext(name)
+        if len(stem) == 5 and ext.lower() == '.txt':
+            yield from _iter_text_file(os.path.join(source, name), stem.upper())
+
+def build(source: str, output: str, progress_every: int = 10_000_000) -> int:
+    """
+    Konversi corpus ke file biner terurut. Ditulis ke file sementara lalu
+    di-rename atomik supaya worker yang sedang membaca tidak terganggu.
+    """
+    tmp_path = f'{output}.tmp'
+    try:
+        records = _write_index(source, tmp_path, progress_every)
+        os.replace(tmp_path, output)
+    except BaseException:
+        # Corpus rusak/tidak terurut atau build dihentikan: jangan tinggalkan file sementara
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return records
+
+def _write_index(source: str, path: str, progress_every: int) -> int:
+    """Tulis file biner lengkap ke `path`; return jumlah record"""
+    index = [0] * (PREFIX_COUNT + 1)
+    records = 0
+    previous = b''
+    
+    with open(path, 'wb') as out:
+        out.seek(RECORDS_OFFSET)
+        for digest, count in iter_corpus(source):
+            if digest <= previous:
+                raise ValueError(
+                    'Corpus must be sorted by hash without duplicates '
+                    '(use the "ordered by hash" download or sort -t: -k1,1)'
+                )
+            previous = digest
+            index[(int.from_bytes(digest[:3], 'big') >> 4) + 1] += 1
+            out.write(RECORD.pack(digest, min(count, MAX_COUNT)))
+            records += 1
+            if progress_every and records % progress_every == 0:
+                print(f"  {records:,} hashes...")
+        
+        # Prefix counts -> posisi record pertama per prefix
+        for prefix in range(PREFIX_COUNT):
+            index[prefix + 1] += index[prefix]
+        
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, RECORD.size, records))
+        offsets = array.array('Q', index)
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        out.write(offsets.tobytes())
+        out.flush()
+        os.fsync(out.fileno())
+    return records
+
+class PwnedPasswordsStore:
+    """Memegang file index yang sedang di-map; map ulang bila file diganti"""
+    
+    def __init__(self, path: str, reload_check_interval: float = 5.0):
+        self.path = path
+        self.reload_check_interval = reload_check_interval
+        self._db: Optional[PwnedPasswordsFile] = None
+        self._key: Optional[Tuple[int, int, int]] = None  # (inode, mtime, size) saat map terakhir
+        self._reload_lock = threading.Lock()
+        self._last_stat_check = float('-inf')
+    
+    def get(self) -> Optional[PwnedPasswordsFile]:
+        """
+        File yang sedang di-map, None bila tidak ada. File hanya di-stat sekali
+        per interval; build baru (os.replace) memberi inode baru sehingga file
+        di-map ulang. mmap lama tidak ditutup: lookup yang sedang berjalan tetap
+        membacanya sampai objeknya dilepas. File rusak = map terakhir yang
+        valid tetap dipakai.
+        """
+        db = self._db
+        now = time.monotonic()
+        if now - self._last_stat_check < self.reload_check_interval:
+            return db
+        self._last_stat_check = now
+        
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        if self._key == key:
+            return db
+        
+        if not self._reload_lock.acquire(blocking=db is None):
+            return db
+        try:
+            if self._key != key:
+                self._db = self._open(key)
+                self._key = key
+            return self._db
+        finally:
+            self._reload_lock.release()
+    
+    def _open(self, key: Optional[Tuple[int, int, int]]) -> Optional[PwnedPasswordsFile]:
+        if key is None:
+            print(f"⚠️ Offline Pwned Passwords disabled: {self.path} not found")
+            return None
+        try:
+            return PwnedPasswordsFile(self.path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Offline Pwned Passwords {self.path} could not be loaded: {e}")
+            return self._db
+
+_store: Optional[PwnedPasswordsStore] = None
+_store_lock = threading.Lock()
+
+def get_pwned_passwords_db() -> Optional[PwnedPasswordsFile]:
+    """File offline dari DatabaseConfig.PWNED_PASSWORDS (store satu per proses), None bila tidak dipakai"""
+    global _store
+    settings = DatabaseConfig.PWNED_PASSWORDS
+    if not settings['file']:
+        return None
+    
+    with _store_lock:
+        if _store is None:
+            _store = PwnedPasswordsStore(settings['file'], settings['reload_check_interval'])
+    return _store.get()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline Pwned Passwords index')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build_cmd = commands.add_parser('build', help='Convert HASH:COUNT corpus to binary index')
+    build_cmd.add_argument('source', help='Sorted SHA-1 text file or per-prefix directory')
+    build_cmd.add_argument('output', help='Output index file')
+    
+    lookup_cmd = commands.add_parser('lookup', help='Lookup one SHA-1 hash')
+    lookup_cmd.add_argument('index')
+    lookup_cmd.add_argument('sha1')
+    
+    info_cmd = commands.add_parser('info', help='Show index statistics')
+    info_cmd.add_argument('index')
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'build':
+        print(f"🔨 Building {args.output} from {args.source}...")
+        records = build(args.source, args.output)
+        print(f"✅ {records:,} hashes written ({os.path.getsize(args.output):,} bytes)")
+    elif args.command == 'lookup':
+        db = PwnedPasswordsFile(args.index)
+        print(db.lookup(args.sha1))
+    elif args.command == 'info':
+        db = PwnedPasswordsFile(args.index)
+        for key, value in db.get_stats().items():
+            print(f"{key}: {value}")
+
+if __name__ == '__main__':
+    sys.exit(main())
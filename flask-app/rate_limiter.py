@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Token bucket rate limiter per sumber data (HIBP, DeHashed, IntelX)
+Menggantikan time.sleep(RATE_LIMIT_DELAY) setelah setiap request
+"""
+
+import asyncio
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+import metrics
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya backend memory yang tersedia
+    fcntl = None
+
+class TokenBucket:
+    """
+    Token bucket thread-safe untuk satu proses.
+    Token boleh "dipesan" sampai negatif sehingga caller yang menunggu
+    dilayani berurutan tanpa busy loop.
+    """
+    
+    def __init__(self, name: str, per_second: float, burst: int = 1):
+        self.name = name
+        self.rate = float(per_second)
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {
+            'acquired': 0,
+            'waited': 0,
+            'rejected': 0,
+            'wait_seconds': 0.0
+        }
+    
+    def _reserve(self, timeout: Optional[float]) -> Optional[float]:
+        """Ambil satu token; return lama tunggu, atau None bila melebihi timeout"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return None
+            self._tokens -= 1.0
+            return wait
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Tunggu sampai token tersedia (maksimal `timeout` detik)"""
+        wait = self._reserve(timeout)
+        if wait is None:
+            self._record(None)
+            return False
+        
+        if wait > 0:
+            time.sleep(wait)
+        self._record(wait)
+        return True
+    
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Versi asyncio dari acquire(): menunggu tanpa memblokir event loop"""
+        wait = self._reserve(timeout)
+        if wait is None:
+            self._record(None)
+            return False
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(wait)
+        return True
+    
+    def _record(self, wait: Optional[float]):
+        metrics.observe_rate_limit(self.name, wait)
+        with self._lock:
+            if wait is None:
+                self.stats['rejected'] += 1
+                return
+            self.stats['acquired'] += 1
+            if wait > 0:
+                self.stats['waited'] += 1
+                self.stats['wait_seconds'] += wait
+    
+    def get_stats(self) -> Dict:
+        """Statistik limiter untuk /api/status"""
+        return {
+            'name': self.name,
+            'backend': 'memory',
+            'per_second': self.rate,
+            'burst': int(self.capacity),
+            **self.stats,
+            'wait_seconds': round(self.stats['wait_seconds'], 3)
+        }
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket yang dibagi antar proses (mis. semua worker gunicorn).
+    State (tokens, timestamp) disimpan di file kecil dan dikunci dengan flock.
+    """
+    
+    _STATE = struct.Struct('<dd')
+    
+    def __init__(self, name: str, per_second: float, burst: int = 1,
+                 state_dir: Optional[str] = None):
+        super().__init__(name, per_second, burst)
+        state_dir = state_dir or Config.RATE_LIMIT_STATE_DIR
+        os.makedirs(state_dir, exist_ok=True)
+        self.state_file = os.path.join(state_dir, f'breachchecker-ratelimit-{name}.state')
+    
+    def _reserve(self, timeout: Optional[float]) -> Optional[float]:
+        # Lock thread dulu, baru flock antar proses
+        with self._lock:
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                now = time.time()
+                raw = os.pread(fd, self._STATE.size, 0)
+                if len(raw) == self._STATE.size:
+                    tokens, updated = self._STATE.unpack(raw)
+                    tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+                else:
+                    tokens = self.capacity
+                
+                wait = max(0.0, (1.0 - tokens) / self.rate)
+                if timeout is not None and wait > timeout:
+                    os.pwrite(fd, self._STATE.pack(tokens, now), 0)
+                    return None
+                os.pwrite(fd, self._STATE.pack(tokens - 1.0, now), 0)
+                return wait
+            finally:
+                os.close(fd)
+    
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats['backend'] = 'file'
+        return stats
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, settings: Optional[Dict] = None) -> TokenBucket:
+    """
+    Ambil limiter untuk sumber `name` (satu instance per proses).
+    `settings` biasanya APICredentials.<SOURCE>['rate_limit'].
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is not None:
+            return limiter
+        
+        settings = settings or {}
+        per_second = settings.get('per_second', 1.0 / Config.RATE_LIMIT_DELAY)
+        burst = settings.get('burst', 1)
+        
+        if Config.RATE_LIMIT_BACKEND == 'file' and fcntl is not None:
+            limiter = FileTokenBucket(name, per_second, burst)
+        else:
+            if Config.RATE_LIMIT_BACKEND == 'file':
+                print("⚠️ fcntl not available, falling back to in-memory rate limiter")
+            limiter = TokenBucket(name, per_second, burst)
+        
+        _limiters[name] = limiter
+        return limiter
+
+def get_all_stats() -> Dict[str, Dict]:
+    """Statistik semua limiter yang sudah dibuat"""
+    with _limiters_lock:
+        return {name: limiter.get_stats() for name, limiter in _limiters.items()}
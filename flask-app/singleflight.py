@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Single-flight request coalescing
+Lookup identik yang berjalan bersamaan (sumber + key sama) berbagi satu
+panggilan upstream; semua caller menerima hasil (atau exception) yang sama.
+Tidak ada caching: begitu panggilan selesai, key dilepas. Follower hanya
+menunggu selama deadline miliknya sendiri (DeadlineExceeded bila habis).
+
+Hasil yang sama (objek yang sama) diterima semua caller: perlakukan sebagai
+read-only atau salin dulu sebelum diubah.
+"""
+
+import asyncio
+import threading
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from deadline import DeadlineExceeded, remaining
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalescing untuk caller berbasis thread"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'shared': 0
+        }
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Jalankan `fn` sekali per key yang sedang in-flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['calls'] += 1
+            else:
+                self.stats['shared'] += 1
+        
+        if not leader:
+            if not call.done.wait(remaining()):
+                raise DeadlineExceeded(f'{self.name}: shared call did not finish before the request deadline')
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'name': self.name,
+                'in_flight': len(self._calls),
+                **self.stats
+            }
+
+class AsyncSingleFlight:
+    """
+    Coalescing untuk coroutine; key dipisah per event loop. Panggilan bersama
+    berjalan sebagai task sendiri dan setiap caller (termasuk yang memulainya)
+    menunggu lewat shield, jadi caller yang dibatalkan (mis. client disconnect)
+    tidak membatalkan caller lain.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {
+            'calls': 0,
+            'shared': 0
+        }
+    
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `factory()` sekali per key yang sedang in-flight"""
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        task = self._calls.get(key)
+        if task is not None:
+            self.stats['shared'] += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f'{self.name}: shared call did not finish before the request deadline')
+        
+        # Task mewarisi context caller pertama (termasuk deadline-nya)
+        task = self._calls[key] = loop.create_task(factory())
+        task.add_done_callback(partial(self._finished, key))
+        self.stats['calls'] += 1
+        return await asyncio.shield(task)
+    
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # tandai sudah diambil bila semua caller sudah pergi
+    
+    def get_stats(self) -> Dict:
+        return {
+            'name': self.name,
+            'in_flight': len(self._calls),
+            **self.stats
+        }
+
+_flights: Dict[str, Any] = {}
+_flights_lock = threading.Lock()
+
+def get_single_flight(name: str, use_async: bool = False):
+    """SingleFlight bersama per nama (satu per proses), seperti get_rate_limiter"""
+    registry_name = f'{name}:async' if use_async else name
+    with _flights_lock:
+        flight = _flights.get(registry_name)
+        if flight is None:
+            flight = AsyncSingleFlight(registry_name) if use_async else SingleFlight(registry_name)
+            _flights[registry_name] = flight
+        return flight
+
+def get_all_stats() -> Dict[str, Dict]:
+    """Statistik semua single-flight yang sudah dibuat"""
+    with _flights_lock:
+        return {name: flight.get_stats() for name, flight in _flights.items()}
@@ -11,6 +11,45 @@ export async function apiGetAccount(acct){
   return response.json();
 }
 
+// Server-Sent Events via fetch (POST, account tidak masuk URL/log).
+// onEvent(type, data) dipanggil untuk event start/source/summary; resolve dengan summary.
+export async function apiStreamAccount(acct, onEvent){
+  const response = await fetch(`${BASE_URL}/api/check-account/stream`, {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json', 'Accept': 'text/event-stream'},
+    body: JSON.stringify({account: acct})
+  });
+  if(!response.ok) throw new Error(`HTTP ${response.status}`);
+  
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '', summary = null;
+  for(;;){
+    const {value, done} = await reader.read();
+    if(done) break;
+    buffer += value;
+    let end;
+    while((end = buffer.indexOf('\n\n')) >= 0){
+      const event = parseSSE(buffer.slice(0, end));
+      buffer = buffer.slice(end + 2);
+      if(!event) continue;
+      if(event.type === 'error') throw new Error(event.data.error);
+      if(event.type === 'summary') summary = event.data;
+      onEvent?.(event.type, event.data);
+    }
+  }
+  if(!summary) throw new Error('Stream berakhir tanpa summary');
+  return summary;
+}
+
+function parseSSE(block){
+  let type = 'message', data = '';
+  for(const line of block.split('\n')){
+    if(line.startsWith('event:')) type = line.slice(6).trim();
+    else if(line.startsWith('data:')) data += line.slice(5).trim();
+  }
+  return data ? {type, data: JSON.parse(data)} : null;
+}
+
 export async function apiGetPasswordRange(prefix5){
   // Menggunakan HIBP API langsung untuk k-anonymity
   const res = await fetch(`https://api.pwnedpasswords.com/range/${prefix5.toUpperCase()}`, {
@@ -30,8 +69,14 @@ export async function apiCheckPassword(password){
   return response.json();
 }
 
-export async function apiListBreaches(){ 
-  return fetchJSON(`${BASE_URL}/api/breaches`); 
+// params: q, data_class, domain, sort, order, page, per_page (lihat /api/breaches).
+// Resolve dengan {items, total}; total dari header X-Total-Count.
+export async function apiListBreaches(params = {}){
+  const query = new URLSearchParams(Object.entries(params).filter(([, v]) => v !== '' && v != null));
+  const res = await fetch(`${BASE_URL}/api/breaches?${query}`, {headers:{'cache-control':'no-cache'}});
+  const items = await res.json();
+  if(!res.ok) throw new Error(items?.error || `HTTP ${res.status}`);
+  return {items, total: Number(res.headers.get('X-Total-Count') ?? items.length)};
 }
 
 export async function apiGetBreach(id){ 
@@ -1,4 +1,4 @@
-rimport { apiGetBreach } from './api.js';
+import { apiGetBreach } from './api.js';
 import { UI } from './ui.js';
 
 const box = document.getElementById('detail');
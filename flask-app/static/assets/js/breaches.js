@@ -5,25 +5,33 @@ const listBox = document.getElementById('breachList');
 const qInput  = document.getElementById('q');
 const fData   = document.getElementById('f-data');
 
-document.getElementById('btnSearch').addEventListener('click', render);
+const PER_PAGE = 50;
+let page = 1;
+
+document.getElementById('btnSearch').addEventListener('click', ()=>render());
 qInput.addEventListener('keydown', e=>{if(e.key==='Enter') render();});
-if(fData) fData.addEventListener('change', render);
+if(fData) fData.addEventListener('change', ()=>render());
 
 render();
 
-async function render(){
-  listBox.innerHTML = UI.skeleton(6, 72);
+// Filter dan pagination dikerjakan server; "Muat lagi" mengambil halaman berikutnya
+async function render(append = false){
+  page = append ? page + 1 : 1;
+  if(!append) listBox.innerHTML = UI.skeleton(6, 72);
+  listBox.querySelector('#more')?.remove();
   try{
-    const data = await apiListBreaches();
-    const q = (qInput?.value || '').trim().toLowerCase();
-    const f = fData?.value || '';
-    const filtered = data.filter(b=>{
-      const hay = `${b.Name||b.name} ${b.Title||b.title} ${(b.DataClasses||b.dataClasses||[]).join(' ')}`.toLowerCase();
-      const passQ = !q || hay.includes(q);
-      const passF = !f || (b.DataClasses||b.dataClasses||[]).includes(f);
-      return passQ && passF;
+    const {items, total} = await apiListBreaches({
+      q: (qInput?.value || '').trim(),
+      data_class: fData?.value || '',
+      page, per_page: PER_PAGE
     });
-    listBox.innerHTML = filtered.map(card).join('') || `<div class="small">Tidak ada hasil.</div>`;
+    const html = items.map(card).join('');
+    if(append) listBox.insertAdjacentHTML('beforeend', html);
+    else listBox.innerHTML = html || `<div class="small">Tidak ada hasil.</div>`;
+    if(page * PER_PAGE < total){
+      listBox.insertAdjacentHTML('beforeend', `<button id="more" class="btn" type="button">Muat lagi (${page * PER_PAGE}/${total})</button>`);
+      listBox.querySelector('#more').addEventListener('click', ()=>render(true));
+    }
   }catch(e){
     listBox.innerHTML = `<div class="small status-bad">Error: ${e}</div>`;
   }
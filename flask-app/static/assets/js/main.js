@@ -1,4 +1,4 @@
-import { apiGetAccount, apiGetPasswordRange, apiCheckPassword, apiNotify } from './api.js';
+import { apiGetAccount, apiStreamAccount, apiGetPasswordRange, apiCheckPassword, apiNotify } from './api.js';
 import { UI } from './ui.js';
 import { sha1Hex } from './hash.js';
 
@@ -14,9 +14,11 @@ async function onCheckAccount(){
   const acct = acctInput.value.trim();
   if(!acct) return UI.toast('Masukkan email/username.', 'warning');
   acctOut.innerHTML = UI.skeleton(3);
-  UI.loading('Check account…');
   try{
-    const data = await apiGetAccount(acct);
+    // Streaming: hasil tiap sumber tampil begitu selesai; fallback ke request biasa
+    const data = canStream()
+      ? await apiStreamAccount(acct, (type, payload) => renderProgress(type, payload))
+      : await loadingAccount(acct);
     UI.close();
     if(data.found){
       UI.alert('Ditemukan!', `Akun terdeteksi di breach database.`, 'error');
@@ -32,6 +34,44 @@ async function onCheckAccount(){
   }
 }
 
+function canStream(){
+  return typeof ReadableStream !== 'undefined' && typeof TextDecoderStream !== 'undefined';
+}
+
+async function loadingAccount(acct){
+  UI.loading('Check account…');
+  return apiGetAccount(acct);
+}
+
+function renderProgress(type, payload){
+  if(type === 'start'){
+    acctOut.innerHTML = `<div class="card"><h3>Checking ${payload.sources.length} sources…</h3><div id="acctProgress"></div></div>`;
+  } else if(type === 'source'){
+    document.getElementById('acctProgress')
+      ?.insertAdjacentHTML('beforeend', renderSourceRow(payload.source, payload.result));
+  }
+}
+
+function renderSourceRow(source, result){
+  if(result.found || result.pwned){
+    let html = `<div class="status-bad" style="margin: 10px 0; padding: 10px; border-left: 4px solid #e74c3c;">`;
+    html += `<strong>${source.toUpperCase()}</strong>: `;
+    if(result.message){
+      html += result.message;
+    } else if(result.total){
+      html += `Found in ${result.total} entries`;
+    } else {
+      html += 'Breach detected';
+    }
+    return html + '</div>';
+  }
+  if(!result.error){
+    return `<div class="status-ok" style="margin: 10px 0; padding: 10px; border-left: 4px solid #27ae60;">`
+      + `<strong>${source.toUpperCase()}</strong>: Clean</div>`;
+  }
+  return '';
+}
+
 function renderBreachResults(data){
   if(!data.found) return '<div class="small status-ok">✅ Tidak ditemukan.</div>';
   
@@ -41,22 +81,7 @@ function renderBreachResults(data){
   // Show results from each source
   if(data.sources){
     Object.entries(data.sources).forEach(([source, result]) => {
-      if(result.found || result.pwned){
-        html += `<div class="status-bad" style="margin: 10px 0; padding: 10px; border-left: 4px solid #e74c3c;">`;
-        html += `<strong>${source.toUpperCase()}</strong>: `;
-        if(result.message){
-          html += result.message;
-        } else if(result.total){
-          html += `Found in ${result.total} entries`;
-        } else {
-          html += 'Breach detected';
-        }
-        html += '</div>';
-      } else if(!result.error){
-        html += `<div class="status-ok" style="margin: 10px 0; padding: 10px; border-left: 4px solid #27ae60;">`;
-        html += `<strong>${source.toUpperCase()}</strong>: Clean`;
-        html += '</div>';
-      }
+      html += renderSourceRow(source, result);
     });
   }
   
@@ -64,9 +89,10 @@ function renderBreachResults(data){
     html += '<h4>Breach Details:</h4>';
     data.breaches.forEach(breach => {
       html += `<div style="margin: 5px 0; padding: 8px; background: rgba(231, 76, 60, 0.1); border-radius: 4px;">`;
-      html += `<strong>Source:</strong> ${breach.source}<br>`;
-      if(breach.data){
-        html += `<strong>Details:</strong> ${JSON.stringify(breach.data, null, 2)}`;
+      html += `<strong>Source:</strong> ${breach.source} (${breach.total})<br>`;
+      // Nama breach HIBP -> halaman detail katalog
+      if(breach.names?.length){
+        html += breach.names.map(name => `<a href="breach.html?id=${encodeURIComponent(name)}">${name}</a>`).join(', ');
       }
       html += '</div>';
     });
@@ -1,4 +1,4 @@
-const CACHE = 'bc-v2';
+const CACHE = 'bc-v6';
 const ASSETS = [
   'index.html','breaches.html','breach.html','stats.html',
   'assets/css/style.css',
@@ -14,12 +14,15 @@ self.addEventListener('activate', e=>{
 });
 self.addEventListener('fetch', e=>{
   const {request} = e; if(request.method!=='GET') return;
+  // Server-Sent Events jangan di-cache
+  if((request.headers.get('accept') || '').includes('text/event-stream')) return;
   e.respondWith(
     caches.match(request).then(cached=>{
       const fetcher = fetch(request).then(res=>{
         caches.open(CACHE).then(c=>c.put(request, res.clone()));
         return res;
-      }).catch(()=>cached);
+      // Offline: URL aset ber-fingerprint (?v=) jatuh ke versi precache tanpa query
+      }).catch(()=>cached || caches.match(request, {ignoreSearch: true}));
       return cached || fetcher;
     })
   );
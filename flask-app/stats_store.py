@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Statistik aplikasi yang persisten dan dibagi antar worker (DatabaseConfig.STATS)
+
+Hot path (incr/mark) hanya menulis ke shard milik thread sendiri, tanpa
+lock. Shard milik thread yang sudah selesai (executor bulk, thread per
+request dev server) digabung ke total dasar per proses lalu dilepas. Thread latar belakang mem-flush delta sejak flush terakhir setiap
+`update_interval` detik ke stats.json (flock + tulis atomik), sekaligus
+membaca total gabungan semua worker. totals() menjumlahkan total gabungan
+itu dengan delta lokal yang belum di-flush, tanpa I/O per request.
+
+History disimpan per bucket waktu (`history_bucket` detik); delta satu flush
+masuk ke bucket saat flush berjalan.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import DatabaseConfig
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa flock, hanya aman untuk satu proses
+    fcntl = None
+
+class StatsStore:
+    """Counter (dijumlah) dan mark (nilai maksimum, mis. timestamp) per proses"""
+    
+    def __init__(self, path: str, update_interval: float = 60.0, keep_history: bool = True,
+                 history_bucket: int = 3600, history_buckets: int = 168):
+        self.path = path
+        self.lock_path = f'{path}.lock'
+        self.update_interval = update_interval
+        self.keep_history = keep_history
+        self.history_bucket = history_bucket
+        self.history_buckets = history_buckets
+        
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+    
+    def _reset(self):
+        """State per proses; dipanggil lagi di child setelah fork (mis. gunicorn --preload)"""
+        self._registry_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        # (thread pemilik, counter, mark) per thread yang masih hidup
+        self._shards: List[Tuple[weakref.ref, Dict[str, float], Dict[str, float]]] = []
+        # Gabungan shard dari thread yang sudah selesai
+        self._base_counters: Dict[str, float] = {}
+        self._base_marks: Dict[str, float] = {}
+        # (isi file bersama, total counter lokal dan mark lokal saat flush itu);
+        # diganti sebagai satu tuple supaya totals() selalu melihat pasangan yang konsisten
+        self._view: Optional[Tuple[Dict, Dict[str, float], Dict[str, float]]] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+    
+    def _shard(self):
+        counters = getattr(self._local, 'counters', None)
+        if counters is None:
+            counters, marks = {}, {}
+            with self._registry_lock:
+                self._shards.append((weakref.ref(threading.current_thread()), counters, marks))
+                if self._flusher is None and self.update_interval > 0:
+                    self._flusher = threading.Thread(target=self._run, name='stats-flush', daemon=True)
+                    self._flusher.start()
+            self._local.counters, self._local.marks = counters, marks
+        return self._local.counters, self._local.marks
+    
+    def incr(self, name: str, amount: float = 1):
+        counters, _ = self._shard()
+        counters[name] = counters.get(name, 0) + amount
+    
+    def mark(self, name: str, value: Optional[float] = None):
+        """Simpan nilai terbesar (default: sekarang, epoch detik)"""
+        _, marks = self._shard()
+        value = time.time() if value is None else value
+        if value > marks.get(name, float('-inf')):
+            marks[name] = value
+    
+    def _fold_finished(self):
+        """Pindahkan shard thread yang sudah mati ke total dasar (registry lock dipegang)"""
+        alive = []
+        for entry in self._shards:
+            thread = entry[0]()
+            if thread is not None and thread.is_alive():
+                alive.append(entry)
+                continue
+            _, counters, marks = entry
+            for name, value in counters.items():
+                self._base_counters[name] = self._base_counters.get(name, 0) + value
+            for name, value in marks.items():
+                self._base_marks[name] = max(self._base_marks.get(name, value), value)
+        self._shards = alive
+    
+    def _local_totals(self):
+        """Jumlah semua shard; list() atas dict atomik di bawah GIL"""
+        with self._registry_lock:
+            self._fold_finished()
+            shards = list(self._shards)
+            counters, latest = dict(self._base_counters), dict(self._base_marks)
+        for _, shard, marks in shards:
+            for name, value in list(shard.items()):
+                counters[name] = counters.get(name, 0) + value
+            for name, value in list(marks.items()):
+                latest[name] = max(latest.get(name, value), value)
+        return counters, latest
+    
+    def _run(self):
+        while not self._stopped.wait(self.update_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Stats flush failed: {e}")
+    
+    def flush(self):
+        """Gabungkan delta proses ini ke file bersama dan segarkan view total"""
+        with self._flush_lock:
+            _, flushed, flushed_marks = self._view or ({}, {}, {})
+            counters, latest = self._local_totals()
+            deltas = {name: value - flushed.get(name, 0) for name, value in counters.items()}
+            deltas = {name: value for name, value in deltas.items() if value}
+            marks = {name: value for name, value in latest.items()
+                     if value > flushed_marks.get(name, float('-inf'))}
+            
+            with self._file_lock():
+                shared = self._read()
+                if deltas or marks:
+                    self._merge(shared, deltas, marks)
+                    self._write(shared)
+            
+            self._view = (shared, counters, latest)
+    
+    def _merge(self, shared: Dict, deltas: Dict[str, float], marks: Dict[str, float]):
+        totals = shared.setdefault('totals', {})
+        for name, value in deltas.items():
+            totals[name] = totals.get(name, 0) + value
+        
+        latest = shared.setdefault('marks', {})
+        for name, value in marks.items():
+            latest[name] = max(latest.get(name, value), value)
+        
+        if self.keep_history and deltas:
+            history = shared.setdefault('history', {})
+            bucket = str(int(time.time() // self.history_bucket * self.history_bucket))
+            entry = history.setdefault(bucket, {})
+            for name, value in deltas.items():
+                entry[name] = entry.get(name, 0) + value
+            for old in sorted(history, key=int)[:-self.history_buckets]:
+                del history[old]
+        
+        shared['updated_at'] = time.time()
+    
+    @contextmanager
+    def _file_lock(self):
+        """flock di file .lock terpisah (stats.json sendiri diganti lewat rename)"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+    
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            print(f"Stats file {self.path} is corrupt, starting from zero")
+            return {}
+    
+    def _write(self, data: Dict):
+        """Tulis ke file sementara lalu rename, pembaca tidak pernah melihat file setengah jadi"""
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+    
+    def _current_view(self) -> Tuple[Dict, Dict[str, float], Dict[str, float]]:
+        if self._view is None:
+            with self._flush_lock:
+                if self._view is None:
+                    self._view = (self._read(), {}, {})
+        return self._view
+    
+    def totals(self) -> Dict[str, float]:
+        """Total semua worker per flush terakhir + delta lokal yang belum di-flush"""
+        shared, flushed, _ = self._current_view()
+        counters, _ = self._local_totals()
+        totals = dict(shared.get('totals', {}))
+        for name, value in counters.items():
+            totals[name] = totals.get(name, 0) + value - flushed.get(name, 0)
+        return totals
+    
+    def marks(self) -> Dict[str, float]:
+        shared = self._current_view()[0]
+        _, latest = self._local_totals()
+        merged = dict(shared.get('marks', {}))
+        for name, value in latest.items():
+            merged[name] = max(merged.get(name, value), value)
+        return merged
+    
+    def history(self) -> List[Dict]:
+        """Bucket history (sudah di-flush), terlama dulu"""
+        history = self._current_view()[0].get('history', {})
+        return [
+            {
+                'start': datetime.fromtimestamp(int(bucket), timezone.utc).isoformat(),
+                **history[bucket]
+            }
+            for bucket in sorted(history, key=int)
+        ]
+    
+    def get_stats(self) -> Dict:
+        shared = self._current_view()[0]
+        return {
+            'file': self.path,
+            'update_interval': self.update_interval,
+            'keep_history': self.keep_history,
+            'last_flush': shared.get('updated_at'),
+            'threads': len(self._shards)
+        }
+
+_stores: Dict[str, StatsStore] = {}
+_stores_lock = threading.Lock()
+
+def get_stats_store(path: Optional[str] = None) -> StatsStore:
+    """StatsStore bersama per file (satu per proses), default dari DatabaseConfig.STATS"""
+    settings = DatabaseConfig.STATS
+    path = path or settings['file']
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = StatsStore(
+                path,
+                update_interval=settings['update_interval'],
+                keep_history=settings['keep_history'],
+                history_bucket=settings['history_bucket'],
+                history_buckets=settings['history_buckets']
+            )
+            _stores[path] = store
+        return store
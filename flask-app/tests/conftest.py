@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+# Harus diset sebelum config di-import: tanpa limit per client, statistik
+# dan state rate limiter di direktori sementara
+_state_dir = tempfile.mkdtemp(prefix='breachchecker-tests-')
+os.environ.setdefault('CLIENT_RATE_LIMIT_ENABLED', 'false')
+os.environ.setdefault('STATS_FILE', os.path.join(_state_dir, 'stats.json'))
+os.environ.setdefault('RATE_LIMIT_STATE_DIR', _state_dir)
+os.environ.setdefault('BREACH_CATALOG_FILE', os.path.join(_state_dir, 'breaches.json'))
+
+import pytest
+
+def _account_result(email: str, found: bool = False) -> dict:
+    return {
+        'email': email,
+        'timestamp': 1700000000.0,
+        'sources': {'local': {'found': found, 'status': 'found' if found else 'clean', 'source': 'LocalDB'}},
+        'timings_ms': {'local': 0.1},
+        'summary': {'found': found, 'total_breaches': int(found), 'sources_found': int(found)}
+    }
+
+@pytest.fixture
+def app_module():
+    import app
+    return app
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+@pytest.fixture
+def account_result():
+    """Pembuat hasil check_email tanpa memanggil sumber mana pun"""
+    return _account_result
+
+class FakeClock:
+    """Pengganti modul `time`: jam hanya maju lewat `now` atau sleep()"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def time(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """
+    FakeClock sebagai `time` di modul yang diuji, dipilih lewat parametrize:
+    pytestmark = pytest.mark.parametrize('clock', [modul], indirect=True)
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(request.param, 'time', clock)
+    return clock
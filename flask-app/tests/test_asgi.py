@@ -0,0 +1,13 @@
+def test_async_checker_shares_sync_state(app_module):
+    import asgi
+    
+    sync_checker = app_module.checker
+    assert asgi.checker.local_client.client is sync_checker.local_client
+    assert asgi.checker.hibp_client.range_cache is sync_checker.hibp_client.range_cache
+
+def test_standalone_async_checker_builds_its_own_clients():
+    from async_breach_checker import AsyncBreachChecker
+    
+    checker = AsyncBreachChecker()
+    assert checker.local_client.client is not None
+    assert checker.hibp_client.range_cache is not None
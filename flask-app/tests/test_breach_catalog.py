@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from breach_catalog import BreachCatalog, BreachCatalogStore, breach_refs
+
+ENTRIES = [
+    {'Name': 'Adobe', 'Title': 'Adobe', 'Domain': 'adobe.com', 'BreachDate': '2013-10-04',
+     'AddedDate': '2013-12-04T00:00:00Z', 'PwnCount': 152445165,
+     'DataClasses': ['Email addresses', 'Passwords'], 'IsVerified': True},
+    {'Name': 'LinkedIn', 'Title': 'LinkedIn', 'Domain': 'linkedin.com', 'BreachDate': '2012-05-05',
+     'AddedDate': '2016-05-21T21:35:40Z', 'PwnCount': 164611595,
+     'DataClasses': ['Email addresses', 'Passwords'], 'IsVerified': True},
+    {'Name': 'Collection1', 'Title': 'Collection #1', 'Domain': '', 'BreachDate': '2019-01-07',
+     'AddedDate': '2019-01-16T21:46:07Z', 'PwnCount': 772904991,
+     'DataClasses': ['Email addresses'], 'IsSpamList': True, 'Attribution': 'unknown'},
+    {'Name': 'adobe', 'Title': 'Duplicate'},
+    {'Title': 'Tanpa nama'}
+]
+
+@pytest.fixture
+def catalog() -> BreachCatalog:
+    return BreachCatalog(ENTRIES)
+
+def names(breaches) -> list:
+    return [breach.name for breach in breaches]
+
+def test_skips_duplicates_and_entries_without_name(catalog):
+    assert len(catalog) == 3
+    assert catalog.get(' ADOBE ').title == 'Adobe'
+    assert catalog.get('missing') is None
+
+def test_to_dict_round_trips_flags_and_unknown_fields(catalog):
+    entry = catalog.get('Collection1').to_dict()
+    assert entry['IsSpamList'] is True and entry['IsVerified'] is False
+    assert entry['Attribution'] == 'unknown'
+    assert entry['DataClasses'] == ['Email addresses']
+    # Tuple DataClasses yang sama dipakai bersama
+    assert catalog.get('Adobe').data_classes is catalog.get('LinkedIn').data_classes
+
+def test_query_sorts_by_column(catalog):
+    assert names(catalog.query()) == ['Collection1', 'Adobe', 'LinkedIn']
+    assert names(catalog.query(sort='pwn_count', order='asc')) == ['Adobe', 'LinkedIn', 'Collection1']
+    assert names(catalog.query(sort='name')) == ['Adobe', 'Collection1', 'LinkedIn']
+
+def test_query_combines_filters(catalog):
+    assert names(catalog.query(domain='LinkedIn.com')) == ['LinkedIn']
+    assert names(catalog.query(data_classes=['passwords'])) == ['Adobe', 'LinkedIn']
+    assert names(catalog.query(data_classes=['passwords'], since='2013-01-01')) == ['Adobe']
+    assert names(catalog.query(until='2013-10-04', sort='date', order='asc')) == ['LinkedIn', 'Adobe']
+    assert names(catalog.query(q='collection #')) == ['Collection1']
+    assert names(catalog.query(flags={'IsVerified': False})) == ['Collection1']
+    assert catalog.query(domain='unknown.example') == []
+
+def test_query_rejects_invalid_parameters(catalog):
+    with pytest.raises(ValueError):
+        catalog.query(sort='size')
+    with pytest.raises(ValueError):
+        catalog.query(order='up')
+    with pytest.raises(ValueError):
+        catalog.query(since='04-10-2013')
+
+def test_expand_and_breach_refs(catalog):
+    refs = breach_refs([{'Name': 'Adobe'}, 'LinkedIn', {'Name': 'Gone'}, {}])
+    assert refs == ['Adobe', 'LinkedIn', 'Gone']
+    assert list(catalog.expand(refs + ['Adobe'])) == ['Adobe', 'LinkedIn']
+
+def test_top_data_classes(catalog):
+    top = catalog.top_data_classes(limit=1)
+    assert top == [{'name': 'Email addresses', 'count': 3, 'accounts': catalog.total_accounts}]
+
+def test_store_reloads_changed_file_and_keeps_last_valid(tmp_path):
+    path = tmp_path / 'breaches.json'
+    store = BreachCatalogStore(str(path), reload_check_interval=0)
+    assert len(store.get()) == 0
+    
+    path.write_text(json.dumps(ENTRIES[:1]))
+    first = store.get()
+    assert names(first.query()) == ['Adobe']
+    assert store.get() is first
+    
+    path.write_text('{"not": "an array"}')
+    assert store.get() is first
+    
+    path.write_text(json.dumps(ENTRIES))
+    assert len(store.get()) == 3
+    assert store.get().etag != first.etag
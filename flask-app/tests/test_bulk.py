@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+def ndjson(response):
+    return [json.loads(line) for line in response.data.splitlines()]
+
+def test_bulk_streams_one_line_per_unique_account(client, app_module, account_result, monkeypatch):
+    monkeypatch.setattr(app_module.checker, '_bulk_check_email', account_result)
+    response = client.post('/api/check-accounts', json={'accounts': ['A@x.com', 'a@x.com ', 'b@x.com', '']})
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert sorted(line['account'] for line in ndjson(response)) == ['a@x.com', 'b@x.com']
+
+def test_bulk_limit_keeps_accepted_results(client, app_module, account_result, monkeypatch):
+    monkeypatch.setattr(app_module.checker, '_bulk_check_email', account_result)
+    monkeypatch.setattr(app_module.config_class, 'BULK_MAX_ACCOUNTS', 10)
+    upload = ''.join(f'user{i}@example.com\n' for i in range(20))
+    response = client.post('/api/check-accounts', data=upload, content_type='text/plain')
+    
+    lines = ndjson(response)
+    assert len(lines) == 11
+    assert sorted(line['account'] for line in lines[:-1]) == sorted(f'user{i}@example.com' for i in range(10))
+    assert lines[-1] == {'error': 'Maksimal 10 account per request'}
+
+def test_check_emails_iter_drains_before_input_error(app_module, account_result, monkeypatch):
+    checker = app_module.checker
+    monkeypatch.setattr(checker, '_bulk_check_email', account_result)
+    
+    def emails():
+        yield from (f'user{i}@example.com' for i in range(5))
+        raise RuntimeError('input closed')
+    
+    results = []
+    with pytest.raises(RuntimeError):
+        for result in checker.check_emails_iter(emails(), max_in_flight=2):
+            results.append(result['email'])
+    assert sorted(results) == [f'user{i}@example.com' for i in range(5)]
+
+def test_bulk_rejects_non_list(client):
+    response = client.post('/api/check-accounts', json={'accounts': 'a@x.com'})
+    assert response.status_code == 400
@@ -0,0 +1,54 @@
+import pytest
+
+import cache
+from cache import TTLCache
+
+pytestmark = pytest.mark.parametrize('clock', [cache], indirect=True)
+
+def test_entries_expire_after_ttl(clock):
+    store = TTLCache('test', ttl=10)
+    store.set('a', 1)
+    store.set('b', 2, ttl=60)
+    assert store.get('a') == 1
+    
+    clock.now += 10
+    assert store.get('a') is None
+    assert store.get('b') == 2
+    stats = store.get_stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+def test_expired_entry_can_be_revalidated(clock):
+    store = TTLCache('test', ttl=10)
+    store.set('range', 'body', etag='"v1"')
+    clock.now += 11
+    
+    stale = store.get_stale('range')
+    assert stale is not None and not stale.fresh and stale.etag == '"v1"'
+    assert store.revalidate('range') == 'body'
+    assert store.get('range') == 'body'
+    assert store.revalidate('missing') is None
+
+def test_evicts_least_recently_used_entry(clock):
+    store = TTLCache('test', ttl=10, max_entries=2)
+    store.set('a', 1)
+    store.set('b', 2)
+    store.get('a')
+    store.set('c', 3)
+    
+    assert store.get('b') is None
+    assert store.get('a') == 1 and store.get('c') == 3
+    assert store.get_stats()['evictions'] == 1
+
+def test_byte_limit_counts_overhead(clock):
+    store = TTLCache('test', ttl=10, max_bytes=2 * TTLCache.ENTRY_OVERHEAD + 150)
+    store.set('a', 'x', size=100)
+    store.set('b', 'y', size=100)
+    assert len(store) == 1 and store.get('b') == 'y'
+    
+    store.set('b', 'z', size=10)
+    assert store.get_stats()['bytes'] == TTLCache.ENTRY_OVERHEAD + 10
+
+def test_disabled_cache_stores_nothing(clock):
+    store = TTLCache('test', ttl=10, max_entries=0)
+    store.set('a', 1)
+    assert len(store) == 0 and store.get('a') is None
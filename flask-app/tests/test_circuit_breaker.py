@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+import async_api_clients
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+pytestmark = pytest.mark.parametrize('clock', [circuit_breaker], indirect=True)
+
+def make_breaker(**settings) -> CircuitBreaker:
+    params = dict(window_size=10, min_calls=4, failure_rate=0.5, open_seconds=30, half_open_calls=1)
+    params.update(settings)
+    return CircuitBreaker('test', **params)
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+
+def test_opens_on_failure_rate(clock):
+    breaker = make_breaker()
+    for success in (True, False, True):
+        assert breaker.allow()
+        breaker.record(success, 0.1)
+    assert breaker.state == CLOSED
+    
+    breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.get_stats()['rejected'] == 1
+
+def test_opens_on_slow_calls(clock):
+    breaker = make_breaker(slow_call_seconds=1.0, slow_call_rate=0.75)
+    for _ in range(4):
+        breaker.allow()
+        breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+def test_half_open_probe_closes_or_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # satu probe sekaligus
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.reliability() == 'unknown'
+
+def test_cancelled_probe_is_returned(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    
+    assert breaker.allow()
+    breaker.cancel()
+    assert breaker.allow()
+
+def test_abandoned_probe_expires(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    
+    assert breaker.allow()  # probe ini tidak pernah record/cancel
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+
+class HangingSession:
+    """aiohttp session palsu yang request-nya tidak pernah selesai"""
+    
+    def request(self, method, url, **kwargs):
+        return self
+    
+    async def __aenter__(self):
+        await asyncio.Event().wait()
+    
+    async def __aexit__(self, *exc):
+        return False
+
+def test_cancelled_async_request_releases_probe(clock, monkeypatch):
+    async def get_session():
+        return HangingSession()
+    monkeypatch.setattr(async_api_clients, 'get_session', get_session)
+    
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    client = async_api_clients.AsyncHIBPClient()
+    
+    async def scenario():
+        request = asyncio.ensure_future(
+            client._make_request('GET', 'https://example.invalid', rate_limited=False, circuit_breaker=breaker))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+    
+    asyncio.run(scenario())
+    assert breaker.allow()
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from flask import Flask, abort, jsonify, request
+
+import client_rate_limit
+from client_rate_limit import ClientRateLimiter, MemoryGCRAStore, evaluate
+from config import SecurityConfig
+
+def test_gcra_allows_burst_then_spaces_requests():
+    limits = [(5, 60)]
+    tats, now = [0.0], 100.0
+    for _ in range(5):
+        allowed, tats, _ = evaluate(limits, tats, now)
+        assert allowed
+    
+    allowed, _, retry_after = evaluate(limits, tats, now)
+    assert not allowed
+    assert retry_after == pytest.approx(12.0)
+    
+    allowed, _, _ = evaluate(limits, tats, now + 12.0)
+    assert allowed
+
+def test_gcra_checks_every_window():
+    limits = [(100, 60), (2, 3600)]
+    tats = [0.0, 0.0]
+    for _ in range(2):
+        allowed, tats, _ = evaluate(limits, tats, 100.0)
+        assert allowed
+    allowed, _, retry_after = evaluate(limits, tats, 100.0)
+    assert not allowed
+    assert retry_after == pytest.approx(1800.0)
+
+def test_cost_counts_as_several_requests():
+    allowed, _, _ = evaluate([(5, 60)], [0.0], 100.0, cost=5)
+    assert allowed
+    allowed, _, retry_after = evaluate([(5, 60)], [0.0], 100.0, cost=6)
+    assert not allowed
+    # Lebih dari satu burst: menunggu tidak akan membantu
+    assert retry_after == float('inf')
+
+def test_cost_above_limit_has_no_retry_after():
+    limiter = ClientRateLimiter({'per_minute': 5}, MemoryGCRAStore())
+    assert limiter.max_cost == 5
+    result = limiter.hit('1.2.3.4', cost=6)
+    assert not result.allowed
+    assert 'Retry-After' not in limiter.headers(result)
+    assert client_rate_limit.retry_after_seconds(result) is None
+
+def test_limiter_headers_report_tightest_window():
+    limiter = ClientRateLimiter({'per_minute': 3, 'per_hour': 100}, MemoryGCRAStore())
+    results = [limiter.hit('1.2.3.4') for _ in range(4)]
+    
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results[:3]] == [2, 1, 0]
+    headers = limiter.headers(results[-1])
+    assert headers['RateLimit-Limit'] == '3'
+    assert headers['RateLimit-Policy'] == '3;w=60, 100;w=3600'
+    assert int(headers['Retry-After']) >= 1
+    assert limiter.hit('5.6.7.8').allowed
+    assert limiter.get_stats()['scope'] == 'per_worker'
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryGCRAStore(max_keys=2)
+    limiter = ClientRateLimiter({'per_minute': 10}, store)
+    for client in ('a', 'b', 'c'):
+        limiter.hit(client)
+    assert len(store) == 2
+
+@pytest.fixture
+def limiter(app_module, monkeypatch):
+    # app di-import lebih dulu: hook before_request app tetap nonaktif (lihat conftest)
+    limiter = ClientRateLimiter({'per_minute': 5}, MemoryGCRAStore())
+    monkeypatch.setattr(SecurityConfig, 'CLIENT_RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(client_rate_limit, '_limiter', limiter)
+    return limiter
+
+def test_init_app_rejects_with_headers(limiter):
+    app = Flask(__name__)
+    client_rate_limit.init_app(app)
+    
+    @app.route('/api/ping')
+    def ping():
+        return jsonify({'ok': True})
+    
+    client = app.test_client()
+    responses = [client.get('/api/ping') for _ in range(6)]
+    assert [response.status_code for response in responses] == [200] * 5 + [429]
+    assert responses[0].headers['RateLimit-Remaining'] == '4'
+    assert 'Retry-After' in responses[-1].headers
+
+@pytest.mark.parametrize('clock', [client_rate_limit], indirect=True)
+def test_view_charged_batch_skips_request_unit(clock, limiter):
+    app = Flask(__name__)
+    client_rate_limit.init_app(app)
+    
+    @app.route('/api/batch')
+    @client_rate_limit.charged_by_view
+    def batch():
+        try:
+            client_rate_limit.charge(int(request.args['n']))
+        except client_rate_limit.ClientRateLimitExceeded:
+            abort(429)
+        return jsonify({'ok': True})
+    
+    client = app.test_client()
+    response = client.get('/api/batch?n=100')
+    assert response.status_code == 200
+    assert response.headers['RateLimit-Remaining'] == '0'
+    
+    response = client.get('/api/batch?n=100')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '60'
+    clock.now += 60
+    assert client.get('/api/batch?n=100').status_code == 200
+
+def test_bulk_accounts_are_charged_per_item(limiter, client, app_module, account_result, monkeypatch):
+    monkeypatch.setattr(app_module.checker, '_bulk_check_email', account_result)
+    limiter.hit('127.0.0.1', cost=4)
+    upload = ''.join(f'user{i}@example.com\n' for i in range(20))
+    response = client.post('/api/check-accounts', data=upload, content_type='text/plain')
+    
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    # Item pertama gratis (unit request), item kedua memakai sisa kuota terakhir
+    assert len(lines) == 3
+    assert all('account' in line for line in lines[:-1])
+    assert lines[-1]['error'].startswith('Rate limit exceeded')
+    assert lines[-1]['retry_after'] == 12
+
+def test_bulk_cost_is_capped_at_one_burst(limiter, client, app_module, account_result, monkeypatch):
+    monkeypatch.setattr(app_module.checker, '_bulk_check_email', account_result)
+    upload = ''.join(f'user{i}@example.com\n' for i in range(20))
+    response = client.post('/api/check-accounts', data=upload, content_type='text/plain')
+    
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    assert len(lines) == 20 and all('account' in line for line in lines)
+    assert not limiter.hit('127.0.0.1').allowed
+
+@pytest.mark.parametrize('clock', [client_rate_limit], indirect=True)
+def test_password_batch_larger_than_limit(clock, limiter, client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module.checker, 'check_password_batch', lambda **kwargs: {'results': []})
+    hashes = ['0' * 40] * 61
+    
+    response = client.post('/api/check-passwords', json={'hashes': hashes})
+    assert response.status_code == 200
+    
+    # Ditolak tanpa memakai kuota; retry_after adalah waktu tunggu yang sebenarnya
+    response = client.post('/api/check-passwords', json={'hashes': hashes})
+    assert response.status_code == 429
+    retry_after = response.get_json()['retry_after']
+    assert retry_after == 60
+    
+    clock.now += retry_after - 1
+    assert client.post('/api/check-passwords', json={'hashes': hashes}).status_code == 429
+    clock.now += 1
+    assert client.post('/api/check-passwords', json={'hashes': hashes}).status_code == 200
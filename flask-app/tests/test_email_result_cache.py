@@ -0,0 +1,41 @@
+import pytest
+
+from api_clients import DeHashedClient, HIBPClient, IntelligenceXClient, email_result_ttl
+from config import CacheConfig
+
+TTL = CacheConfig.EMAIL_RESULTS
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+    
+    def json(self):
+        return self._payload
+
+@pytest.mark.parametrize('client_class, payload, found', [
+    (HIBPClient, [{'Name': 'Adobe'}], True),
+    (DeHashedClient, {'entries': [{'id': '1'}], 'total': 1}, True),
+    (DeHashedClient, {'entries': [], 'total': 0}, False),
+    (IntelligenceXClient, {'selectors': [{'selectorvalue': 'a@x.com'}]}, True),
+    (IntelligenceXClient, {'selectors': []}, False),
+])
+def test_successful_results_use_found_and_clean_ttl(client_class, payload, found):
+    result = client_class()._email_result(FakeResponse(200, payload))
+    assert result['found'] is found
+    assert email_result_ttl(result) == (TTL['ttl_found'] if found else TTL['ttl_clean'])
+
+def test_hibp_not_found_is_clean():
+    result = HIBPClient()._email_result(FakeResponse(404))
+    assert email_result_ttl(result) == TTL['ttl_clean']
+
+@pytest.mark.parametrize('result, ttl', [
+    ({'error': 'HIBP rate limit exceeded', 'status': 'rate_limited'}, TTL['ttl_error']),
+    ({'error': 'boom', 'status': 'success', 'found': False}, TTL['ttl_error']),
+    ({'status': 'api_error'}, TTL['ttl_error']),
+    ({'status': 'success'}, TTL['ttl_error']),
+    ({'error': 'open', 'status': 'circuit_open'}, 0),
+    ({'error': 'late', 'status': 'timed_out'}, 0),
+])
+def test_failures_use_error_ttl(result, ttl):
+    assert email_result_ttl(result) == ttl
@@ -0,0 +1,57 @@
+import pytest
+
+from breach_catalog import BreachCatalog
+
+def check_result(found: bool = True) -> dict:
+    return {
+        'email': 'user@example.com',
+        'timestamp': 1700000000.0,
+        'sources': {
+            'hibp': {'found': found, 'total': 2, 'breaches': ['Adobe', 'Gone'], 'source': 'HIBP'},
+            'local': {'found': found, 'source': 'LocalDB'},
+            'intelx': {'found': False, 'source': 'IntelX'}
+        },
+        'timings_ms': {'hibp': 1.0, 'local': 0.1, 'intelx': 2.0},
+        'summary': {'found': found, 'total_breaches': 3, 'sources_found': 2}
+    }
+
+def test_parse_fields(app_module):
+    allowed = app_module.ACCOUNT_FIELDS
+    assert app_module.parse_fields(None, allowed) is None
+    assert app_module.parse_fields(' , ', allowed) is None
+    assert app_module.parse_fields('summary, found', allowed) == {'summary', 'found'}
+    with pytest.raises(app_module.InvalidFields, match='password'):
+        app_module.parse_fields('found,password', allowed)
+
+def test_select_fields(app_module):
+    response = {'pwned': True, 'count': 3, 'message': 'x'}
+    assert app_module.select_fields(response) is response
+    assert app_module.select_fields(response, frozenset({'count'})) == {'count': 3}
+
+def test_account_response_builds_only_requested_keys(app_module):
+    full = app_module.format_account_response(check_result())
+    assert set(full) == {'found', 'breaches', 'sources', 'summary', 'timings_ms', 'timestamp'}
+    assert full['breaches'] == [
+        {'source': 'hibp', 'total': 2, 'names': ['Adobe', 'Gone']},
+        {'source': 'local', 'total': 1}
+    ]
+    
+    selected = app_module.format_account_response(check_result(), fields=frozenset({'found', 'summary'}))
+    assert selected == {'found': True, 'summary': full['summary']}
+
+def test_breach_details_from_catalog(app_module, monkeypatch):
+    catalog = BreachCatalog([{'Name': 'Adobe', 'Domain': 'adobe.com', 'DataClasses': ['Passwords']}])
+    monkeypatch.setattr(app_module, 'get_breach_catalog', lambda: catalog)
+    
+    response = app_module.format_account_response(check_result(), expand=True,
+                                                   fields=frozenset({'breach_details'}))
+    assert list(response) == ['breach_details']
+    assert response['breach_details']['Adobe']['Domain'] == 'adobe.com'
+    
+    assert 'breach_details' not in app_module.format_account_response(
+        check_result(), expand=True, fields=frozenset({'found'}))
+
+def test_unknown_field_is_rejected_by_endpoint(client):
+    response = client.post('/api/check-account?fields=found,nope', json={'account': 'user@example.com'})
+    assert response.status_code == 400
+    assert 'nope' in response.get_json()['error']
@@ -0,0 +1,61 @@
+import pytest
+
+import local_index
+from api_clients import LocalDatabaseClient, LocalIndexSnapshot
+from config import DatabaseConfig
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'local_breaches.txt').write_text('known@example.com\n', encoding='utf-8')
+    
+    def make(engine='memory', **overrides):
+        settings = dict(DatabaseConfig.LOCAL_DB, engine=engine, reload_check_interval=0, write_flush_interval=0)
+        settings.update(overrides)
+        monkeypatch.setattr(DatabaseConfig, 'LOCAL_DB', settings)
+        if engine == 'sharded' and not (tmp_path / 'local_index').exists():
+            local_index.build('local_breaches.txt', 'local_index')
+        return LocalDatabaseClient()
+    return make
+
+@pytest.mark.parametrize('engine', ['memory', 'sharded'])
+def test_lookup(make_client, engine):
+    client = make_client(engine)
+    assert client.check_email(' KNOWN@example.com')['found'] is True
+    assert client.check_email('other@example.com')['status'] == 'clean'
+
+@pytest.mark.parametrize('engine', ['memory', 'sharded'])
+def test_added_emails_are_deduped_and_written(make_client, tmp_path, engine):
+    client = make_client(engine, write_batch_size=1000, write_flush_interval=60)
+    assert client.add_emails(['new@example.com', 'NEW@example.com', 'known@example.com', '']) == 1
+    assert client.check_email('new@example.com')['found'] is True
+    assert client.get_stats()['pending_writes'] == 1
+    
+    assert client.flush() == 1
+    assert (tmp_path / 'local_breaches.txt').read_text().splitlines() == ['known@example.com', 'new@example.com']
+
+@pytest.mark.parametrize('engine', ['memory', 'sharded'])
+def test_appends_from_other_workers_are_visible(make_client, engine):
+    writer = make_client(engine)
+    reader = make_client(engine)
+    assert reader.check_email('late@example.com')['found'] is False
+    
+    writer.add_email('late@example.com')
+    assert reader.check_email('late@example.com')['found'] is True
+
+def test_memory_overlay_is_folded_into_snapshot(make_client):
+    client = make_client('memory', overlay_max_entries=5)
+    client.add_emails([f'user{i}@example.com' for i in range(10)])
+    
+    assert not client._additions
+    assert isinstance(client._snapshot, LocalIndexSnapshot)
+    assert 'user9@example.com' in client._snapshot
+    assert client.get_stats()['unique_emails'] == 11
+
+def test_overlay_cap_forces_flush(make_client, tmp_path):
+    client = make_client('sharded', overlay_max_entries=5, write_batch_size=1000, write_flush_interval=60)
+    client.add_emails([f'user{i}@example.com' for i in range(10)])
+    
+    assert client.get_stats()['pending_writes'] == 0
+    assert len((tmp_path / 'local_breaches.txt').read_text().splitlines()) == 11
+    assert client.check_email('user9@example.com')['found'] is True
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from local_index import ShardedEmailIndex, bloom_parameters, build, normalize_email
+
+def write_source(path, emails):
+    path.write_text(''.join(f'{email}\n' for email in emails), encoding='utf-8')
+    return str(path)
+
+def test_build_and_lookup(tmp_path):
+    source = write_source(tmp_path / 'breaches.txt', ['Alice@Example.com', 'bob@example.com', '', 'bob@example.com'])
+    manifest = build(source, str(tmp_path / 'index'), shard_bits=4)
+    
+    index = ShardedEmailIndex(str(tmp_path / 'index'), case_sensitive=False)
+    assert manifest['entries'] == 2
+    assert manifest['source_lines'] == 4
+    assert normalize_email(' ALICE@example.com ') in index
+    assert 'bob@example.com' in index
+    assert 'carol@example.com' not in index
+    assert len(index) == 2
+
+def test_lookup_without_bloom(tmp_path):
+    source = write_source(tmp_path / 'breaches.txt', [f'user{i}@example.com' for i in range(200)])
+    build(source, str(tmp_path / 'index'), fpr=None, shard_bits=2)
+    
+    index = ShardedEmailIndex(str(tmp_path / 'index'))
+    assert all(f'user{i}@example.com' in index for i in range(200))
+    assert 'user200@example.com' not in index
+    assert index.get_stats()['bloom_rejects'] == 0
+
+def test_reader_survives_rebuild(tmp_path):
+    index_dir = str(tmp_path / 'index')
+    build(write_source(tmp_path / 'a.txt', ['old@example.com']), index_dir, shard_bits=8)
+    old = ShardedEmailIndex(index_dir)
+    
+    # Rebuild dengan shard_bits dan isi berbeda, dua kali supaya versi pertama dihapus
+    build(write_source(tmp_path / 'b.txt', ['new@example.com']), index_dir, shard_bits=2)
+    build(write_source(tmp_path / 'c.txt', ['newer@example.com']), index_dir, shard_bits=3)
+    
+    assert 'old@example.com' in old
+    assert 'new@example.com' not in old
+    assert 'newer@example.com' not in old
+    
+    current = ShardedEmailIndex(index_dir)
+    assert current.shard_bits == 3
+    assert 'newer@example.com' in current
+    assert 'old@example.com' not in current
+    assert len([name for name in os.listdir(tmp_path) if name.startswith('index.v')]) == 2
+
+def test_plain_directory_index_is_migrated(tmp_path):
+    index_dir = tmp_path / 'index'
+    build(write_source(tmp_path / 'a.txt', ['old@example.com']), str(index_dir))
+    # Index dari versi lama: direktori biasa, bukan symlink
+    target = os.path.realpath(index_dir)
+    os.remove(index_dir)
+    os.rename(target, index_dir)
+    
+    build(write_source(tmp_path / 'b.txt', ['new@example.com']), str(index_dir) + os.sep)
+    assert os.path.islink(index_dir)
+    assert 'new@example.com' in ShardedEmailIndex(str(index_dir))
+
+def test_case_sensitive_mismatch_is_rejected(tmp_path):
+    build(write_source(tmp_path / 'a.txt', ['a@example.com']), str(tmp_path / 'index'), case_sensitive=False)
+    with pytest.raises(ValueError, match='case_sensitive'):
+        ShardedEmailIndex(str(tmp_path / 'index'), case_sensitive=True)
+
+def test_bloom_parameters():
+    params = bloom_parameters(1_000_000, 0.01)
+    assert params['hashes'] == 7
+    assert 9.5 < params['bits'] / 1_000_000 < 9.7
+    assert params['bits'] % 8 == 0
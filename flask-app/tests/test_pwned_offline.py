@@ -0,0 +1,61 @@
+import hashlib
+import os
+
+import pytest
+
+from pwned_offline import PwnedPasswordsFile, PwnedPasswordsStore, build
+
+def sha1(password: str) -> str:
+    return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+def write_corpus(path, counts: dict):
+    path.write_text(''.join(f'{digest}:{count}\n' for digest, count in sorted(counts.items())))
+
+def test_build_and_lookup(tmp_path):
+    corpus = tmp_path / 'corpus.txt'
+    write_corpus(corpus, {sha1('password'): 10, sha1('123456'): 20})
+    index = str(tmp_path / 'pwned.bin')
+    
+    assert build(str(corpus), index, progress_every=0) == 2
+    db = PwnedPasswordsFile(index)
+    assert db.lookup(sha1('password')) == 10
+    assert db.lookup(sha1('123456').lower()) == 20
+    assert db.lookup(sha1('not in corpus')) == 0
+
+@pytest.mark.parametrize('content', [
+    'FFFF000000000000000000000000000000000000:1\n0000000000000000000000000000000000000000:1\n',
+    'not-a-hash:1\n',
+])
+def test_failed_build_leaves_no_temp_file(tmp_path, content):
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text(content)
+    index = tmp_path / 'pwned.bin'
+    
+    with pytest.raises(ValueError):
+        build(str(corpus), str(index), progress_every=0)
+    assert os.listdir(tmp_path) == ['corpus.txt']
+
+def test_store_remaps_rebuilt_file(tmp_path):
+    corpus = tmp_path / 'corpus.txt'
+    index = str(tmp_path / 'pwned.bin')
+    store = PwnedPasswordsStore(index, reload_check_interval=0)
+    assert store.get() is None
+    
+    write_corpus(corpus, {sha1('password'): 10})
+    build(str(corpus), index, progress_every=0)
+    first = store.get()
+    assert first.lookup(sha1('password')) == 10
+    assert store.get() is first
+    
+    write_corpus(corpus, {sha1('password'): 11, sha1('letmein'): 5})
+    build(str(corpus), index, progress_every=0)
+    second = store.get()
+    assert second is not first
+    assert second.lookup(sha1('password')) == 11
+    # Lookup yang masih memegang map lama tetap jalan
+    assert first.lookup(sha1('password')) == 10
+    
+    # File rusak: map terakhir yang valid tetap dipakai
+    (tmp_path / 'broken.bin').write_bytes(b'x' * 100)
+    os.replace(tmp_path / 'broken.bin', index)
+    assert store.get() is second
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api_clients import HIBPClient, email_flight
+from breach_checker import BreachChecker
+from singleflight import AsyncSingleFlight, SingleFlight
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight('test')
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'value': 1}
+    
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', fetch)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do('key', fetch)))
+    follower.start()
+    while flight.get_stats()['shared'] == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    
+    assert len(calls) == 1
+    assert results[0] is results[1]
+    assert flight.get_stats()['in_flight'] == 0
+
+def test_error_is_raised_and_key_released():
+    flight = SingleFlight('test')
+    
+    def fail():
+        raise RuntimeError('upstream down')
+    
+    with pytest.raises(RuntimeError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 'ok') == 'ok'
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def scenario():
+        flight = AsyncSingleFlight('test')
+        release = asyncio.Event()
+        
+        async def fetch():
+            await release.wait()
+            return 'shared'
+        
+        leader = asyncio.ensure_future(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do('key', fetch))
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert await follower == 'shared'
+        assert leader.cancelled()
+        assert flight.get_stats() == {'name': 'test', 'in_flight': 0, 'calls': 1, 'shared': 1}
+    
+    asyncio.run(scenario())
+
+def test_async_error_reaches_every_caller():
+    async def scenario():
+        flight = AsyncSingleFlight('test')
+        
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError('upstream down')
+        
+        results = await asyncio.gather(flight.do('key', fail), flight.do('key', fail), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+    
+    asyncio.run(scenario())
+
+def test_coalesced_callers_get_their_own_result_dicts(monkeypatch):
+    checker = BreachChecker()
+    shared = {
+        'email': 'a@x.com',
+        'timestamp': 0.0,
+        'sources': {'hibp': {'found': True, 'status': 'found', 'breaches': ['Adobe']}},
+        'timings_ms': {'hibp': 1.0},
+        'summary': {'found': True, 'total_breaches': 1}
+    }
+    monkeypatch.setattr(checker.email_flight, 'do', lambda key, fn: shared)
+    monkeypatch.setattr(checker, '_update_stats', lambda found: None)
+    
+    first = checker.check_email('A@x.com')
+    first['sources']['hibp']['status'] = 'changed'
+    first['timings_ms']['hibp'] = 99.0
+    first['summary']['found'] = False
+    
+    second = checker.check_email('a@x.com')
+    assert second['email'] == 'a@x.com'
+    assert second['sources']['hibp']['status'] == 'found'
+    assert second['timings_ms']['hibp'] == 1.0
+    assert second['summary']['found'] is True
+
+def test_coalesced_source_lookups_get_their_own_dicts(monkeypatch):
+    client = HIBPClient()
+    started, release = threading.Event(), threading.Event()
+    
+    def fetch_email(email):
+        started.set()
+        release.wait(5)
+        return {'found': True, 'status': 'found', 'breaches': ['Adobe'], 'source': 'HIBP'}
+    monkeypatch.setattr(client, '_fetch_email', fetch_email)
+    
+    email = 'coalesced@example.com'
+    results = []
+    leader = threading.Thread(target=lambda: results.append(client.check_email(email)))
+    leader.start()
+    started.wait(5)
+    shared_before = email_flight.get_stats()['shared']
+    follower = threading.Thread(target=lambda: results.append(client.check_email(email)))
+    follower.start()
+    while email_flight.get_stats()['shared'] == shared_before:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    
+    first, second = results
+    assert first is not second
+    first['breach_details'] = {}
+    del first['found']
+    assert second == {'found': True, 'status': 'found', 'breaches': ['Adobe'], 'source': 'HIBP'}
@@ -0,0 +1,10 @@
+def test_stats_are_live_and_not_cached(client):
+    response = client.get('/api/stats')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'last_updated' in body and 'last_check' in body
+    assert 'ETag' not in response.headers
+    assert response.cache_control.no_store
+    
+    again = client.get('/api/stats', headers={'If-None-Match': '*'})
+    assert again.status_code == 200
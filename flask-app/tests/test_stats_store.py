@@ -0,0 +1,72 @@
+import json
+import threading
+
+from stats_store import StatsStore
+
+def make_store(tmp_path, **settings) -> StatsStore:
+    return StatsStore(str(tmp_path / 'stats.json'), update_interval=0, **settings)
+
+def run_in_threads(fn, count: int):
+    threads = [threading.Thread(target=fn) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_counters_from_threads_are_summed(tmp_path):
+    store = make_store(tmp_path)
+    run_in_threads(lambda: [store.incr('checks') for _ in range(100)], 4)
+    store.incr('checks', 5)
+    assert store.totals()['checks'] == 405
+
+def test_finished_thread_shards_are_released(tmp_path):
+    store = make_store(tmp_path)
+    for _ in range(5):
+        run_in_threads(lambda: (store.incr('checks'), store.mark('last_check', 10.0)), 4)
+        store.flush()
+    
+    assert store.get_stats()['threads'] == 0
+    assert store.totals()['checks'] == 20
+    assert store.marks()['last_check'] == 10.0
+    
+    run_in_threads(lambda: store.mark('last_check', 5.0), 1)
+    store.flush()
+    assert json.loads((tmp_path / 'stats.json').read_text())['totals'] == {'checks': 20}
+    assert store.marks()['last_check'] == 10.0
+
+def test_workers_share_totals_through_the_file(tmp_path):
+    first, second = make_store(tmp_path), make_store(tmp_path)
+    first.incr('checks', 3)
+    second.incr('checks', 4)
+    first.flush()
+    second.flush()
+    first.flush()
+    
+    assert first.totals()['checks'] == 7
+    assert second.totals()['checks'] == 7
+    
+    # Delta yang sudah di-flush tidak dihitung dua kali
+    first.incr('checks')
+    first.flush()
+    assert first.totals()['checks'] == 8
+
+def test_history_is_bucketed_and_trimmed(tmp_path):
+    store = make_store(tmp_path, history_bucket=3600, history_buckets=2)
+    store.incr('checks')
+    store.flush()
+    data = json.loads((tmp_path / 'stats.json').read_text())
+    data['history'] = {'0': {'checks': 1}, '3600': {'checks': 2}, **data['history']}
+    (tmp_path / 'stats.json').write_text(json.dumps(data))
+    
+    store.incr('checks')
+    store.flush()
+    history = store.history()
+    assert len(history) == 2
+    assert history[-1]['checks'] == 2
+
+def test_corrupt_file_starts_from_zero(tmp_path):
+    (tmp_path / 'stats.json').write_text('{not json')
+    store = make_store(tmp_path)
+    store.incr('checks')
+    store.flush()
+    assert store.totals() == {'checks': 1}
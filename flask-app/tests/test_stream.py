@@ -0,0 +1,15 @@
+def test_stream_rejects_account_in_query_string(client):
+    response = client.get('/api/check-account/stream?account=user@example.com')
+    assert response.status_code == 405
+
+def test_stream_reads_account_from_post_body(client, app_module, account_result, monkeypatch):
+    def check_email_stream(email):
+        yield 'start', {'email': email}
+        yield 'summary', account_result(email)
+    monkeypatch.setattr(app_module.checker, 'check_email_stream', check_email_stream)
+    
+    response = client.post('/api/check-account/stream', json={'account': 'user@example.com'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    events = [line for line in response.data.decode().splitlines() if line.startswith('event: ')]
+    assert events == ['event: start', 'event: summary']